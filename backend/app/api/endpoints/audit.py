@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.core.audit import audit_trail
+from app.core.deps import get_current_user, is_admin
+from app.schemas.audit_schema import AuditListResponse
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.get("/audit", response_model=AuditListResponse)
+async def list_audit_events(
+    start: Optional[datetime] = Query(None, description="이 시각 이후 (포함, 시간대가 없으면 UTC)"),
+    end: Optional[datetime] = Query(None, description="이 시각 이전 (미포함)"),
+    username: Optional[str] = Query(None, max_length=32),
+    event: Optional[str] = Query(None, pattern="^(login|logout|password_change)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: str = Depends(get_current_user)
+):
+    """인증 감사 기록 조회 (최신순)
+
+    관리자가 아니면 자기 계정의 기록만 조회할 수 있다. 다른 워커가 아직 저장하지
+    않은 기록은 최대 AUDIT_FLUSH_INTERVAL_SECONDS 동안 보이지 않을 수 있다.
+    """
+    if not audit_trail.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Audit trail is disabled"
+        )
+    if not await is_admin(current_user):
+        if username is not None and username != current_user:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="다른 사용자의 감사 기록은 관리자만 조회할 수 있습니다"
+            )
+        username = current_user
+    if start is not None and end is not None and start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be earlier than end"
+        )
+    try:
+        records = await audit_trail.query(start, end, username, event, limit)
+        return {"items": [record._asdict() for record in records]}
+    except Exception as e:
+        logger.error(f"Audit query error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.deps import get_current_user
 from app.core.auth_handler import verify_password, create_access_token
-from app.crud.user_crud import get_account
-from app.db.db_config import get_db
+from app.crud.user_crud import get_account, replace_password_hash
+from app.crud.presence_buffer import presence_buffer
+from app.db.db_config import get_db, AsyncSessionLocal
+from app.db.tenant_engines import tenant_for
 from app.schemas.auth_schema import LoginRequest, TokenResponse
 from app.core.security import (
     create_access_token, 
@@ -13,13 +15,42 @@ from app.core.security import (
     sanitize_input
 )
 from app.core.session import session_manager
+from app.core.hashing import password_hasher
+from app.core.rate_limit import login_throttle
+from app.core.audit import audit_trail
+from app.core.config import settings
+from app.core.middleware import ParsedBodyRoute
+import asyncio
 import logging
 import bcrypt
 
 logger = logging.getLogger(__name__)
-auth_router = APIRouter()
+auth_router = APIRouter(route_class=ParsedBodyRoute)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# 진행 중인 재해싱 작업 (사용자당 하나, 작업 참조 유지용)
+_rehash_tasks: dict = {}
+
+async def _rehash_password(username: str, password: str, old_hash: str):
+    """현재 cost 로 다시 해싱해 저장 (응답과 무관하게 백그라운드에서 실행)"""
+    try:
+        new_hash = await password_hasher.hash(password)
+        # 요청 세션은 응답 후 닫히므로 별도 세션 사용
+        async with AsyncSessionLocal() as db:
+            if await replace_password_hash(db, username, old_hash, new_hash):
+                logger.info("Password rehashed", extra={"username": username, "rounds": password_hasher.rounds})
+    except Exception:
+        logger.exception("Password rehash failed", extra={"username": username})
+    finally:
+        _rehash_tasks.pop(username, None)
+
+def schedule_rehash(username: str, password: str, old_hash: str):
+    """cost 가 현재 설정과 다르면 재해싱 예약"""
+    if not settings.BCRYPT_REHASH_ON_LOGIN or username in _rehash_tasks:
+        return
+    if password_hasher.needs_rehash(old_hash):
+        _rehash_tasks[username] = asyncio.create_task(_rehash_password(username, password, old_hash))
+
 async def authenticate_user(db: AsyncSession, username: str, password: str):
     """사용자 인증"""
     user = await get_account(db, username)
@@ -27,7 +58,7 @@ async def authenticate_user(db: AsyncSession, username: str, password: str):
         logger.warning(f"Login attempt with non-existent username: {username}")
         return False
     
-    if not verify_password(password, user.password):
+    if not await verify_password(password, user.password):
         logger.warning(f"Invalid password attempt for user: {username}")
         return False
     
@@ -36,6 +67,7 @@ async def authenticate_user(db: AsyncSession, username: str, password: str):
 @auth_router.post("/login", response_model=TokenResponse)
 async def login(
     login_data: LoginRequest,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """로그인 처리"""
@@ -49,41 +81,62 @@ async def login(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username and password are required"
             )
+
+        # 시도 횟수 제한 (계정 조회와 bcrypt 검증 전에 거절)
+        try:
+            login_throttle.check(request, username)
+        except HTTPException:
+            audit_trail.record("login", "throttled", username, request)
+            raise
             
-        # 사용자 확인 - 디버깅 로그 추가
-        print(f"Attempting login for user: {username}")  # 디버깅
+        # 사용자 확인
+        logger.debug("Login attempt", extra={"username": username})
         user = await get_account(db, username)
-        print(f"Found user: {user}")  # 디버깅
         
         if not user:
+            logger.info("Login failed: unknown user", extra={"username": username})
+            audit_trail.record("login", "unknown_user", username, request)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials"
             )
             
-        # 비밀번호 검증 - 디버깅 로그 추가
-        is_valid = verify_password(password, user.password)
-        print(f"Password verification result: {is_valid}")  # 디버깅
+        # 비밀번호 검증
+        is_valid = await verify_password(password, user.password)
         
         if not is_valid:
-            print("Invalid password")  # 디버깅
+            logger.info("Login failed: invalid password", extra={"username": username})
+            audit_trail.record("login", "invalid_password", username, request)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials"
             )
+
+        login_throttle.record_success(username)
+
+        # 예전 cost 로 저장된 해시는 응답을 늦추지 않고 다시 저장
+        schedule_rehash(username, password, user.password)
             
-        # 토큰 생성
-        token = create_access_token(username)
+        # 토큰 생성 (세션 한도가 1 이면 이전 토큰은 여기서 폐기됨)
+        token = create_access_token(
+            username,
+            await session_manager.token_version(username),
+            tenant_for(username, user.userlevel)
+        )
         
         # 세션 등록
-        session_manager.add_session(username, token)
+        await session_manager.add_session(username, token)
+
+        # onlogin 은 모아서 저장 (재등록 폭주 때 로그인마다 UPDATE 하지 않도록)
+        presence_buffer.record(username, 1)
+        audit_trail.record("login", "success", username, request)
         
         return {"access_token": token, "token_type": "bearer"}
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Login error: {str(e)}")  # 디버깅
+        logger.exception("Login error", extra={"username": login_data.username})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -91,11 +144,15 @@ async def login(
 
 @auth_router.post("/logout")
 async def logout(
-    current_user: str = Depends(get_current_user)
+    request: Request,
+    current_user: str = Depends(get_current_user),
+    token: str = Depends(oauth2_scheme)
 ):
-    """로그아웃 처리"""
+    """로그아웃 처리 (현재 기기의 세션만 종료)"""
     try:
-        session_manager.remove_session(current_user)
+        await session_manager.remove_session(current_user, token)
+        presence_buffer.record(current_user, 0)
+        audit_trail.record("logout", "success", current_user, request)
         return {"success": True, "message": "Successfully logged out"}
     except Exception as e:
         raise HTTPException(
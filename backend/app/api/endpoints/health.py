@@ -1,12 +1,91 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.db.db_config import pool_monitor
+from app.db.replicas import replica_router
+from app.core.warmup import warmup_state
 
 router = APIRouter()
 
+async def _db_probe() -> dict:
+    """캐시된 DB 확인 결과 (HEALTH_DB_CACHE_SECONDS 마다 최대 한 번 조회)"""
+    ok = await pool_monitor.cached_check(
+        max_age=settings.HEALTH_DB_CACHE_SECONDS,
+        timeout=settings.HEALTH_DB_TIMEOUT_SECONDS
+    )
+    latency = pool_monitor.last_check_latency
+    return {
+        "ok": ok,
+        "latency_ms": round(latency * 1000, 2) if latency is not None else None,
+        "checked_at": pool_monitor.last_check_at,
+        "error": pool_monitor.last_check_error,
+    }
+
 @router.get("/health")
 async def health_check():
     return {"status": "ok"}
 
+@router.get("/health/live")
+async def liveness_check():
+    """프로세스 생존 확인 (외부 의존성은 확인하지 않음)"""
+    return {"status": "ok"}
+
+@router.get("/health/ready")
+async def readiness_check():
+    """트래픽을 받아도 되는지 확인
+
+    워밍업 완료 여부, DB 확인 결과, 커넥션 풀 포화도, DB 왕복 지연, 해싱 대기열 길이 중
+    하나라도 임계값을 넘으면 503 을 반환해 실제 로그인이 타임아웃되기
+    전에 로드밸런서가 이 노드를 빼도록 한다.
+    """
+    db = await _db_probe()
+    pool = pool_monitor.stats()["pool"]
+    capacity = pool["size"] + max(pool["max_overflow"], 0)
+    saturation = pool["checked_out"] / capacity if capacity else 0.0
+    hashing = password_hasher.stats()
+
+    reasons = []
+    if not warmup_state.ready:
+        reasons.append("warming up")
+    if not db["ok"]:
+        reasons.append("database unavailable")
+    elif db["latency_ms"] is not None and db["latency_ms"] > settings.READY_MAX_DB_LATENCY_MS:
+        reasons.append("database latency too high")
+    if saturation >= settings.READY_MAX_POOL_SATURATION:
+        reasons.append("connection pool saturated")
+    if hashing["queue_depth"] > settings.READY_MAX_HASH_QUEUE:
+        reasons.append("password hashing backlog")
+
+    body = {
+        "status": "ok" if not reasons else "unavailable",
+        "reasons": reasons,
+        "warmup": warmup_state.summary(),
+        "database": db,
+        "pool": {**pool, "saturation": round(saturation, 3)},
+        "hashing": {
+            "queue_depth": hashing["queue_depth"],
+            "in_flight": hashing["in_flight"],
+            "max_concurrency": hashing["max_concurrency"],
+        },
+    }
+    return JSONResponse(status_code=200 if not reasons else 503, content=body)
+
 @router.get("/health/db")
 async def db_health_check():
-    # DB 연결 확인 로직 추가
-    return {"status": "ok"} 
\ No newline at end of file
+    """DB 연결 확인 (결과는 짧게 캐시)"""
+    db = await _db_probe()
+    return JSONResponse(
+        status_code=200 if db["ok"] else 503,
+        content={"status": "ok" if db["ok"] else "unavailable", **db}
+    )
+
+@router.get("/health/db/pool")
+async def db_pool_stats():
+    """커넥션 풀 상태, 연결 대기 시간, 느린 쿼리 통계"""
+    return pool_monitor.stats()
+
+@router.get("/health/db/replicas")
+async def db_replica_stats():
+    """복제본별 상태·재생 지연과 기본 DB 로 돌린 읽기 수"""
+    return replica_router.stats()
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Request, Response
+from app.core.config import settings
+from app.core.signing_keys import key_ring
+
+router = APIRouter()
+
+@router.get("/.well-known/jwks.json")
+async def jwks(request: Request):
+    """토큰 검증용 공개키 (다른 서비스가 /auth/verify 를 호출하지 않고 직접 검증)"""
+    body, etag = key_ring.jwks()
+    headers = {
+        "Cache-Control": f"public, max-age={settings.JWT_JWKS_MAX_AGE}",
+        "ETag": etag,
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
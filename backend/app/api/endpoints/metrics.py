@@ -0,0 +1,180 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import registry
+from app.core.session import session_manager
+from app.core.hashing import password_hasher
+from app.core.token_cache import token_cache
+from app.core.rate_limit import login_throttle
+from app.core.logging_config import logging_stats
+from app.crud.account_cache import account_cache
+from app.crud.presence_buffer import presence_buffer
+from app.core.audit import audit_trail
+from app.db.db_config import pool_monitor
+from app.db.tenant_engines import tenant_engines
+from app.db.replicas import replica_router
+
+router = APIRouter()
+
+# 다른 모듈이 이미 집계하는 값은 스크레이프할 때 콜백으로 읽음
+registry.callback(
+    "vpbx_active_sessions", "Active sessions in SessionManager",
+    session_manager.session_count
+)
+registry.callback(
+    "vpbx_revoked_tokens", "Revocation entries held in memory by kind",
+    lambda: {
+        ("jti",): session_manager.revocations.stats()["denied_jtis"],
+        ("user_version",): session_manager.revocations.stats()["versioned_users"],
+    },
+    labelnames=("kind",)
+)
+registry.callback(
+    "vpbx_hash_queue_depth", "Password hashing calls waiting for a worker slot",
+    lambda: password_hasher.stats()["queue_depth"]
+)
+registry.callback(
+    "vpbx_hash_in_flight", "Password hashing calls running on the worker pool",
+    lambda: password_hasher.stats()["in_flight"]
+)
+registry.callback(
+    "vpbx_db_pool_connections", "Database pool connections by state",
+    lambda: {
+        ("checked_out",): pool_monitor.stats()["pool"]["checked_out"],
+        ("idle",): pool_monitor.stats()["pool"]["idle"],
+    },
+    labelnames=("state",)
+)
+registry.callback(
+    "vpbx_db_pool_timeouts_total", "Database pool checkout timeouts",
+    lambda: pool_monitor.timeouts, metric_type="counter"
+)
+registry.callback(
+    "vpbx_db_slow_queries_total", "Queries slower than DB_SLOW_QUERY_MS",
+    lambda: pool_monitor.slow_queries, metric_type="counter"
+)
+registry.callback(
+    "vpbx_cache_requests_total", "Cache lookups by cache and result",
+    lambda: {
+        ("token", "hit"): token_cache.hits,
+        ("token", "miss"): token_cache.misses,
+        ("account", "hit"): account_cache.hits,
+        ("account", "miss"): account_cache.misses,
+        ("account", "coalesced"): account_cache.coalesced,
+    },
+    labelnames=("cache", "result"),
+    metric_type="counter"
+)
+registry.callback(
+    "vpbx_login_throttled_total", "Login attempts rejected before password verification",
+    lambda: {
+        ("ip",): login_throttle.rejected_ip,
+        ("username",): login_throttle.rejected_username,
+    },
+    labelnames=("limit",),
+    metric_type="counter"
+)
+registry.callback(
+    "vpbx_log_records_dropped_total", "Log records dropped before output",
+    lambda: {
+        ("queue_full",): logging_stats()["dropped_queue_full"],
+        ("sampling",): logging_stats()["dropped_sampling"],
+    },
+    labelnames=("reason",),
+    metric_type="counter"
+)
+registry.callback(
+    "vpbx_presence_pending", "onlogin changes waiting for the next write-behind flush",
+    lambda: presence_buffer.stats()["pending"]
+)
+registry.callback(
+    "vpbx_presence_updates_total", "onlogin changes by outcome",
+    lambda: {
+        ("coalesced",): presence_buffer.coalesced,
+        ("flushed",): presence_buffer.flushed_rows,
+    },
+    labelnames=("result",),
+    metric_type="counter"
+)
+registry.callback(
+    "vpbx_presence_flush_failures_total", "Failed onlogin write-behind flushes",
+    lambda: presence_buffer.failures, metric_type="counter"
+)
+registry.callback(
+    "vpbx_audit_queue_depth", "Audit records waiting to be written",
+    lambda: audit_trail.stats()["queued"]
+)
+registry.callback(
+    "vpbx_audit_records_total", "Audit records by outcome",
+    lambda: {
+        ("written",): audit_trail.written,
+        ("dropped",): audit_trail.dropped,
+    },
+    labelnames=("result",),
+    metric_type="counter"
+)
+registry.callback(
+    "vpbx_audit_backpressure_total", "Audit flushes triggered early by a half-full queue",
+    lambda: audit_trail.backpressure, metric_type="counter"
+)
+registry.callback(
+    "vpbx_audit_flush_failures_total", "Failed audit batch writes",
+    lambda: audit_trail.failures, metric_type="counter"
+)
+registry.callback(
+    "vpbx_tenant_engines", "Tenant database engines kept open",
+    lambda: tenant_engines.stats()["engines"]
+)
+registry.callback(
+    "vpbx_tenant_connections_in_use", "Tenant sessions holding a slot of the connection budget",
+    lambda: tenant_engines.in_use
+)
+registry.callback(
+    "vpbx_tenant_engines_closed_total", "Tenant engines closed by reason",
+    lambda: {
+        ("evicted",): tenant_engines.evicted,
+        ("idle",): tenant_engines.reaped,
+    },
+    labelnames=("reason",),
+    metric_type="counter"
+)
+registry.callback(
+    "vpbx_connection_budget_timeouts_total", "Tenant sessions refused after waiting for the connection budget",
+    lambda: tenant_engines.budget_timeouts, metric_type="counter"
+)
+registry.callback(
+    "vpbx_db_replica_healthy", "Read replica in rotation (1) or skipped (0)",
+    lambda: {
+        (name,): int(replica["healthy"]) for name, replica in replica_router.stats()["replicas"].items()
+    },
+    labelnames=("replica",)
+)
+registry.callback(
+    "vpbx_db_replica_lag_seconds", "Read replica replay lag at the last check",
+    lambda: {
+        (name,): replica["lag_seconds"]
+        for name, replica in replica_router.stats()["replicas"].items()
+        if replica["lag_seconds"] is not None
+    },
+    labelnames=("replica",)
+)
+registry.callback(
+    "vpbx_db_reads_total", "Read-only connections by target",
+    lambda: {
+        **{(name,): replica["reads"] for name, replica in replica_router.stats()["replicas"].items()},
+        ("primary",): replica_router.primary_reads,
+    },
+    labelnames=("target",),
+    metric_type="counter"
+)
+registry.callback(
+    "vpbx_db_replica_fallbacks_total", "Reads sent to the primary because no replica was usable",
+    lambda: replica_router.fallbacks, metric_type="counter"
+)
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text 형식 지표"""
+    return PlainTextResponse(
+        await registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
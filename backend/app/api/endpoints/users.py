@@ -1,27 +1,79 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.deps import get_current_user
-from app.crud.user_crud import update_password
+from app.core.deps import get_current_user, get_current_tenant, get_read_db, get_tenant_admin, get_tenant_db
+from app.crud.user_crud import update_password, list_accounts, stream_accounts, count_password_costs
+from app.crud.provisioning import iter_lines, parse_csv, parse_jsonl, provision_accounts
 from app.db.db_config import get_db
+from app.db.replicas import replica_router
+from app.db.tenant_engines import tenant_engines
+from app.core.middleware import ParsedBodyRoute
+from app.core.password_policy import password_policy
+from app.core.hashing import password_hasher
+from app.core.session import session_manager
+from app.core.audit import audit_trail
 from app.models.user_model import Account
-from app.schemas.user_schema import UserUpdate, UserResponse
-import re
+from app.schemas.user_schema import UserUpdate, UserResponse, BulkProvisionResponse, UserListResponse
+import json
 import logging
+from typing import Optional
 
 logger = logging.getLogger(__name__)
-users_router = APIRouter()
+users_router = APIRouter(route_class=ParsedBodyRoute)
 
-def validate_password(password: str) -> tuple[bool, str]:
-    """비밀번호 유효성 검사"""
-    if len(password) < 8:
-        return False, "비밀번호는 최소 8자 이상이어야 합니다"
-    if len(password) > 20:
-        return False, "비밀번호는 20자를 초과할 수 없습니다"
-    if ' ' in password:
-        return False, "비밀번호에 공백을 포함할 수 없습니다"
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
-        return False, "비밀번호는 최소 1개의 특수문자를 포함해야 합니다"
-    return True, ""
+@users_router.get("", response_model=UserListResponse)
+async def list_users(
+    after: Optional[str] = Query(None, max_length=32, description="이전 페이지의 next_cursor"),
+    limit: int = Query(100, ge=1, le=1000),
+    userlevel: Optional[int] = None,
+    onlogin: Optional[int] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    current_user: str = Depends(get_tenant_admin),
+    tenant: Optional[str] = Depends(get_current_tenant),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """계정 목록 조회 (관리자 또는 자기 테넌트의 테넌트 계정)
+
+    - json: username 기준 keyset 페이지 (next_cursor 를 after 로 넘기면 다음 페이지)
+    - ndjson: 전체 목록을 서버 측 커서로 읽어 한 줄에 한 계정씩 스트리밍
+    """
+    if format == "ndjson":
+        async def generate():
+            # 의존성으로 받은 세션은 응답 전송 전에 닫히므로 스트림 전용 세션 사용
+            stream_session = replica_router.session() if tenant is None else tenant_engines.session(tenant)
+            async with stream_session as stream_db:
+                async for row in stream_accounts(stream_db, userlevel, onlogin):
+                    yield json.dumps(row, ensure_ascii=False) + "\n"
+
+        return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+    try:
+        items, next_cursor = await list_accounts(db, after, limit, userlevel, onlogin)
+        return {"items": items, "next_cursor": next_cursor}
+    except Exception as e:
+        logger.error(f"Account listing error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+@users_router.get("/password-costs")
+async def password_cost_report(
+    current_user: str = Depends(get_tenant_admin),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """bcrypt cost 별 계정 수 (관리자 또는 테넌트 계정, 현재 cost 가 아닌 계정은 다음 로그인 때 재해싱됨)"""
+    costs = {}
+    for cost, count in (await count_password_costs(db)).items():
+        key = cost if cost and cost.isdigit() else "unknown"
+        costs[key] = costs.get(key, 0) + count
+    target = f"{password_hasher.rounds:02d}"
+    return {
+        "target_cost": password_hasher.rounds,
+        "costs": {str(int(k)) if k.isdigit() else k: v for k, v in sorted(costs.items())},
+        # bcrypt 가 아닌 해시 (unknown) 는 로그인해도 재해싱되지 않으므로 제외
+        "outdated": sum(count for cost, count in costs.items() if cost not in (target, "unknown")),
+    }
 
 @users_router.get("/info", response_model=UserResponse)
 async def get_user_info(current_user: Account = Depends(get_current_user)):
@@ -35,28 +87,34 @@ async def get_user_info(current_user: Account = Depends(get_current_user)):
 @users_router.put("/update")
 async def update_user(
     user_update: UserUpdate,
-    current_user: Account = Depends(get_current_user),
+    request: Request,
+    current_user: str = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """사용자 비밀번호 업데이트"""
     try:
         # 비밀번호 유효성 검사
-        is_valid, error_message = validate_password(user_update.password)
+        is_valid, error_message = password_policy.validate(user_update.password)
         if not is_valid:
+            audit_trail.record("password_change", "rejected_policy", current_user, request)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=error_message
             )
             
-        result = await update_password(db, current_user.username, user_update.password)
+        result = await update_password(db, current_user, user_update.password)
         if result:
-            logger.info(f"Password updated successfully for user: {current_user.username}")
+            # 비밀번호가 바뀌면 기존 토큰은 모두 폐기 (다시 로그인해야 함)
+            await session_manager.remove_session(current_user)
+            audit_trail.record("password_change", "success", current_user, request)
+            logger.info(f"Password updated successfully for user: {current_user}")
             return {
                 "status": "success",
                 "message": "비밀번호가 성공적으로 변경되었습니다."
             }
             
-        logger.warning(f"Password update failed - user not found: {current_user.username}")
+        logger.warning(f"Password update failed - user not found: {current_user}")
+        audit_trail.record("password_change", "not_found", current_user, request)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="사용자를 찾을 수 없습니다."
@@ -69,4 +127,56 @@ async def update_user(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+
+# 대량 등록 입력 형식 (Content-Type 별 파서)
+BULK_PARSERS = {
+    "text/csv": parse_csv,
+    "application/x-ndjson": parse_jsonl,
+    "application/jsonl": parse_jsonl,
+    "application/json-lines": parse_jsonl,
+}
+
+@users_router.post("/bulk", response_model=BulkProvisionResponse)
+async def bulk_provision(
+    request: Request,
+    on_conflict: str = Query("skip", pattern="^(skip|update)$"),
+    batch_size: int = Query(500, ge=1, le=5000),
+    enforce_policy: bool = Query(True),
+    current_user: str = Depends(get_tenant_admin),
+    db: AsyncSession = Depends(get_tenant_db)
+):
+    """CSV/JSONL 스트림으로 계정 대량 등록 (관리자 또는 자기 테넌트의 테넌트 계정)
+
+    요청 본문을 한 번에 읽지 않고 줄 단위로 처리하며, 잘못된 행은
+    보고서에만 기록하고 나머지 행은 계속 등록한다.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    parser = BULK_PARSERS.get(content_type)
+    if parser is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="text/csv 또는 application/x-ndjson 형식만 지원합니다"
+        )
+
+    try:
+        report = await provision_accounts(
+            db,
+            parser(iter_lines(request.stream())),
+            on_conflict=on_conflict,
+            batch_size=batch_size,
+            enforce_policy=enforce_policy
+        )
+        logger.info(f"Bulk provisioning requested by {current_user}: {report['created']} created")
+        return report
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="요청 본문은 UTF-8 이어야 합니다"
+        )
+    except Exception as e:
+        logger.error(f"Bulk provisioning error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
@@ -0,0 +1,334 @@
+import asyncio
+import heapq
+import json
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, List, NamedTuple, Optional
+
+from fastapi import Request
+
+from app.core.config import settings
+from app.core.logging_config import request_id_var
+from app.core.rate_limit import login_throttle
+
+logger = logging.getLogger(__name__)
+
+
+class AuditRecord(NamedTuple):
+    """인증 감사 기록 한 건"""
+    occurred_at: datetime
+    event: str
+    outcome: str
+    username: Optional[str]
+    client_ip: Optional[str]
+    request_id: Optional[str]
+
+    def to_dict(self) -> dict:
+        entry = self._asdict()
+        entry["occurred_at"] = self.occurred_at.isoformat()
+        return entry
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """UTC 로 변환 (시간대가 없는 값은 UTC 로 간주). 파일 이름의 날짜가 UTC 기준이므로 필요"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class DatabaseAuditSink:
+    """table_auditlog 에 batch INSERT (테이블은 처음 쓸 때 없으면 생성)"""
+
+    def __init__(self):
+        self._table_ready = False
+
+    async def _session(self):
+        from app.db.db_config import AsyncSessionLocal, init_engine
+        from app.models.audit_model import AuditEvent
+
+        engine = init_engine()
+        if not self._table_ready:
+            async with engine.begin() as conn:
+                await conn.run_sync(AuditEvent.metadata.create_all, tables=[AuditEvent.__table__])
+            self._table_ready = True
+        return AsyncSessionLocal()
+
+    async def write(self, records: List[AuditRecord]) -> None:
+        from sqlalchemy import insert
+        from app.models.audit_model import AuditEvent
+
+        async with await self._session() as db:
+            await db.execute(insert(AuditEvent), [record._asdict() for record in records])
+            await db.commit()
+
+    async def query(self, start: Optional[datetime], end: Optional[datetime], username: Optional[str],
+                    event: Optional[str], limit: int) -> List[AuditRecord]:
+        from sqlalchemy import select
+        from app.models.audit_model import AuditEvent
+
+        table = AuditEvent.__table__
+        stmt = select(
+            table.c.occurred_at, table.c.event, table.c.outcome,
+            table.c.username, table.c.client_ip, table.c.request_id
+        )
+        if start is not None:
+            stmt = stmt.where(table.c.occurred_at >= start)
+        if end is not None:
+            stmt = stmt.where(table.c.occurred_at < end)
+        if username is not None:
+            stmt = stmt.where(table.c.username == username)
+        if event is not None:
+            stmt = stmt.where(table.c.event == event)
+        stmt = stmt.order_by(table.c.occurred_at.desc(), table.c.id.desc()).limit(limit)
+
+        async with await self._session() as db:
+            result = await db.execute(stmt)
+            return [AuditRecord(_utc(row[0]), *row[1:]) for row in result]
+
+
+class JsonlAuditSink:
+    """날짜별 JSONL 파일에 추가 (audit-YYYYMMDD.jsonl, max_bytes 를 넘으면 audit-YYYYMMDD-1.jsonl ...)
+
+    파일 입출력은 이벤트 루프를 막지 않도록 스레드에서 실행한다.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 100 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._day: Optional[str] = None
+        self._part = 0
+
+    def _path(self, day: str, part: int) -> str:
+        name = f"audit-{day}.jsonl" if part == 0 else f"audit-{day}-{part}.jsonl"
+        return os.path.join(self.directory, name)
+
+    def _current_path(self, day: str) -> str:
+        if day != self._day:
+            # 재시작 후에도 그날의 마지막 파일부터 이어 씀
+            self._day, self._part = day, 0
+            while os.path.exists(self._path(day, self._part + 1)):
+                self._part += 1
+        path = self._path(day, self._part)
+        if os.path.exists(path) and os.path.getsize(path) >= self.max_bytes:
+            self._part += 1
+            path = self._path(day, self._part)
+        return path
+
+    def _append(self, records: List[AuditRecord]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        by_day = {}
+        for record in records:
+            by_day.setdefault(record.occurred_at.strftime("%Y%m%d"), []).append(record)
+        for day, day_records in by_day.items():
+            lines = "".join(
+                json.dumps(record.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n"
+                for record in day_records
+            )
+            with open(self._current_path(day), "a", encoding="utf-8") as f:
+                f.write(lines)
+
+    async def write(self, records: List[AuditRecord]) -> None:
+        await asyncio.to_thread(self._append, records)
+
+    def _scan(self, start: Optional[datetime], end: Optional[datetime], username: Optional[str],
+              event: Optional[str], limit: int) -> List[AuditRecord]:
+        if not os.path.isdir(self.directory):
+            return []
+        first_day = start.strftime("%Y%m%d") if start else None
+        last_day = end.strftime("%Y%m%d") if end else None
+        matches = []
+        for name in os.listdir(self.directory):
+            if not (name.startswith("audit-") and name.endswith(".jsonl")):
+                continue
+            # 파일 이름의 날짜로 범위 밖 파일은 열지 않음
+            day = name[len("audit-"):len("audit-") + 8]
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            with open(os.path.join(self.directory, name), encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        record = AuditRecord(
+                            datetime.fromisoformat(entry["occurred_at"]), entry["event"], entry["outcome"],
+                            entry.get("username"), entry.get("client_ip"), entry.get("request_id")
+                        )
+                    except (ValueError, KeyError):
+                        continue
+                    if username is not None and record.username != username:
+                        continue
+                    if event is not None and record.event != event:
+                        continue
+                    if (start and record.occurred_at < start) or (end and record.occurred_at >= end):
+                        continue
+                    matches.append(record)
+        return heapq.nlargest(limit, matches, key=lambda record: record.occurred_at)
+
+    async def query(self, start: Optional[datetime], end: Optional[datetime], username: Optional[str],
+                    event: Optional[str], limit: int) -> List[AuditRecord]:
+        return await asyncio.to_thread(self._scan, start, end, username, event, limit)
+
+
+class AuditTrail:
+    """인증 감사 기록 버퍼
+
+    요청 처리 중에는 제한된 크기의 메모리 큐에 넣기만 하고, 백그라운드 작업이
+    flush_interval 초마다 (큐가 절반 이상 차면 바로) batch_size 건씩 저장한다.
+    큐가 가득 차면 새 기록은 버리고 dropped 로 집계한다.
+    """
+
+    def __init__(self, sink=None, max_queue: int = 10000, flush_interval: float = 1.0,
+                 batch_size: int = 500):
+        self.sink = sink
+        self.max_queue = max_queue
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._queue: Deque[AuditRecord] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.backpressure = 0  # 큐가 절반을 넘어 주기를 기다리지 않고 flush 한 횟수
+        self.failures = 0
+        self.last_flush_ms: Optional[float] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.sink is not None
+
+    def record(self, event: str, outcome: str, username: Optional[str] = None,
+               request: Optional[Request] = None) -> None:
+        """감사 기록 추가 (I/O 없이 바로 반환)"""
+        if not self.enabled:
+            return
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        self._queue.append(AuditRecord(
+            datetime.now(timezone.utc),
+            event,
+            outcome,
+            username[:32] if username else username,
+            login_throttle.client_ip(request)[:45] if request is not None else None,
+            request_id_var.get()
+        ))
+        self.recorded += 1
+        if (
+            self._wakeup is not None
+            and not self._wakeup.is_set()
+            and len(self._queue) * 2 >= self.max_queue
+        ):
+            self.backpressure += 1
+            self._wakeup.set()
+
+    def _lock(self) -> asyncio.Lock:
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        return self._flush_lock
+
+    async def flush(self) -> int:
+        """큐에 쌓인 기록을 저장하고 저장한 건수 반환"""
+        if not self.enabled:
+            return 0
+        async with self._lock():
+            started = time.perf_counter()
+            written = 0
+            while self._queue:
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                try:
+                    await self.sink.write(batch)
+                except Exception as e:
+                    self.failures += 1
+                    # 저장하지 못한 batch 는 큐 앞에 되돌리고, 자리가 없으면 버림
+                    room = max(0, self.max_queue - len(self._queue))
+                    self.dropped += max(0, len(batch) - room)
+                    self._queue.extendleft(reversed(batch[:room]))
+                    logger.warning(f"Audit flush failed, {len(self._queue)} records queued: {e}")
+                    break
+                written += len(batch)
+            self.written += written
+            self.last_flush_ms = (time.perf_counter() - started) * 1000
+            return written
+
+    async def query(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                    username: Optional[str] = None, event: Optional[str] = None,
+                    limit: int = 100) -> List[AuditRecord]:
+        """기간·사용자·이벤트로 조회 (최신순)
+
+        이 워커의 큐만 먼저 저장하므로, 다른 워커의 기록은 그 워커가 다음에 저장할
+        때까지 (최대 flush_interval) 빠질 수 있다.
+        """
+        if not self.enabled:
+            return []
+        await self.flush()
+        return await self.sink.query(_utc(start), _utc(end), username, event, limit)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """백그라운드 flush 시작"""
+        if self.enabled and self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """백그라운드 flush 를 멈추고 남은 기록 저장 (엔진 정리 전에 호출)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
+        await self.flush()
+        if self._queue:
+            logger.error(f"Audit flush on shutdown failed, {len(self._queue)} records lost")
+
+    def stats(self) -> dict:
+        return {
+            "sink": type(self.sink).__name__ if self.sink is not None else None,
+            "queued": len(self._queue),
+            "max_queue": self.max_queue,
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "backpressure": self.backpressure,
+            "failures": self.failures,
+            "last_flush_ms": self.last_flush_ms,
+        }
+
+
+def _create_sink():
+    if settings.AUDIT_SINK == "database":
+        return DatabaseAuditSink()
+    if settings.AUDIT_SINK == "jsonl":
+        return JsonlAuditSink(settings.AUDIT_JSONL_DIR, settings.AUDIT_JSONL_MAX_BYTES)
+    if settings.AUDIT_SINK == "none":
+        return None
+    raise ValueError(f"지원하지 않는 AUDIT_SINK 입니다: {settings.AUDIT_SINK}")
+
+
+# 전역 인스턴스 생성
+audit_trail = AuditTrail(
+    sink=_create_sink(),
+    max_queue=settings.AUDIT_QUEUE_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    batch_size=settings.AUDIT_FLUSH_BATCH_SIZE
+)
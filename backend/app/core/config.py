@@ -9,16 +9,129 @@ class Settings(BaseSettings):
     DB_PASSWORD: str
     DB_HOST: str
     DB_PORT: int
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_LIVENESS: str = "background"  # background | pre_ping | none
+    DB_LIVENESS_INTERVAL_SECONDS: float = 15.0
+    DB_SLOW_QUERY_MS: float = 200.0
+    DB_WARMUP_CONNECTIONS: int = 5  # 시작 시 미리 열어 둘 연결 수 (0 이면 사용 안 함)
+    DB_CONNECTION_BUDGET: int = 200  # 이 서버의 모든 워커·엔진이 여는 연결 상한 (기본 DB·복제본 풀 포함)
+    WEB_CONCURRENCY: int = 1  # 워커 프로세스 수 (uvicorn --workers 기본값과 같은 환경 변수, 예산을 나눔)
+
+    # Read replica settings
+    DB_REPLICA_HOSTS: str = ""  # 'host[:port],...' 또는 전체 URL 목록 (비어 있으면 모든 읽기를 기본 DB 로)
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0  # 재생 지연이 이보다 크면 기본 DB 에서 읽음
+    DB_REPLICA_CHECK_INTERVAL_SECONDS: float = 5.0
+    DB_REPLICA_POOL_SIZE: int = 5
+    DB_REPLICA_MAX_OVERFLOW: int = 10
+
+    # Tenant database routing settings
+    TENANT_ROUTING_ENABLED: bool = False
+    TENANT_USERLEVEL: int = 2  # 이 userlevel 계정은 username 이 곧 테넌트(vPBX DB) 이름이고 그 테넌트의 /users API 를 씀
+    TENANT_DB_NAME_TEMPLATE: str = "{tenant}"
+    TENANT_ENGINE_CACHE_SIZE: int = 50  # 동시에 열어 둘 테넌트 엔진 수 (LRU)
+    TENANT_ENGINE_IDLE_SECONDS: float = 300.0  # 이만큼 쓰지 않은 테넌트 풀은 닫음
+    TENANT_POOL_SIZE: int = 2
+    TENANT_MAX_OVERFLOW: int = 3
     
     # JWT settings
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int
+    JWT_KEYS_DIR: Optional[str] = None  # RS256/ES256 서명 키 디렉터리 ('<kid>.pem')
+    JWT_ACTIVE_KID: Optional[str] = None  # 기본값: 공개된 지 reload + JWKS max-age 가 지난 개인키 중 이름순 마지막
+    JWT_KEYS_RELOAD_SECONDS: float = 60.0  # 키 디렉터리 변경 확인 주기
+    JWT_JWKS_MAX_AGE: int = 300  # /.well-known/jwks.json Cache-Control max-age
     
     # API settings
     API_HOST: str
     API_PORT: int
-    
+    MAX_JSON_BODY_BYTES: int = 1024 * 1024  # 이보다 큰 JSON 본문은 413
+    ADMIN_USERLEVEL: int = 9  # 이 userlevel 이상인 계정만 관리 API (대량 등록 등) 사용 가능
+
+    # Logging settings
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: str = ""  # 모듈별 레벨, 예: "app.crud=DEBUG,sqlalchemy.engine=WARNING"
+    LOG_FORMAT: str = "json"  # json | text
+    LOG_DEBUG_SAMPLE_RATE: float = 1.0  # DEBUG 로그 중 출력할 비율 (0.0 ~ 1.0)
+    LOG_QUEUE_SIZE: int = 10000
+
+    # Health check settings
+    HEALTH_DB_CACHE_SECONDS: float = 2.0
+    HEALTH_DB_TIMEOUT_SECONDS: float = 2.0
+    READY_MAX_POOL_SATURATION: float = 0.9  # checked_out / (pool_size + max_overflow)
+    READY_MAX_DB_LATENCY_MS: float = 500.0
+    READY_MAX_HASH_QUEUE: int = 32
+    WARMUP_STEP_TIMEOUT_SECONDS: float = 10.0  # 워밍업 단계별 제한 시간
+
+    # Password hashing settings
+    HASH_EXECUTOR: str = "thread"  # thread | process
+    HASH_MAX_WORKERS: int = 4
+    HASH_MAX_CONCURRENCY: Optional[int] = None  # 기본값: HASH_MAX_WORKERS
+    BCRYPT_ROUNDS: int = 12  # 새 해시의 cost (BCRYPT_TARGET_VERIFY_MS 를 설정하면 시작 시 보정값 사용)
+    BCRYPT_TARGET_VERIFY_MS: Optional[float] = None  # 이 검증 지연 시간에 맞춰 cost 보정
+    # 보정 결과 파일 (처음 시작한 워커 하나만 측정하고 나머지 워커와 재시작은 이 값을 사용)
+    # 여러 서버가 있으면 공유 경로에 두거나 BCRYPT_ROUNDS 로 고정
+    BCRYPT_CALIBRATION_PATH: str = "bcrypt_calibration.json"
+    BCRYPT_MIN_ROUNDS: int = 10
+    BCRYPT_MAX_ROUNDS: int = 15
+    BCRYPT_REHASH_ON_LOGIN: bool = True  # 로그인 성공 시 cost 가 다른 해시를 다시 저장
+
+    # Token cache settings
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+
+    # Session store settings
+    SESSION_BACKEND: str = "stateless"  # stateless | memory | sqlite | postgres
+    SESSION_SQLITE_PATH: str = "sessions.db"
+    SESSION_CACHE_TTL_SECONDS: float = 2.0  # postgres 저장소의 로컬 읽기 캐시
+    # 사용자당 동시 로그인 기기 수. stateless 에서 1 이면 로그인마다 폐기 저장소에 버전을 기록
+    SESSION_MAX_PER_USER: int = 1
+    REVOCATION_MAX_DENIED: int = 100000  # stateless: 보관하는 폐기 jti 최대 수
+    # stateless 의 폐기 정보 저장소: sqlite (같은 서버의 워커끼리 공유, SESSION_SQLITE_PATH 사용)
+    # | postgres (여러 서버) | memory (워커 1개에서만, 재시작하면 폐기가 사라짐)
+    REVOCATION_STORE: str = "sqlite"
+    REVOCATION_CACHE_TTL_SECONDS: float = 2.0  # 다른 워커의 로그아웃이 반영되기까지 최대 시간
+
+    # Account cache settings
+    ACCOUNT_CACHE_SIZE: int = 10000
+    # 무효화는 워커 로컬이므로, 다른 워커에서 바뀐 비밀번호·계정은 이 시간까지 이전 값으로 보일 수 있음
+    ACCOUNT_CACHE_TTL_SECONDS: float = 2.0
+    ACCOUNT_CACHE_NEGATIVE_TTL_SECONDS: float = 1.0  # 존재하지 않는 계정 캐시
+
+    # Presence (onlogin) write-behind settings
+    PRESENCE_TRACKING_ENABLED: bool = True
+    PRESENCE_FLUSH_INTERVAL_SECONDS: float = 1.0
+    PRESENCE_FLUSH_MAX_PENDING: int = 500  # 대기 중인 사용자가 이만큼 쌓이면 바로 저장
+    PRESENCE_FLUSH_BATCH_SIZE: int = 1000  # UPDATE 한 문장에 넣는 최대 행 수
+
+    # Audit trail settings
+    AUDIT_SINK: str = "database"  # database | jsonl | none
+    AUDIT_QUEUE_SIZE: int = 10000  # 가득 차면 새 기록은 버리고 dropped 로 집계
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_FLUSH_BATCH_SIZE: int = 500
+    AUDIT_JSONL_DIR: str = "audit"
+    AUDIT_JSONL_MAX_BYTES: int = 100 * 1024 * 1024  # 넘으면 같은 날짜의 다음 파일로 교체
+
+    # Login throttling settings
+    LOGIN_THROTTLE_ENABLED: bool = True
+    LOGIN_IP_BURST: int = 30  # IP 당 연속 허용 로그인 시도
+    LOGIN_IP_PER_MINUTE: float = 60.0
+    LOGIN_USER_BURST: int = 5  # 계정당 연속 허용 실패
+    LOGIN_USER_PER_MINUTE: float = 5.0
+    LOGIN_THROTTLE_MAX_KEYS: int = 100000  # 추적하는 IP / 사용자 이름 최대 수
+    LOGIN_TRUST_FORWARDED_FOR: bool = False  # 프록시 뒤에서만 X-Forwarded-For 사용
+
+    # Password policy settings
+    PASSWORD_MIN_LENGTH: int = 8
+    PASSWORD_MAX_LENGTH: int = 20
+    PASSWORD_FORBIDDEN_PATTERNS: str = "qwerty,asdfgh,zxcvbn,password,admin,123456,abcdef"
+    PASSWORD_BREACHED_LIST_PATH: Optional[str] = None  # scripts/build_breached_list.py 로 생성
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding='utf-8',
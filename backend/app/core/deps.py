@@ -1,14 +1,25 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
+from .config import settings
 from .session import session_manager
 from .security import decode_token
+from .token_cache import token_cache
+from ..crud.user_crud import get_account
+from ..db.db_config import AsyncSessionLocal, init_engine
+from ..db.replicas import replica_router
+from ..db.tenant_engines import TENANT_NAME, ConnectionBudgetExceeded, tenant_engines, tenant_for
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     """현재 인증된 사용자 확인"""
     try:
-        payload = decode_token(token)
+        # 같은 토큰은 서명 검증을 반복하지 않도록 캐시 사용
+        payload = token_cache.get(token)
+        if payload is None:
+            payload = decode_token(token)
+            token_cache.put(token, payload)
         username = payload.get("sub")
         if not username:
             raise HTTPException(
@@ -17,7 +28,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
             )
             
         # 세션 유효성 검증
-        if not session_manager.validate_session(username, token):
+        if not await session_manager.validate_session(username, token, payload):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Session expired or invalid"
@@ -29,4 +40,117 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials"
-        )
\ No newline at end of file
+        )
+
+async def _current_account(username: str):
+    """현재 사용자의 계정 정보 (계정 캐시 사용)"""
+    init_engine()
+    async with AsyncSessionLocal() as db:
+        return await get_account(db, username)
+
+async def is_admin(username: str) -> bool:
+    """userlevel 이 ADMIN_USERLEVEL 이상인 계정인지 확인"""
+    account = await _current_account(username)
+    return account is not None and account.userlevel is not None and account.userlevel >= settings.ADMIN_USERLEVEL
+
+async def get_admin_user(username: str = Depends(get_current_user)) -> str:
+    """관리자 계정만 허용 (userlevel 이 ADMIN_USERLEVEL 이상, 아니면 403)"""
+    if not await is_admin(username):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자 권한이 필요합니다"
+        )
+    return username
+
+async def _own_tenant(token: str, username: str) -> Optional[str]:
+    """계정 자신의 테넌트 (테넌트 계정이 아니면 None)"""
+    payload = token_cache.get(token) or decode_token(token)
+    if "tnt" in payload:
+        return payload["tnt"]
+    # 테넌트 클레임이 없는 예전 토큰은 계정 정보로 판단 (계정 캐시 사용)
+    account = await _current_account(username)
+    return tenant_for(username, account.userlevel) if account else None
+
+async def get_current_tenant(
+    tenant: Optional[str] = Query(None, max_length=63, description="관리자가 다룰 테넌트 (없으면 기본 DB)"),
+    token: str = Depends(oauth2_scheme),
+    username: str = Depends(get_current_user)
+) -> Optional[str]:
+    """요청이 다룰 테넌트 (None 이면 기본 DB)
+
+    - 테넌트 계정: 항상 자기 테넌트 (다른 테넌트를 지정하면 403)
+    - 관리자: tenant 파라미터로 지정한 테넌트, 없으면 기본 DB
+    """
+    if not settings.TENANT_ROUTING_ENABLED:
+        if tenant is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="테넌트 라우팅이 꺼져 있습니다"
+            )
+        return None
+    own = await _own_tenant(token, username)
+    if own is not None:
+        if tenant is not None and tenant != own:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="다른 테넌트에 접근할 수 없습니다"
+            )
+        return own
+    if tenant is None:
+        return None
+    if not await is_admin(username):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자 권한이 필요합니다"
+        )
+    if not TENANT_NAME.match(tenant):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 테넌트 이름입니다"
+        )
+    return tenant
+
+async def get_tenant_admin(
+    token: str = Depends(oauth2_scheme),
+    username: str = Depends(get_current_user),
+    tenant: Optional[str] = Depends(get_current_tenant)
+) -> str:
+    """테넌트 범위 관리 작업 허용: 관리자, 또는 자기 테넌트를 다루는 테넌트 계정 (아니면 403)"""
+    if tenant is not None and tenant == await _own_tenant(token, username):
+        return username
+    return await get_admin_user(username)
+
+async def get_tenant_db(tenant: Optional[str] = Depends(get_current_tenant)):
+    """테넌트 DB 세션 의존성 (테넌트가 없으면 기본 DB, 동작은 get_db 와 같음)"""
+    if tenant is None:
+        init_engine()
+        context = AsyncSessionLocal()
+    else:
+        context = tenant_engines.session(tenant)
+    try:
+        async with context as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+    except ConnectionBudgetExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
+
+async def get_read_db(tenant: Optional[str] = Depends(get_current_tenant)):
+    """읽기 전용 세션 의존성 (기본 DB 는 복제본 우선, 테넌트 DB 는 복제본 없이 그대로)"""
+    context = replica_router.session() if tenant is None else tenant_engines.session(tenant)
+    try:
+        async with context as session:
+            yield session
+    except ConnectionBudgetExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
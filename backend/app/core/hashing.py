@@ -0,0 +1,268 @@
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Deque, Optional
+
+import bcrypt
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# 프로세스 풀에서도 실행할 수 있도록 모듈 최상위 함수로 정의 (pickle 가능해야 함)
+def _hash_password(password: bytes, rounds: int) -> str:
+    """bcrypt 해시 생성 (워커에서 실행)"""
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check_password(password: bytes, hashed: bytes) -> bool:
+    """bcrypt 해시 검증 (워커에서 실행)"""
+    return bcrypt.checkpw(password, hashed)
+
+
+def hash_cost(hashed_password: str) -> Optional[int]:
+    """bcrypt 해시('$2b$12$...')의 cost, 형식이 다르면 None"""
+    parts = hashed_password.split("$")
+    if len(parts) != 4 or parts[1] not in ("2a", "2b", "2y") or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    """bcrypt 연산을 이벤트 루프 밖의 워커 풀에서 실행하는 비동기 해싱 서비스
+
+    bcrypt 는 호출 한 번에 수백 ms 동안 CPU 를 점유하므로 async 핸들러에서
+    직접 부르면 같은 워커의 모든 요청이 멈춘다. 여기서는 스레드/프로세스 풀로
+    넘기고, 세마포어로 동시 실행 수를 제한해 대기열 길이와 지연 시간을 기록한다.
+    """
+
+    def __init__(
+        self,
+        executor_type: str = "thread",
+        max_workers: int = 4,
+        max_concurrency: Optional[int] = None,
+        rounds: int = 12,
+        latency_window: int = 1000
+    ):
+        if executor_type not in ("thread", "process"):
+            raise ValueError(f"지원하지 않는 executor 유형입니다: {executor_type}")
+
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency or max_workers
+        self.rounds = rounds
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # 통계
+        self._waiting = 0      # 슬롯을 기다리는 호출 수 (대기열 길이)
+        self._running = 0      # 워커에서 실행 중인 호출 수
+        self._calls = 0
+        self._errors = 0
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self._wait_times: Deque[float] = deque(maxlen=latency_window)
+
+    def _get_executor(self) -> Executor:
+        """워커 풀을 처음 사용할 때 생성"""
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _run(self, func, *args):
+        """동시 실행 수 제한을 지키며 워커 풀에서 함수 실행"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._get_semaphore()
+
+        queued_at = time.perf_counter()
+        self._waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        started_at = time.perf_counter()
+        self._running += 1
+        try:
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        except Exception:
+            self._errors += 1
+            raise
+        finally:
+            finished_at = time.perf_counter()
+            self._running -= 1
+            self._calls += 1
+            self._wait_times.append(started_at - queued_at)
+            self._latencies.append(finished_at - started_at)
+            semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        """비밀번호 해싱"""
+        return await self._run(_hash_password, password.encode('utf-8'), self.rounds)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """비밀번호 검증"""
+        return await self._run(
+            _check_password,
+            plain_password.encode('utf-8'),
+            hashed_password.encode('utf-8')
+        )
+
+    async def warm_up(self) -> None:
+        """워커를 모두 띄워 둠 (첫 로그인이 프로세스/스레드 생성 시간을 기다리지 않도록)"""
+        probe = bcrypt.hashpw(b"warm-up", bcrypt.gensalt(4))
+        await asyncio.gather(*(
+            self._run(_check_password, b"warm-up", probe) for _ in range(self.max_workers)
+        ))
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """현재 cost 와 다른 bcrypt 해시인지 확인"""
+        cost = hash_cost(hashed_password)
+        return cost is not None and cost != self.rounds
+
+    async def calibrate(self, target_ms: float, min_rounds: int = 10, max_rounds: int = 15) -> int:
+        """검증 한 번이 target_ms 를 넘지 않는 가장 큰 cost 를 골라 적용
+
+        bcrypt 는 cost 가 1 오를 때마다 시간이 두 배가 되므로, 빠른 낮은 cost 로
+        워커 풀에서 몇 번 재고 나머지는 외삽한다.
+        """
+        probe_rounds = 6
+        probe = bcrypt.hashpw(b"calibration", bcrypt.gensalt(probe_rounds))
+        samples = []
+        for _ in range(5):
+            started = time.perf_counter()
+            await self._run(_check_password, b"calibration", probe)
+            samples.append(time.perf_counter() - started)
+        base_ms = sorted(samples)[len(samples) // 2] * 1000
+
+        rounds = min_rounds
+        for candidate in range(min_rounds, max_rounds + 1):
+            if base_ms * 2 ** (candidate - probe_rounds) <= target_ms:
+                rounds = candidate
+        self.rounds = rounds
+        logger.info(
+            f"bcrypt cost calibrated: {rounds} "
+            f"(estimated {base_ms * 2 ** (rounds - probe_rounds):.0f}ms, target {target_ms:.0f}ms)"
+        )
+        return rounds
+
+    @staticmethod
+    def _percentile(samples, ratio: float) -> float:
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * ratio))
+        return ordered[index]
+
+    def stats(self) -> dict:
+        """대기열 길이와 호출별 지연 시간 통계 (초 단위)"""
+        latencies = list(self._latencies)
+        wait_times = list(self._wait_times)
+        return {
+            "executor": self.executor_type,
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "rounds": self.rounds,
+            "queue_depth": self._waiting,
+            "in_flight": self._running,
+            "calls": self._calls,
+            "errors": self._errors,
+            "latency": {
+                "last": latencies[-1] if latencies else 0.0,
+                "avg": sum(latencies) / len(latencies) if latencies else 0.0,
+                "p50": self._percentile(latencies, 0.50),
+                "p95": self._percentile(latencies, 0.95),
+                "p99": self._percentile(latencies, 0.99),
+                "max": max(latencies) if latencies else 0.0,
+            },
+            "wait": {
+                "avg": sum(wait_times) / len(wait_times) if wait_times else 0.0,
+                "p95": self._percentile(wait_times, 0.95),
+                "max": max(wait_times) if wait_times else 0.0,
+            },
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """워커 풀 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+# 전역 인스턴스 생성
+password_hasher = PasswordHasher(
+    executor_type=settings.HASH_EXECUTOR,
+    max_workers=settings.HASH_MAX_WORKERS,
+    max_concurrency=settings.HASH_MAX_CONCURRENCY,
+    rounds=settings.BCRYPT_ROUNDS
+)
+
+
+def _lock_calibration(path: str):
+    """보정 결과 파일의 배타 잠금 (닫으면 해제, 다른 워커가 측정 중이면 기다림)"""
+    lock = open(f"{path}.lock", "a")
+    fcntl.flock(lock, fcntl.LOCK_EX)
+    return lock
+
+
+def _read_calibration(path: str, target_ms: float) -> Optional[int]:
+    """같은 목표 지연 시간으로 저장된 cost (없거나 목표가 다르면 None)"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if saved.get("target_ms") != target_ms or not isinstance(saved.get("rounds"), int):
+        return None
+    return saved["rounds"]
+
+
+def _write_calibration(path: str, target_ms: float, rounds: int) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"target_ms": target_ms, "rounds": rounds, "calibrated_at": time.time()}, f)
+    os.replace(tmp, path)
+
+
+async def calibrate_password_hasher():
+    """BCRYPT_TARGET_VERIFY_MS 가 설정되어 있으면 시작 시 cost 보정
+
+    워커마다 따로 재면 cost 가 달라져 로그인 때마다 서로 다른 cost 로 재해싱하므로,
+    처음 한 번만 재서 BCRYPT_CALIBRATION_PATH 에 저장하고 이후에는 저장된 값을 쓴다.
+    다시 재려면 파일을 지우거나 목표 지연 시간을 바꾼다.
+    """
+    target_ms = settings.BCRYPT_TARGET_VERIFY_MS
+    if not target_ms:
+        return
+    path = settings.BCRYPT_CALIBRATION_PATH
+    lock = await asyncio.to_thread(_lock_calibration, path)
+    try:
+        rounds = _read_calibration(path, target_ms)
+        if rounds is not None:
+            password_hasher.rounds = min(max(rounds, settings.BCRYPT_MIN_ROUNDS), settings.BCRYPT_MAX_ROUNDS)
+            logger.info(f"bcrypt cost loaded from {path}: {password_hasher.rounds}")
+            return
+        rounds = await password_hasher.calibrate(
+            target_ms,
+            min_rounds=settings.BCRYPT_MIN_ROUNDS,
+            max_rounds=settings.BCRYPT_MAX_ROUNDS
+        )
+        _write_calibration(path, target_ms, rounds)
+    finally:
+        lock.close()
@@ -0,0 +1,227 @@
+import asyncio
+import functools
+import inspect
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# 기본 지연 시간 버킷 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Histogram:
+    """Prometheus 히스토그램
+
+    observe() 는 bisect 한 번과 리스트 원소 증가뿐이라 운영 중에
+    켜 두어도 부담이 없다. 누적(cumulative) 값은 출력할 때만 계산한다.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels: [버킷별 개수..., +Inf 개수], 합계
+        self._series: Dict[Tuple, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labelvalues) -> None:
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = self._series[labelvalues] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = series
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self) -> List[str]:
+        lines = []
+        for labelvalues, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labelvalues, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Counter:
+    """증가만 하는 카운터"""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, *labelvalues) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"
+            for labelvalues, value in self._values.items()
+        ]
+
+
+class CallbackMetric:
+    """출력할 때 콜백으로 값을 읽는 게이지/카운터
+
+    다른 모듈이 이미 들고 있는 통계(세션 수, 캐시 적중 수 등)를 복사하지
+    않고 그대로 노출한다. 콜백은 숫자 또는 {라벨값 튜플: 숫자} 를 반환하며
+    코루틴이어도 된다.
+    """
+
+    def __init__(self, name: str, documentation: str, callback: Callable,
+                 labelnames: Sequence[str] = (), metric_type: str = "gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.labelnames = tuple(labelnames)
+        self.type = metric_type
+
+    async def collect(self) -> List[str]:
+        value = self.callback()
+        if inspect.isawaitable(value):
+            value = await value
+        if not isinstance(value, dict):
+            value = {(): value}
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(sample)}"
+            for labelvalues, sample in value.items()
+            if sample is not None
+        ]
+
+
+class MetricsRegistry:
+    """등록된 지표를 Prometheus text 형식으로 출력"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"이미 등록된 지표입니다: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def callback(self, name: str, documentation: str, callback: Callable,
+                 labelnames: Sequence[str] = (), metric_type: str = "gauge") -> CallbackMetric:
+        return self._register(CallbackMetric(name, documentation, callback, labelnames, metric_type))
+
+    async def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            if isinstance(metric, CallbackMetric):
+                lines.extend(await metric.collect())
+            else:
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 전역 인스턴스 생성
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.histogram(
+    "vpbx_http_request_duration_seconds",
+    "HTTP request latency by route and status",
+    ("method", "route", "status")
+)
+STAGE_LATENCY = registry.histogram(
+    "vpbx_stage_duration_seconds",
+    "Latency of internal stages on the request path",
+    ("stage",)
+)
+
+
+def timed(stage: str):
+    """함수 실행 시간을 STAGE_LATENCY 에 기록하는 데코레이터 (동기/비동기 모두 지원)"""
+
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    STAGE_LATENCY.observe(time.perf_counter() - started, stage)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                STAGE_LATENCY.observe(time.perf_counter() - started, stage)
+        return wrapper
+
+    return decorator
+
+
+class MetricsMiddleware:
+    """라우트 템플릿·상태 코드별 요청 지연 시간을 기록하는 ASGI 미들웨어
+
+    라벨에는 실제 경로 대신 라우트 템플릿을 써서 시계열 수가 늘어나지 않게 한다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status_code
+            )
@@ -1,29 +1,204 @@
 from fastapi import Request
-from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
 import re
 import json
 import logging
+import uuid
+from app.core.logging_config import request_id_var
 
 logger = logging.getLogger(__name__)
 
-async def xss_protection_middleware(request: Request, call_next):
-    try:
-        body = await request.json()
-        # XSS 패턴 검사
-        if any(re.search(r'<script.*?>.*?</script>', str(value), re.I) 
-               for value in body.values()):
-            logger.warning("XSS 공격 시도가 감지되었습니다")
-            return JSONResponse(
-                status_code=400,
-                content={"detail": "잠재적인 XSS 공격이 감지되었습니다"}
+# XSS 패턴 (모듈 로드 시 한 번만 컴파일)
+XSS_PATTERN = re.compile(
+    r"<\s*script\b[^>]*>"            # <script ...>
+    r"|<\s*/\s*script\s*>"           # </script>
+    r"|javascript\s*:"                # javascript: URL
+    r"|<\s*(?:iframe|object|embed)\b"  # 외부 콘텐츠 삽입 태그
+    r"|<[^>]+\son\w+\s*=",            # <img onerror=...> 같은 이벤트 핸들러
+    re.IGNORECASE
+)
+
+# 본문이 없는 메서드
+BODYLESS_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "TRACE"})
+
+# 파싱한 JSON 본문을 라우트에 넘길 때 쓰는 scope 키
+PARSED_BODY_KEY = "vpbx.parsed_body"
+
+
+def contains_xss(value) -> bool:
+    """중첩된 dict/list 를 모두 돌며 문자열 키·값에 XSS 패턴이 있는지 확인
+
+    재귀 호출 대신 스택을 사용하므로 깊게 중첩된 입력에도 안전하다.
+    """
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            # 태그나 URL 스킴이 없는 문자열은 정규식을 돌리지 않음
+            if ("<" in item or ":" in item) and XSS_PATTERN.search(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return False
+
+
+def _is_json_content_type(content_type: bytes) -> bool:
+    """JSON 으로 검사할 Content-Type 인지 (없거나 비어 있어도 FastAPI 는 JSON 으로 파싱하므로 포함)"""
+    media_type = content_type.split(b";", 1)[0].strip().lower()
+    return not media_type or media_type == b"application/json" or media_type.endswith(b"+json")
+
+
+class XSSProtectionMiddleware:
+    """JSON 본문 XSS 검사 ASGI 미들웨어
+
+    - 본문이 없는 메서드와 JSON 이 아닌 요청은 그대로 통과 (스트리밍 업로드 포함)
+    - Content-Type 이 없거나 비어 있는 요청은 JSON 으로 보고 검사
+    - max_body_bytes 를 넘는 JSON 본문은 413 으로 거절
+    - 본문을 한 번만 파싱해 scope 에 넣어 두고, ParsedBodyRoute 가 이를 재사용
+    """
+
+    def __init__(self, app, max_body_bytes: int = 1024 * 1024):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in BODYLESS_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        content_type = b""
+        content_length = None
+        for name, value in scope["headers"]:
+            if name == b"content-type":
+                content_type = value
+            elif name == b"content-length":
+                try:
+                    content_length = int(value)
+                except ValueError:
+                    content_length = None
+        if not _is_json_content_type(content_type):
+            await self.app(scope, receive, send)
+            return
+
+        if content_length is not None and content_length > self.max_body_bytes:
+            await self._reject(send, 413, "요청 본문이 너무 큽니다")
+            return
+
+        # 본문 읽기 (최대 크기 초과 시 중단)
+        chunks = []
+        received = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunk = message.get("body", b"")
+            received += len(chunk)
+            if received > self.max_body_bytes:
+                await self._reject(send, 413, "요청 본문이 너무 큽니다")
+                return
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        if body:
+            try:
+                parsed = json.loads(body)
+            except ValueError:
+                # 잘못된 JSON 은 엔드포인트가 422 로 처리
+                parsed = None
+            else:
+                if contains_xss(parsed):
+                    logger.warning("XSS 공격 시도가 감지되었습니다", extra={"path": scope["path"]})
+                    await self._reject(send, 400, "잠재적인 XSS 공격이 감지되었습니다")
+                    return
+                scope[PARSED_BODY_KEY] = (body, parsed)
+
+        # 이미 읽은 본문을 하위 앱에 다시 전달
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, replay_receive, send)
+
+    @staticmethod
+    async def _reject(send, status_code: int, detail: str) -> None:
+        payload = json.dumps({"detail": detail}, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": payload})
+
+
+class ParsedBodyRequest(Request):
+    """XSSProtectionMiddleware 가 파싱해 둔 본문을 재사용하는 Request"""
+
+    def __init__(self, scope, receive=None, send=None):
+        super().__init__(scope, receive, send)
+        parsed = scope.get(PARSED_BODY_KEY)
+        if parsed is not None:
+            self._body, self._json = parsed
+
+
+class ParsedBodyRoute(APIRoute):
+    """본문을 다시 파싱하지 않도록 ParsedBodyRequest 를 쓰는 라우트 클래스"""
+
+    def get_route_handler(self):
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request):
+            return await original_route_handler(
+                ParsedBodyRequest(request.scope, request.receive)
             )
-    except json.JSONDecodeError:
-        # JSON 파싱 실패는 정상적인 경우일 수 있음 (예: form-data)
-        pass
-    except Exception as e:
-        # 예상치 못한 오류는 로깅
-        logger.error(f"미들웨어 처리 중 오류 발생: {str(e)}")
-        pass
-    
-    response = await call_next(request)
-    return response 
\ No newline at end of file
+
+        return route_handler
+
+class RequestIdMiddleware:
+    """요청마다 ID 를 부여해 로그에 남기고 X-Request-ID 응답 헤더로 돌려줌
+
+    클라이언트가 X-Request-ID 를 보내면 그대로 사용한다. BaseHTTPMiddleware
+    를 거치지 않는 순수 ASGI 미들웨어라 요청당 비용이 작다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        if not request_id:
+            request_id = uuid.uuid4().hex
+
+        token = request_id_var.set(request_id)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,214 @@
+import hashlib
+import logging
+import mmap
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SPECIAL_CHARACTERS = frozenset('!@#$%^&*(),.?":{}|<>-_')
+
+# 유출 비밀번호 파일 형식: 헤더 뒤에 SHA-1 앞 8바이트(big-endian)를 오름차순으로 나열
+BREACHED_LIST_MAGIC = b"VPBXBL1\n"
+BREACHED_RECORD_SIZE = 8
+
+
+def breached_digest(password: str) -> bytes:
+    """유출 목록에 저장하는 비밀번호 지문 (SHA-1 앞 8바이트)"""
+    return hashlib.sha1(password.encode("utf-8")).digest()[:BREACHED_RECORD_SIZE]
+
+
+class PatternAutomaton:
+    """여러 금지 패턴을 한 번에 찾는 Aho-Corasick 오토마톤
+
+    패턴 수와 관계없이 입력 문자 하나당 상태 전이 한 번으로 검사한다.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._terminal: List[bool] = [False]
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern.lower())
+        self._build_failure_links()
+
+    def _add(self, pattern: str) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._terminal.append(False)
+            state = next_state
+        self._terminal[state] = True
+
+    def _build_failure_links(self) -> None:
+        # 루트의 자식은 실패 시 루트로 돌아가므로 그 다음 깊이부터 너비 우선으로 계산
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                # 접미사가 패턴이면 현재 상태도 일치로 표시
+                self._terminal[next_state] = self._terminal[next_state] or self._terminal[self._fail[next_state]]
+
+    def step(self, state: int, char: str) -> int:
+        """문자 하나를 읽은 다음 상태 반환"""
+        while state and char not in self._goto[state]:
+            state = self._fail[state]
+        return self._goto[state].get(char, 0)
+
+    def is_match(self, state: int) -> bool:
+        return self._terminal[state]
+
+
+class BreachedPasswordList:
+    """메모리 매핑한 정렬 해시 파일로 유출 비밀번호 여부 확인
+
+    파일 전체를 읽지 않고 mmap 위에서 이진 탐색하므로 수백만 건이어도
+    시작 시간이 거의 없고, 실제로 읽은 페이지(조회당 log2(N) 개)만 메모리에 올라온다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 빈 파일은 mmap 할 수 없음
+            self._file.close()
+            raise ValueError(f"유출 비밀번호 파일이 비어 있습니다: {path}")
+        if self._mmap[:len(BREACHED_LIST_MAGIC)] != BREACHED_LIST_MAGIC:
+            self.close()
+            raise ValueError(f"유출 비밀번호 파일 형식이 아닙니다: {path}")
+        body = len(self._mmap) - len(BREACHED_LIST_MAGIC)
+        if body % BREACHED_RECORD_SIZE:
+            self.close()
+            raise ValueError(f"유출 비밀번호 파일이 손상되었습니다: {path}")
+        self._count = body // BREACHED_RECORD_SIZE
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _record(self, index: int) -> bytes:
+        offset = len(BREACHED_LIST_MAGIC) + index * BREACHED_RECORD_SIZE
+        return self._mmap[offset:offset + BREACHED_RECORD_SIZE]
+
+    def contains_digest(self, digest: bytes) -> bool:
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._record(middle) < digest:
+                low = middle + 1
+            else:
+                high = middle
+        return low < self._count and self._record(low) == digest
+
+    def __contains__(self, password: str) -> bool:
+        return self.contains_digest(breached_digest(password))
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._file.close()
+
+
+class PasswordPolicy:
+    """비밀번호 정책 검사
+
+    문자 종류 판별, 연속 숫자 확인, 금지 패턴 탐색을 문자열을 한 번 훑는
+    동안 모두 처리한다. 오류 메시지는 기존 검사 순서대로 첫 번째 위반만 반환한다.
+    """
+
+    def __init__(
+        self,
+        min_length: int = 8,
+        max_length: Optional[int] = 20,
+        forbidden_patterns: Iterable[str] = (),
+        max_digit_run: int = 2,
+        breached_list: Optional[BreachedPasswordList] = None
+    ):
+        self.min_length = min_length
+        self.max_length = max_length
+        self.max_digit_run = max_digit_run
+        self.automaton = PatternAutomaton(forbidden_patterns)
+        self.breached_list = breached_list
+
+    def validate(self, password: str) -> Tuple[bool, str]:
+        """비밀번호 유효성 검증"""
+        if len(password) < self.min_length:
+            return False, f"비밀번호는 최소 {self.min_length}자 이상이어야 합니다"
+        if self.max_length is not None and len(password) > self.max_length:
+            return False, f"비밀번호는 {self.max_length}자를 초과할 수 없습니다"
+
+        has_upper = has_lower = has_digit = has_special = False
+        has_space = digit_run_exceeded = pattern_found = False
+        digit_run = 0
+        state = 0
+        automaton = self.automaton
+        for char in password:
+            # 기존 검사와 같은 범위: 숫자는 \d (유니코드 십진수), 대소문자는 ASCII, 공백은 ' ' 만
+            if char.isdecimal():
+                has_digit = True
+                digit_run += 1
+                if digit_run > self.max_digit_run:
+                    digit_run_exceeded = True
+            else:
+                digit_run = 0
+                if "A" <= char <= "Z":
+                    has_upper = True
+                elif "a" <= char <= "z":
+                    has_lower = True
+                elif char in SPECIAL_CHARACTERS:
+                    has_special = True
+                elif char == " ":
+                    has_space = True
+            if not pattern_found:
+                state = automaton.step(state, char.lower())
+                pattern_found = automaton.is_match(state)
+
+        if has_space:
+            return False, "비밀번호에 공백을 포함할 수 없습니다"
+        if not has_upper:
+            return False, "비밀번호는 최소 1개의 대문자를 포함해야 합니다"
+        if not has_lower:
+            return False, "비밀번호는 최소 1개의 소문자를 포함해야 합니다"
+        if not has_digit:
+            return False, "비밀번호는 최소 1개의 숫자를 포함해야 합니다"
+        if not has_special:
+            return False, "비밀번호는 최소 1개의 특수문자를 포함해야 합니다"
+        if digit_run_exceeded:
+            return False, "연속된 숫자는 사용할 수 없습니다"
+        if pattern_found:
+            return False, "일반적인 패턴이 포함된 비밀번호는 사용할 수 없습니다"
+        if self.breached_list is not None and password in self.breached_list:
+            return False, "유출된 것으로 알려진 비밀번호는 사용할 수 없습니다"
+        return True, ""
+
+
+def _load_breached_list(path: Optional[str]) -> Optional[BreachedPasswordList]:
+    if not path:
+        return None
+    if not os.path.exists(path):
+        logger.warning(f"Breached password list not found: {path}")
+        return None
+    breached = BreachedPasswordList(path)
+    logger.info(f"Breached password list loaded: {len(breached)} entries")
+    return breached
+
+
+# 전역 인스턴스 생성
+password_policy = PasswordPolicy(
+    min_length=settings.PASSWORD_MIN_LENGTH,
+    max_length=settings.PASSWORD_MAX_LENGTH,
+    forbidden_patterns=[p.strip() for p in settings.PASSWORD_FORBIDDEN_PATTERNS.split(",")],
+    breached_list=_load_breached_list(settings.PASSWORD_BREACHED_LIST_PATH)
+)
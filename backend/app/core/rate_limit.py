@@ -0,0 +1,164 @@
+import math
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+
+
+class TokenBucketLimiter:
+    """키별 토큰 버킷
+
+    키마다 [남은 토큰, 마지막 갱신 시각] 두 값만 보관한다. 다시 가득 찬 버킷은
+    새로 만든 것과 같으므로 오래된 쪽부터 지운다. 덜 찬 버킷은 지우지 않는다
+    (서로 다른 키를 대량으로 보내 소진된 버킷을 밀어내면 제한이 풀리므로).
+    max_keys 개가 모두 덜 찬 상태면 새 키는 가장 오래된 버킷이 찰 때까지 거절한다.
+    """
+
+    def __init__(self, capacity: float, per_minute: float, max_keys: int = 100000):
+        self.capacity = float(capacity)
+        self.rate = per_minute / 60.0
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+        # 통계
+        self.overflows = 0  # 버킷 테이블이 가득 차 새 키를 거절한 횟수
+
+    def _tokens(self, bucket: List[float], now: float) -> float:
+        return min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+
+    def _refill(self, key: str, now: float) -> Optional[List[float]]:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return None
+        bucket[0] = self._tokens(bucket, now)
+        bucket[1] = now
+        return bucket
+
+    def _purge(self, now: float) -> None:
+        # 갱신할 때마다 뒤로 옮기므로 앞쪽이 가장 오래된 버킷
+        while self._buckets:
+            bucket = next(iter(self._buckets.values()))
+            if self._tokens(bucket, now) < self.capacity:
+                break
+            self._buckets.popitem(last=False)
+
+    def _full_wait(self, now: float) -> float:
+        """새 키를 넣을 자리가 없으면 가장 오래된 버킷이 가득 찰 때까지 남은 초, 있으면 0"""
+        if len(self._buckets) < self.max_keys:
+            return 0.0
+        self._purge(now)
+        if len(self._buckets) < self.max_keys or not self._buckets:
+            return 0.0
+        self.overflows += 1
+        oldest = next(iter(self._buckets.values()))
+        return (self.capacity - self._tokens(oldest, now)) / self.rate if self.rate > 0 else math.inf
+
+    def retry_after(self, key: str, now: Optional[float] = None) -> float:
+        """토큰이 없으면 하나가 찰 때까지 남은 초, 있으면 0"""
+        now = time.monotonic() if now is None else now
+        bucket = self._refill(key, now)
+        if bucket is None:
+            return self._full_wait(now)
+        if bucket[0] >= 1.0:
+            return 0.0
+        return (1.0 - bucket[0]) / self.rate if self.rate > 0 else math.inf
+
+    def consume(self, key: str, now: Optional[float] = None) -> float:
+        """토큰 하나를 쓰고, 부족하면 쓰지 않고 기다려야 할 초를 반환"""
+        now = time.monotonic() if now is None else now
+        bucket = self._refill(key, now)
+        if bucket is None:
+            wait = self._full_wait(now)
+            if wait:
+                return wait
+            bucket = self._buckets[key] = [self.capacity, now]
+        self._buckets.move_to_end(key)
+        if bucket[0] < 1.0:
+            return (1.0 - bucket[0]) / self.rate if self.rate > 0 else math.inf
+        bucket[0] -= 1.0
+        self._purge(now)
+        return 0.0
+
+    def reset(self, key: str) -> None:
+        self._buckets.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class LoginThrottle:
+    """로그인 시도 제한 (계정 조회·bcrypt 검증 전에 적용)
+
+    - 클라이언트 IP: 모든 로그인 시도마다 토큰 소비
+    - 사용자 이름: 검증 전에 토큰을 쓰고, 로그인에 성공하면 초기화 (쓴 토큰도 돌려받음).
+      검증이 끝난 뒤에 쓰면 동시에 들어온 시도가 모두 통과해 bcrypt 작업을 제한하지 못한다.
+    """
+
+    def __init__(self, ip_limiter: TokenBucketLimiter, username_limiter: TokenBucketLimiter,
+                 trust_forwarded_for: bool = False, enabled: bool = True):
+        self.ip_limiter = ip_limiter
+        self.username_limiter = username_limiter
+        self.trust_forwarded_for = trust_forwarded_for
+        self.enabled = enabled
+
+        # 통계
+        self.rejected_ip = 0
+        self.rejected_username = 0
+
+    def client_ip(self, request: Request) -> str:
+        if self.trust_forwarded_for:
+            forwarded = request.headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",")[0].strip()
+        return request.client.host if request.client else "unknown"
+
+    @staticmethod
+    def _reject(retry_after: float, detail: str) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+
+    def check(self, request: Request, username: str) -> None:
+        """제한을 넘었으면 429 (Retry-After 포함)"""
+        if not self.enabled:
+            return
+        wait = self.ip_limiter.consume(self.client_ip(request))
+        if wait:
+            self.rejected_ip += 1
+            raise self._reject(wait, "Too many login attempts from this address")
+        wait = self.username_limiter.consume(username.lower())
+        if wait:
+            self.rejected_username += 1
+            raise self._reject(wait, "Too many failed login attempts for this account")
+
+    def record_success(self, username: str) -> None:
+        if self.enabled:
+            self.username_limiter.reset(username.lower())
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "tracked_ips": len(self.ip_limiter),
+            "tracked_usernames": len(self.username_limiter),
+            "table_full_rejections": self.ip_limiter.overflows + self.username_limiter.overflows,
+            "rejected_ip": self.rejected_ip,
+            "rejected_username": self.rejected_username,
+        }
+
+
+# 전역 인스턴스 생성
+login_throttle = LoginThrottle(
+    ip_limiter=TokenBucketLimiter(
+        settings.LOGIN_IP_BURST, settings.LOGIN_IP_PER_MINUTE, settings.LOGIN_THROTTLE_MAX_KEYS
+    ),
+    username_limiter=TokenBucketLimiter(
+        settings.LOGIN_USER_BURST, settings.LOGIN_USER_PER_MINUTE, settings.LOGIN_THROTTLE_MAX_KEYS
+    ),
+    trust_forwarded_for=settings.LOGIN_TRUST_FORWARDED_FOR,
+    enabled=settings.LOGIN_THROTTLE_ENABLED
+)
@@ -0,0 +1,360 @@
+import heapq
+import logging
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .config import settings
+from .sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationStore:
+    """워커·재시작 사이에 공유하는 폐기 정보 저장소 인터페이스
+
+    사용자별 토큰 버전과 jti 거부 목록을 보관한다. 저장된 버전은 올릴 때마다
+    반드시 커지므로 여러 워커가 같은 시각에 올려도 이전 토큰이 살아남지 않는다.
+    """
+
+    async def bump(self, username: str, version: int, prune_at: float) -> int:
+        """max(저장된 버전 + 1, version) 을 저장하고 그 값을 반환"""
+        raise NotImplementedError
+
+    async def deny(self, jti: str, exp: float) -> None:
+        """jti 를 exp 까지 거부"""
+        raise NotImplementedError
+
+    async def lookup(self, username: str, jti: Optional[str]) -> Tuple[int, bool]:
+        """(사용자의 현재 버전, jti 거부 여부)"""
+        raise NotImplementedError
+
+    async def purge(self, now: float) -> None:
+        """정리 시각이 지난 항목 삭제"""
+        raise NotImplementedError
+
+
+class SQLiteRevocationStore(RevocationStore):
+    """같은 서버의 워커들이 공유하는 SQLite(WAL) 저장소 (호출은 전용 스레드에서 실행)"""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS revoked_versions ("
+        " username TEXT PRIMARY KEY,"
+        " version INTEGER NOT NULL,"
+        " prune_at REAL NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS revoked_jtis ("
+        " jti TEXT PRIMARY KEY,"
+        " exp REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS ix_revoked_jtis_exp ON revoked_jtis (exp)",
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self.store = SQLiteStore(path, self.SCHEMA, thread_name="revocation-sqlite")
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, username: str, version: int, prune_at: float) -> int:
+        with conn:
+            return conn.execute(
+                "INSERT INTO revoked_versions (username, version, prune_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (username) DO UPDATE SET"
+                " version = MAX(version + 1, excluded.version),"
+                " prune_at = MAX(prune_at, excluded.prune_at) "
+                "RETURNING version",
+                (username, version, prune_at)
+            ).fetchone()[0]
+
+    @staticmethod
+    def _deny(conn: sqlite3.Connection, jti: str, exp: float) -> None:
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO revoked_jtis (jti, exp) VALUES (?, ?)", (jti, exp))
+
+    @staticmethod
+    def _lookup(conn: sqlite3.Connection, username: str, jti: Optional[str]) -> Tuple[int, bool]:
+        now = time.time()
+        row = conn.execute(
+            "SELECT version FROM revoked_versions WHERE username = ? AND prune_at > ?", (username, now)
+        ).fetchone()
+        denied = jti is not None and conn.execute(
+            "SELECT 1 FROM revoked_jtis WHERE jti = ? AND exp > ?", (jti, now)
+        ).fetchone() is not None
+        return (row[0] if row else 0), denied
+
+    @staticmethod
+    def _purge(conn: sqlite3.Connection, now: float) -> None:
+        with conn:
+            conn.execute("DELETE FROM revoked_versions WHERE prune_at <= ?", (now,))
+            conn.execute("DELETE FROM revoked_jtis WHERE exp <= ?", (now,))
+
+    async def bump(self, username: str, version: int, prune_at: float) -> int:
+        return await self.store.run(self._bump, username, version, prune_at)
+
+    async def deny(self, jti: str, exp: float) -> None:
+        await self.store.run(self._deny, jti, exp)
+
+    async def lookup(self, username: str, jti: Optional[str]) -> Tuple[int, bool]:
+        return await self.store.run(self._lookup, username, jti)
+
+    async def purge(self, now: float) -> None:
+        await self.store.run(self._purge, now)
+
+
+class PostgresRevocationStore(RevocationStore):
+    """여러 서버가 공유하는 PostgreSQL 저장소 (테이블은 처음 쓸 때 없으면 생성)"""
+
+    def __init__(self):
+        self._table_ready = False
+
+    async def _engine(self):
+        from app.db.db_config import init_engine
+        from sqlalchemy import text
+
+        engine = init_engine()
+        if not self._table_ready:
+            async with engine.begin() as conn:
+                await conn.execute(text(
+                    "CREATE TABLE IF NOT EXISTS table_token_version ("
+                    " username VARCHAR(32) PRIMARY KEY,"
+                    " version BIGINT NOT NULL,"
+                    " prune_at TIMESTAMPTZ NOT NULL)"
+                ))
+                await conn.execute(text(
+                    "CREATE TABLE IF NOT EXISTS table_token_denylist ("
+                    " jti VARCHAR(64) PRIMARY KEY,"
+                    " exp TIMESTAMPTZ NOT NULL)"
+                ))
+                await conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_table_token_denylist_exp ON table_token_denylist (exp)"
+                ))
+            self._table_ready = True
+        return engine
+
+    async def bump(self, username: str, version: int, prune_at: float) -> int:
+        from sqlalchemy import text
+
+        engine = await self._engine()
+        async with engine.begin() as conn:
+            result = await conn.execute(
+                text(
+                    "INSERT INTO table_token_version (username, version, prune_at) "
+                    "VALUES (:username, :version, to_timestamp(:prune_at)) "
+                    "ON CONFLICT (username) DO UPDATE SET"
+                    " version = GREATEST(table_token_version.version + 1, EXCLUDED.version),"
+                    " prune_at = GREATEST(table_token_version.prune_at, EXCLUDED.prune_at) "
+                    "RETURNING version"
+                ),
+                {"username": username, "version": version, "prune_at": prune_at}
+            )
+            return int(result.scalar_one())
+
+    async def deny(self, jti: str, exp: float) -> None:
+        from sqlalchemy import text
+
+        engine = await self._engine()
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "INSERT INTO table_token_denylist (jti, exp) VALUES (:jti, to_timestamp(:exp)) "
+                    "ON CONFLICT (jti) DO NOTHING"
+                ),
+                {"jti": jti, "exp": exp}
+            )
+
+    async def lookup(self, username: str, jti: Optional[str]) -> Tuple[int, bool]:
+        from sqlalchemy import text
+
+        engine = await self._engine()
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                text(
+                    "SELECT"
+                    " (SELECT version FROM table_token_version"
+                    "  WHERE username = :username AND prune_at > now()),"
+                    " EXISTS (SELECT 1 FROM table_token_denylist WHERE jti = :jti AND exp > now())"
+                ),
+                {"username": username, "jti": jti}
+            )
+            version, denied = result.one()
+        return int(version or 0), bool(denied)
+
+    async def purge(self, now: float) -> None:
+        from sqlalchemy import text
+
+        engine = await self._engine()
+        async with engine.begin() as conn:
+            await conn.execute(
+                text("DELETE FROM table_token_version WHERE prune_at <= to_timestamp(:now)"), {"now": now}
+            )
+            await conn.execute(
+                text("DELETE FROM table_token_denylist WHERE exp <= to_timestamp(:now)"), {"now": now}
+            )
+
+
+def create_revocation_store(name: str) -> Optional[RevocationStore]:
+    """설정값에 맞는 폐기 정보 저장소 생성 (memory 는 저장소 없이 워커 메모리만 사용)"""
+    if name == "memory":
+        return None
+    if name == "sqlite":
+        return SQLiteRevocationStore(settings.SESSION_SQLITE_PATH)
+    if name == "postgres":
+        return PostgresRevocationStore()
+    raise ValueError(f"지원하지 않는 폐기 정보 저장소입니다: {name}")
+
+
+class TokenRevocationList:
+    """토큰 폐기 정보 (jti 거부 목록 + 사용자별 토큰 버전)
+
+    토큰마다 세션을 저장하지 않고, 폐기된 것만 기억한다. 단, 세션 한도 1 을 지키려고
+    로그인마다 버전을 올리면 (SessionManager 참고) 로그인한 사용자마다 항목이 생긴다.
+
+    - jti 거부 목록: 로그아웃한 토큰의 jti 와 exp. exp 가 지나면 어차피 서명 검증에서
+      거절되므로 만료 순 힙으로 정리하며, max_denied 를 넘으면 해당 사용자의 버전을
+      올려 (그 사용자의 모든 토큰 폐기) 메모리 상한을 지킨다.
+    - 토큰 버전: 비밀번호 변경 등으로 올린 시각(ms). 토큰의 ver 클레임이 이 값보다
+      작으면 폐기된 것으로 본다. 버전을 올린 뒤 토큰 수명(token_ttl)이 지나면 그 전에
+      발급된 토큰은 모두 만료되었으므로 항목을 지워도 된다. 시각 기반이라 항목을 지운
+      뒤 다시 올려도 예전 토큰이 되살아나지 않는다.
+
+    store 가 있으면 폐기는 저장소에도 바로 쓰고, 검증할 때는 이 워커의 기록을 먼저
+    본 뒤 저장소 조회 결과를 cache_ttl 동안 재사용한다. 따라서 다른 워커의 로그아웃·
+    비밀번호 변경은 최대 cache_ttl 뒤에 반영되고, 재시작해도 폐기가 유지된다.
+    저장소를 조회할 수 없으면 토큰을 거부한다.
+    """
+
+    def __init__(self, token_ttl: float, max_denied: int = 100000,
+                 store: Optional[RevocationStore] = None, cache_ttl: float = 2.0,
+                 purge_interval: float = 60.0):
+        self.token_ttl = token_ttl
+        self.max_denied = max_denied
+        self.store = store
+        self.cache_ttl = cache_ttl
+        self.purge_interval = purge_interval
+        self._denied: Dict[str, float] = {}  # jti: exp
+        self._denied_heap: List[Tuple[float, str]] = []
+        self._versions: Dict[str, Tuple[int, float]] = {}  # username: (version, prune_at)
+        self._versions_heap: List[Tuple[float, str]] = []
+        # (username, jti): (version, denied, cached_at)
+        self._lookups: Dict[Tuple[str, Optional[str]], Tuple[int, bool, float]] = {}
+        self._store_purged_at = 0.0
+
+        # 통계
+        self.denials = 0
+        self.bumps = 0
+        self.overflow_bumps = 0
+        self.store_lookups = 0
+        self.store_errors = 0
+
+    def _purge(self, now: float) -> None:
+        heap = self._denied_heap
+        while heap and heap[0][0] <= now:
+            exp, jti = heapq.heappop(heap)
+            if self._denied.get(jti) == exp:
+                del self._denied[jti]
+        heap = self._versions_heap
+        while heap and heap[0][0] <= now:
+            prune_at, username = heapq.heappop(heap)
+            entry = self._versions.get(username)
+            if entry is not None and entry[1] == prune_at:
+                del self._versions[username]
+
+    async def _purge_store(self, now: float) -> None:
+        # 저장소의 지난 항목은 purge_interval 마다 한 번씩 정리 (실패해도 다음에 다시 시도)
+        if self.store is None or now - self._store_purged_at < self.purge_interval:
+            return
+        self._store_purged_at = now
+        try:
+            await self.store.purge(now)
+        except Exception as e:
+            logger.warning(f"Revocation store purge failed: {e}")
+
+    async def current_version(self, username: str) -> int:
+        """새로 발급할 토큰에 넣을 버전 (올린 적이 없으면 0)"""
+        entry = self._versions.get(username)
+        version = entry[0] if entry is not None else 0
+        if self.store is not None:
+            # 다른 워커가 올린 버전보다 낮은 토큰을 발급하지 않도록 캐시 없이 조회
+            version = max(version, (await self.store.lookup(username, None))[0])
+        return version
+
+    async def bump(self, username: str) -> int:
+        """사용자의 기존 토큰을 모두 폐기하고 새 버전 반환"""
+        now = time.time()
+        self._purge(now)
+        entry = self._versions.get(username)
+        version = max(int(now * 1000), (entry[0] if entry is not None else 0) + 1)
+        prune_at = now + self.token_ttl
+        if self.store is not None:
+            # 저장소 조회 캐시는 지우지 않아도 됨 (이 워커의 기록을 먼저 확인하므로)
+            version = await self.store.bump(username, version, prune_at)
+            await self._purge_store(now)
+        self._versions[username] = (version, prune_at)
+        heapq.heappush(self._versions_heap, (prune_at, username))
+        self.bumps += 1
+        return version
+
+    async def deny(self, username: str, jti: Optional[str], exp: Optional[float]) -> None:
+        """토큰 하나 폐기 (jti 가 없는 예전 토큰이면 사용자 버전을 올림)"""
+        now = time.time()
+        self._purge(now)
+        if not jti or len(self._denied) >= self.max_denied:
+            if jti:
+                self.overflow_bumps += 1
+            await self.bump(username)
+            return
+        exp = float(exp) if isinstance(exp, (int, float)) else now + self.token_ttl
+        if exp <= now:
+            return
+        if self.store is not None:
+            await self.store.deny(jti, exp)
+            await self._purge_store(now)
+        self._denied[jti] = exp
+        heapq.heappush(self._denied_heap, (exp, jti))
+        self.denials += 1
+
+    async def _lookup(self, username: str, jti: Optional[str], now: float) -> Tuple[int, bool]:
+        key = (username, jti)
+        cached = self._lookups.get(key)
+        if cached is not None and now - cached[2] < self.cache_ttl:
+            return cached[0], cached[1]
+        self.store_lookups += 1
+        version, denied = await self.store.lookup(username, jti)
+        if len(self._lookups) > 10000:
+            self._lookups = {
+                key: entry for key, entry in self._lookups.items()
+                if now - entry[2] < self.cache_ttl
+            }
+        self._lookups[key] = (version, denied, now)
+        return version, denied
+
+    async def is_valid(self, username: str, claims: dict) -> bool:
+        """거부 목록과 버전 확인 (서명·만료 검증은 호출 전에 끝나 있어야 함)"""
+        jti = claims.get("jti")
+        if jti is not None and jti in self._denied:
+            return False
+        version = claims.get("ver")
+        entry = self._versions.get(username)
+        if entry is not None and not (isinstance(version, int) and version >= entry[0]):
+            return False
+        if self.store is None:
+            return True
+        try:
+            stored_version, denied = await self._lookup(username, jti, time.time())
+        except Exception as e:
+            self.store_errors += 1
+            logger.error(f"Revocation store lookup failed, rejecting token: {e}")
+            return False
+        if denied:
+            return False
+        return stored_version == 0 or (isinstance(version, int) and version >= stored_version)
+
+    def stats(self) -> dict:
+        return {
+            "store": type(self.store).__name__ if self.store is not None else None,
+            "denied_jtis": len(self._denied),
+            "versioned_users": len(self._versions),
+            "denials": self.denials,
+            "bumps": self.bumps,
+            "overflow_bumps": self.overflow_bumps,
+            "store_lookups": self.store_lookups,
+            "store_errors": self.store_errors,
+        }
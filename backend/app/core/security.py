@@ -1,80 +1,36 @@
-import bcrypt
 import hashlib
 import logging
 import re
+import secrets
 import unicodedata
-from typing import Tuple
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
+from typing import Optional
+from jose import JWTError
 from fastapi import HTTPException, status
-from passlib.context import CryptContext
+from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.password_policy import password_policy
+from app.core.metrics import timed
+from app.core.signing_keys import key_ring
 
 logger = logging.getLogger(__name__)
 
-# 비밀번호 해싱
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# JWT 설정 (서명 키는 key_ring 이 관리)
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES
 
-# JWT 설정
-SECRET_KEY = "your-secret-key"  # 실제 운영에서는 환경변수로 관리
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
-
-class PasswordValidator:
-    def __init__(self):
-        self.common_patterns = [
-            r'qwerty', r'asdfgh', r'zxcvbn', r'password', r'admin', 
-            r'123456', r'abcdef'
-        ]
-        self.consecutive_numbers = r'\d{3,}'  # 3개 이상 연속된 숫자
-        
-    def validate(self, password: str) -> Tuple[bool, str]:
-        """비밀번호 유효성 검증"""
-        try:
-            # 기본 길이 검증
-            if len(password) < 8:
-                return False, "비밀번호는 최소 8자 이상이어야 합니다"
-            if len(password) > 20:
-                return False, "비밀번호는 20자를 초과할 수 없습니다"
-                
-            # 공백 검사
-            if ' ' in password:
-                return False, "비밀번호에 공백을 포함할 수 없습니다"
-                
-            # 문자 종류 검증
-            if not re.search(r'[A-Z]', password):
-                return False, "비밀번호는 최소 1개의 대문자를 포함해야 합니다"
-            if not re.search(r'[a-z]', password):
-                return False, "비밀번호는 최소 1개의 소문자를 포함해야 합니다"
-            if not re.search(r'\d', password):
-                return False, "비밀번호는 최소 1개의 숫자를 포함해야 합니다"
-            if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
-                return False, "비밀번호는 최소 1개의 특수문자를 포함해야 합니다"
-                
-            # 패턴 검사
-            if re.search(self.consecutive_numbers, password):
-                return False, "연속된 숫자는 사용할 수 없습니다"
-                
-            # 일반적인 패턴 검사
-            lower_password = password.lower()
-            for pattern in self.common_patterns:
-                if pattern in lower_password:
-                    return False, "일반적인 패턴이 포함된 비밀번호는 사용할 수 없습니다"
-                    
-            return True, ""
-            
-        except Exception as e:
-            return False, f"비밀번호 검증 중 오류 발생: {str(e)}"
-
-def create_access_token(username: str) -> str:
-    """JWT 토큰 생성"""
+@timed("create_access_token")
+def create_access_token(username: str, version: int = 0, tenant: Optional[str] = None) -> str:
+    """JWT 토큰 생성 (jti: 개별 폐기용 ID, ver: 사용자 토큰 버전, tnt: 테넌트 DB, 없으면 기본 DB)"""
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode = {"sub": username, "exp": expire}
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    to_encode = {
+        "sub": username, "exp": expire, "jti": secrets.token_urlsafe(12), "ver": version, "tnt": tenant
+    }
+    return key_ring.sign(to_encode)
 
 def decode_token(token: str) -> dict:
     """JWT 토큰 디코딩"""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = key_ring.verify(token)
         return payload
     except JWTError as e:
         raise HTTPException(
@@ -82,20 +38,18 @@ def decode_token(token: str) -> dict:
             detail="Could not validate credentials"
         )
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """비밀번호 검증"""
+@timed("verify_password")
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """비밀번호 검증 (워커 풀에서 실행)"""
     try:
-        return bcrypt.checkpw(
-            plain_password.encode('utf-8'),
-            hashed_password.encode('utf-8')
-        )
+        return await password_hasher.verify(plain_password, hashed_password)
     except Exception as e:
-        print(f"Password verification error: {e}")
+        logger.warning(f"Password verification error: {e.__class__.__name__}")
         return False
 
-def get_password_hash(password: str) -> str:
-    """비밀번호 해싱"""
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    """비밀번호 해싱 (워커 풀에서 실행)"""
+    return await password_hasher.hash(password)
 
 def sanitize_input(value: str) -> str:
     """입력값 정제"""
@@ -113,5 +67,5 @@ def sanitize_input(value: str) -> str:
     
     return value.strip()
 
-# 전역 인스턴스 생성
-password_validator = PasswordValidator()
\ No newline at end of file
+# 비밀번호 정책 검사는 password_policy 로 통합 (기존 이름 유지)
+password_validator = password_policy
\ No newline at end of file
@@ -1,30 +1,453 @@
-from datetime import datetime
-from typing import Dict, Optional
-import jwt
+import heapq
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
 from fastapi import HTTPException, status
+from jose import jwt, JWTError
+from .config import settings
+from .token_cache import token_cache, token_digest
+from .revocation import TokenRevocationList, create_revocation_store
+from .sqlite_store import SQLiteStore
+
+
+class SessionBackend:
+    """세션 저장소 인터페이스
+
+    토큰 원문 대신 SHA-256 다이제스트와 만료 시각만 보관한다. 사용자당
+    최대 max_sessions 개의 세션을 허용하고, 넘치면 가장 오래된 세션부터
+    밀어낸다. 모든 메서드는 코루틴이며, 저장소를 바꿔도 SessionManager
+    의 동작은 같다.
+    """
+
+    async def add(self, username: str, digest: bytes, expires_at: float,
+                  max_sessions: int) -> List[bytes]:
+        """세션 저장 후 한도 초과로 밀려난 세션의 다이제스트 반환"""
+        raise NotImplementedError
+
+    async def validate(self, username: str, digest: bytes) -> bool:
+        """만료되지 않은 세션인지 확인"""
+        raise NotImplementedError
+
+    async def remove(self, username: str, digest: Optional[bytes] = None) -> List[bytes]:
+        """세션 삭제 (digest 가 없으면 사용자의 모든 세션) 후 삭제된 다이제스트 반환"""
+        raise NotImplementedError
+
+    async def count(self) -> int:
+        """만료되지 않은 활성 세션 수"""
+        raise NotImplementedError
+
+
+class InMemorySessionBackend(SessionBackend):
+    """프로세스 내부 저장소 (워커 1개일 때 사용)
+
+    사용자별 세션은 (다이제스트, 만료 시각) 튜플 리스트로 생성 순서대로
+    보관하고, 만료 시각 순 힙으로 지난 세션을 매 연산마다 조금씩 정리한다.
+    힙에서는 교체·삭제된 항목을 바로 지우지 않고 꺼낼 때 건너뛴다.
+    """
 
-class SessionManager:
     def __init__(self):
-        self.active_sessions: Dict[str, str] = {}  # username: token
-        self.max_sessions_per_user = 1
-        
-    def add_session(self, username: str, token: str) -> bool:
-        """새 세션 추가"""
-        # 기존 세션이 있으면 제거
-        if username in self.active_sessions:
+        self.active_sessions: Dict[str, List[Tuple[bytes, float]]] = {}  # username: [(digest, expires_at)]
+        self._expiry_heap: List[Tuple[float, str, bytes]] = []
+        self._session_count = 0
+
+    def _purge_expired(self, now: float) -> None:
+        """만료 시각이 지난 세션 제거"""
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, username, digest = heapq.heappop(heap)
+            sessions = self.active_sessions.get(username)
+            if not sessions:
+                continue
+            for i, (session_digest, session_expires_at) in enumerate(sessions):
+                if session_digest == digest and session_expires_at == expires_at:
+                    del sessions[i]
+                    self._session_count -= 1
+                    token_cache.invalidate_digest(digest)
+                    break
+            if not sessions:
+                del self.active_sessions[username]
+
+        # 교체·삭제된 항목이 힙에 너무 많이 쌓이면 다시 만듦
+        if len(heap) > 1024 and len(heap) > 2 * self._session_count:
+            self._expiry_heap = [
+                (expires_at, username, digest)
+                for username, sessions in self.active_sessions.items()
+                for digest, expires_at in sessions
+            ]
+            heapq.heapify(self._expiry_heap)
+
+    async def add(self, username: str, digest: bytes, expires_at: float,
+                  max_sessions: int) -> List[bytes]:
+        self._purge_expired(time.time())
+        sessions = self.active_sessions.setdefault(username, [])
+        sessions.append((digest, expires_at))
+        self._session_count += 1
+        heapq.heappush(self._expiry_heap, (expires_at, username, digest))
+
+        # 한도를 넘으면 가장 오래된 세션부터 제거
+        evicted = []
+        while len(sessions) > max(1, max_sessions):
+            evicted.append(sessions.pop(0)[0])
+            self._session_count -= 1
+        return evicted
+
+    async def validate(self, username: str, digest: bytes) -> bool:
+        now = time.time()
+        self._purge_expired(now)
+        for session_digest, expires_at in self.active_sessions.get(username, ()):
+            if session_digest == digest:
+                return expires_at > now
+        return False
+
+    async def remove(self, username: str, digest: Optional[bytes] = None) -> List[bytes]:
+        sessions = self.active_sessions.get(username)
+        if not sessions:
+            return []
+        if digest is None:
+            removed = [session_digest for session_digest, _ in sessions]
             del self.active_sessions[username]
-            
-        self.active_sessions[username] = token
+        else:
+            removed = [session_digest for session_digest, _ in sessions if session_digest == digest]
+            sessions[:] = [session for session in sessions if session[0] != digest]
+            if not sessions:
+                del self.active_sessions[username]
+        self._session_count -= len(removed)
+        return removed
+
+    async def count(self) -> int:
+        self._purge_expired(time.time())
+        return self._session_count
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """같은 서버의 여러 워커 프로세스가 공유하는 SQLite(WAL) 저장소
+
+    WAL 모드에서는 읽기가 쓰기를 막지 않으므로, 각 워커가 자기 연결로
+    로컬 파일을 바로 조회해도 된다. sqlite3 호출은 SQLiteStore 의 전용
+    스레드에서 실행하므로 이벤트 루프를 막지 않는다.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS sessions ("
+        " digest BLOB PRIMARY KEY,"
+        " username TEXT NOT NULL,"
+        " created_at REAL NOT NULL,"
+        " expires_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS ix_sessions_username ON sessions (username)",
+        "CREATE INDEX IF NOT EXISTS ix_sessions_expires_at ON sessions (expires_at)",
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self.store = SQLiteStore(path, self.SCHEMA, thread_name="session-sqlite")
+
+    @staticmethod
+    def _add(conn: sqlite3.Connection, username: str, digest: bytes, expires_at: float,
+             max_sessions: int) -> List[bytes]:
+        now = time.time()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (digest, username, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (digest, username, now, expires_at)
+            )
+            rows = conn.execute(
+                "DELETE FROM sessions WHERE username = ? AND digest NOT IN ("
+                " SELECT digest FROM sessions WHERE username = ?"
+                " ORDER BY created_at DESC LIMIT ?) RETURNING digest",
+                (username, username, max(1, max_sessions))
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    @staticmethod
+    def _validate(conn: sqlite3.Connection, username: str, digest: bytes) -> bool:
+        row = conn.execute(
+            "SELECT 1 FROM sessions WHERE digest = ? AND username = ? AND expires_at > ?",
+            (digest, username, time.time())
+        ).fetchone()
+        return row is not None
+
+    @staticmethod
+    def _remove(conn: sqlite3.Connection, username: str, digest: Optional[bytes]) -> List[bytes]:
+        with conn:
+            if digest is None:
+                rows = conn.execute(
+                    "DELETE FROM sessions WHERE username = ? RETURNING digest", (username,)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "DELETE FROM sessions WHERE username = ? AND digest = ? RETURNING digest",
+                    (username, digest)
+                ).fetchall()
+        return [row[0] for row in rows]
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection) -> int:
+        return conn.execute(
+            "SELECT COUNT(*) FROM sessions WHERE expires_at > ?", (time.time(),)
+        ).fetchone()[0]
+
+    async def add(self, username: str, digest: bytes, expires_at: float,
+                  max_sessions: int) -> List[bytes]:
+        return await self.store.run(self._add, username, digest, expires_at, max_sessions)
+
+    async def validate(self, username: str, digest: bytes) -> bool:
+        return await self.store.run(self._validate, username, digest)
+
+    async def remove(self, username: str, digest: Optional[bytes] = None) -> List[bytes]:
+        return await self.store.run(self._remove, username, digest)
+
+    async def count(self) -> int:
+        return await self.store.run(self._count)
+
+
+class PostgresSessionBackend(SessionBackend):
+    """여러 서버가 공유하는 PostgreSQL 저장소 + 짧은 로컬 읽기 캐시
+
+    DB 에서 확인된 세션만 캐시하므로 캐시 적중 시 DB 를 조회하지 않는다.
+    캐시에 없을 때만 DB 를 다시 읽으므로, 다른 워커의 새 로그인은 즉시
+    반영되고 로그아웃은 cache_ttl 안에 반영된다.
+    """
+
+    def __init__(self, cache_ttl: float = 2.0):
+        self.cache_ttl = cache_ttl
+        self._cache: Dict[bytes, Tuple[str, float, float]] = {}  # digest: (username, expires_at, cached_at)
+        self._table_ready = False
+
+    async def _engine(self):
+        from app.db.db_config import init_engine
+        from sqlalchemy import text
+
+        engine = init_engine()
+
+        if not self._table_ready:
+            async with engine.begin() as conn:
+                await conn.execute(text(
+                    "CREATE TABLE IF NOT EXISTS table_session ("
+                    " digest BYTEA PRIMARY KEY,"
+                    " username VARCHAR(32) NOT NULL,"
+                    " created_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp(),"
+                    " expires_at TIMESTAMPTZ NOT NULL)"
+                ))
+                await conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_table_session_username "
+                    "ON table_session (username, created_at)"
+                ))
+            self._table_ready = True
+        return engine
+
+    def _prune_cache(self, now: float) -> None:
+        if len(self._cache) > 10000:
+            self._cache = {
+                digest: entry for digest, entry in self._cache.items()
+                if now - entry[2] < self.cache_ttl
+            }
+
+    async def add(self, username: str, digest: bytes, expires_at: float,
+                  max_sessions: int) -> List[bytes]:
+        from sqlalchemy import text
+
+        engine = await self._engine()
+        async with engine.begin() as conn:
+            await conn.execute(
+                text("DELETE FROM table_session WHERE expires_at <= now() AND username = :username"),
+                {"username": username}
+            )
+            await conn.execute(
+                text(
+                    "INSERT INTO table_session (digest, username, expires_at) "
+                    "VALUES (:digest, :username, to_timestamp(:expires_at)) "
+                    "ON CONFLICT (digest) DO NOTHING"
+                ),
+                {"digest": digest, "username": username, "expires_at": expires_at}
+            )
+            result = await conn.execute(
+                text(
+                    "DELETE FROM table_session WHERE username = :username AND digest NOT IN ("
+                    " SELECT digest FROM table_session WHERE username = :username"
+                    " ORDER BY created_at DESC LIMIT :limit) RETURNING digest"
+                ),
+                {"username": username, "limit": max(1, max_sessions)}
+            )
+            evicted = [bytes(row[0]) for row in result]
+        for evicted_digest in evicted:
+            self._cache.pop(evicted_digest, None)
+        return evicted
+
+    async def validate(self, username: str, digest: bytes) -> bool:
+        from sqlalchemy import text
+
+        now = time.time()
+        cached = self._cache.get(digest)
+        if cached is not None:
+            cached_username, expires_at, cached_at = cached
+            if now - cached_at < self.cache_ttl:
+                return cached_username == username and expires_at > now
+
+        engine = await self._engine()
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                text(
+                    "SELECT username, extract(epoch FROM expires_at) FROM table_session "
+                    "WHERE digest = :digest AND expires_at > now()"
+                ),
+                {"digest": digest}
+            )
+            row = result.first()
+        if row is None:
+            self._cache.pop(digest, None)
+            return False
+
+        self._prune_cache(now)
+        self._cache[digest] = (row[0], float(row[1]), now)
+        return row[0] == username
+
+    async def remove(self, username: str, digest: Optional[bytes] = None) -> List[bytes]:
+        from sqlalchemy import text
+
+        engine = await self._engine()
+        async with engine.begin() as conn:
+            if digest is None:
+                result = await conn.execute(
+                    text("DELETE FROM table_session WHERE username = :username RETURNING digest"),
+                    {"username": username}
+                )
+            else:
+                result = await conn.execute(
+                    text(
+                        "DELETE FROM table_session WHERE username = :username "
+                        "AND digest = :digest RETURNING digest"
+                    ),
+                    {"username": username, "digest": digest}
+                )
+            removed = [bytes(row[0]) for row in result]
+        for removed_digest in removed:
+            self._cache.pop(removed_digest, None)
+        return removed
+
+    async def count(self) -> int:
+        from sqlalchemy import text
+
+        engine = await self._engine()
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                text("SELECT COUNT(*) FROM table_session WHERE expires_at > now()")
+            )
+            return result.scalar_one()
+
+
+def create_session_backend(name: str) -> Optional[SessionBackend]:
+    """설정값에 맞는 세션 저장소 생성 (stateless 는 저장소 없이 폐기 목록만 사용)"""
+    if name == "stateless":
+        return None
+    if name == "memory":
+        return InMemorySessionBackend()
+    if name == "sqlite":
+        return SQLiteSessionBackend(settings.SESSION_SQLITE_PATH)
+    if name == "postgres":
+        return PostgresSessionBackend(cache_ttl=settings.SESSION_CACHE_TTL_SECONDS)
+    raise ValueError(f"지원하지 않는 세션 저장소입니다: {name}")
+
+
+class SessionManager:
+    """로그인 세션 관리
+
+    저장소가 있으면 토큰 다이제스트를 세션으로 저장해 검증한다. 저장소가 없으면
+    (stateless) 토큰의 jti·ver 클레임을 TokenRevocationList 와 비교만 하므로 검증은
+    O(1) 이다. 폐기 정보는 REVOCATION_STORE 로 워커끼리 공유한다.
+
+    stateless 에서 사용자당 세션 한도는 1 일 때만 지켜지며, 로그인할 때마다 버전을
+    올려 이전 토큰을 폐기한다. 그래서 한도가 1 (기본값) 이면 로그인마다 폐기 저장소에
+    한 번 쓰고, 그 항목을 토큰 수명 동안 보관하므로 메모리와 저장소 크기는 토큰 수명
+    안에 로그인한 사용자 수에 비례한다. 한도가 2 이상이면 로그아웃·비밀번호 변경 등
+    폐기한 건수에만 비례하지만 세션 수는 제한하지 않는다.
+    """
+
+    def __init__(self, backend: Optional[SessionBackend] = None, max_sessions_per_user: int = 1,
+                 revocations: Optional[TokenRevocationList] = None):
+        self.backend = backend
+        self.max_sessions_per_user = max_sessions_per_user
+        # 폐기 정보는 stateless 에서만 검증에 쓰므로 그때만 공유 저장소 사용
+        self.revocations = revocations or TokenRevocationList(
+            token_ttl=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            max_denied=settings.REVOCATION_MAX_DENIED,
+            store=create_revocation_store(settings.REVOCATION_STORE) if backend is None else None,
+            cache_ttl=settings.REVOCATION_CACHE_TTL_SECONDS
+        )
+
+    @property
+    def stateless(self) -> bool:
+        return self.backend is None
+
+    @staticmethod
+    def _token_claims(token: str) -> dict:
+        try:
+            return jwt.get_unverified_claims(token)
+        except JWTError:
+            return {}
+
+    @classmethod
+    def _token_expiry(cls, token: str) -> float:
+        """토큰의 exp 클레임 (없으면 설정된 만료 시간 적용)"""
+        exp = cls._token_claims(token).get("exp")
+        if isinstance(exp, (int, float)):
+            return float(exp)
+        return time.time() + settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+    async def token_version(self, username: str) -> int:
+        """새 토큰의 ver 클레임 (stateless 에서 세션 한도가 1 이면 이전 토큰을 폐기하고 올린 값)
+
+        이 경우 로그인 응답 전에 폐기 저장소에 버전을 써야 다른 워커가 이전 토큰을 거절한다.
+        """
+        if self.stateless and self.max_sessions_per_user == 1:
+            return await self.revocations.bump(username)
+        return await self.revocations.current_version(username)
+
+    async def add_session(self, username: str, token: str) -> bool:
+        """새 세션 추가"""
+        if self.stateless:
+            return True
+        # 한도를 넘어 밀려난 세션은 토큰 캐시에서도 제거
+        evicted = await self.backend.add(
+            username,
+            token_digest(token),
+            self._token_expiry(token),
+            self.max_sessions_per_user
+        )
+        for digest in evicted:
+            token_cache.invalidate_digest(digest)
         return True
-        
-    def validate_session(self, username: str, token: str) -> bool:
-        """세션 유효성 검증"""
-        return (username in self.active_sessions and 
-                self.active_sessions[username] == token)
-                
-    def remove_session(self, username: str) -> None:
-        """세션 제거"""
-        if username in self.active_sessions:
-            del self.active_sessions[username]
 
-session_manager = SessionManager() 
\ No newline at end of file
+    async def validate_session(self, username: str, token: str, claims: Optional[dict] = None) -> bool:
+        """세션 유효성 검증 (claims 는 서명 검증을 마친 payload)"""
+        if self.stateless:
+            return await self.revocations.is_valid(
+                username, claims if claims is not None else self._token_claims(token)
+            )
+        return await self.backend.validate(username, token_digest(token))
+
+    async def remove_session(self, username: str, token: Optional[str] = None) -> None:
+        """세션 제거 (token 이 없으면 사용자의 모든 세션 제거)"""
+        if self.stateless:
+            if token:
+                claims = self._token_claims(token)
+                await self.revocations.deny(username, claims.get("jti"), claims.get("exp"))
+            else:
+                await self.revocations.bump(username)
+            return
+        digest = token_digest(token) if token else None
+        for removed in await self.backend.remove(username, digest):
+            token_cache.invalidate_digest(removed)
+
+    async def session_count(self) -> Optional[int]:
+        """활성 세션 수 (stateless 에서는 알 수 없으므로 None)"""
+        if self.stateless:
+            return None
+        return await self.backend.count()
+
+session_manager = SessionManager(
+    create_session_backend(settings.SESSION_BACKEND),
+    max_sessions_per_user=settings.SESSION_MAX_PER_USER
+)
@@ -0,0 +1,226 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwk, jwt, JWTError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+
+# 모르는 kid 로 서명된 토큰이 오면 디렉터리를 다시 확인하는 최소 간격 (초)
+UNKNOWN_KID_RELOAD_SECONDS = 5.0
+
+
+def _algorithm_for(private_or_public_key) -> str:
+    """키 종류에 맞는 JWS 알고리즘"""
+    if isinstance(private_or_public_key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return "RS256"
+    if isinstance(private_or_public_key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)):
+        if private_or_public_key.curve.name != "secp256r1":
+            raise ValueError(f"ES256 은 P-256 곡선만 지원합니다: {private_or_public_key.curve.name}")
+        return "ES256"
+    raise ValueError(f"지원하지 않는 키 종류입니다: {type(private_or_public_key).__name__}")
+
+
+def generate_private_key(algorithm: str):
+    """서명용 개인키 생성 (RS256: RSA 2048, ES256: P-256)"""
+    if algorithm == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    raise ValueError(f"지원하지 않는 알고리즘입니다: {algorithm}")
+
+
+def private_key_pem(private_key) -> bytes:
+    return private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    )
+
+
+class SigningKey:
+    """kid 하나에 해당하는 키 (개인키가 없으면 검증 전용)"""
+
+    def __init__(self, kid: str, algorithm: str, public_key, private_key=None, published_at: float = 0.0):
+        self.kid = kid
+        self.algorithm = algorithm
+        self.published_at = published_at  # 키 파일 mtime (이때부터 JWKS 에 공개됨)
+        # python-jose 키 객체를 미리 만들어 두면 서명/검증 때마다 PEM 을 다시 파싱하지 않음
+        self.verifier = jwk.construct(
+            public_key.public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo
+            ),
+            algorithm
+        )
+        self.signer = jwk.construct(private_key_pem(private_key), algorithm) if private_key else None
+
+    def to_jwk(self) -> dict:
+        entry = self.verifier.to_dict()
+        entry.update({"kid": self.kid, "use": "sig", "alg": self.algorithm})
+        return entry
+
+
+class KeyRing:
+    """JWT 서명 키 모음
+
+    - HS*: JWT_SECRET_KEY 공유 비밀키 (JWKS 는 비어 있음)
+    - RS256/ES256: JWT_KEYS_DIR 의 '<kid>.pem' 파일. 디렉터리의 모든 키로 검증하고,
+      JWT_ACTIVE_KID 가 있으면 그 키로 서명한다. 없으면 파일이 activation_delay 초
+      넘게 공개된 개인키 중 이름순 마지막 kid 로 서명한다. 새 키는 다른 워커가
+      디렉터리를 다시 읽고 (reload_interval) 다른 서비스의 JWKS 캐시가 만료될 때까지
+      (JWT_JWKS_MAX_AGE) 검증에만 쓰여, 새 kid 토큰을 모르는 곳이 없게 한다.
+      이전 키는 그 키로 발급된 토큰이 만료될 때까지 (개인키를 지우고 공개키만 남겨도
+      됨) 디렉터리에 둔다.
+
+    디렉터리는 최대 reload_interval 초마다 mtime 을 확인해 바뀌었을 때만 다시 읽는다.
+    모르는 kid 의 토큰이 오면 UNKNOWN_KID_RELOAD_SECONDS 간격으로 바로 다시 확인한다.
+    """
+
+    def __init__(self, algorithm: str, secret: str, keys_dir: Optional[str] = None,
+                 active_kid: Optional[str] = None, reload_interval: float = 60.0,
+                 activation_delay: float = 0.0):
+        self.algorithm = algorithm
+        self.secret = secret
+        self.keys_dir = keys_dir
+        self.active_kid = active_kid
+        self.reload_interval = reload_interval
+        self.activation_delay = activation_delay
+
+        self._keys: Dict[str, SigningKey] = {}
+        self._active: Optional[SigningKey] = None
+        self._jwks: Tuple[bytes, str] = (b'{"keys":[]}', '"empty"')
+        self._dir_mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._pending_until: Optional[float] = None  # 아직 서명에 쓰지 않는 새 키가 쓰일 시각
+
+        if self.symmetric:
+            return
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"지원하지 않는 JWT 알고리즘입니다: {algorithm}")
+        if keys_dir:
+            self._load()
+        else:
+            # 개발용: 재시작하면 기존 토큰이 모두 무효가 되고 워커끼리 키를 공유하지 않음
+            logger.warning("JWT_KEYS_DIR is not set, using an ephemeral signing key")
+            private_key = generate_private_key(algorithm)
+            kid = hashlib.sha256(private_key_pem(private_key)).hexdigest()[:16]
+            self._set_keys({kid: SigningKey(kid, algorithm, private_key.public_key(), private_key)})
+
+    @property
+    def symmetric(self) -> bool:
+        return self.algorithm.startswith("HS")
+
+    def _select_signer(self, keys: Dict[str, SigningKey], now: float) -> str:
+        """서명에 쓸 kid (충분히 오래 공개된 개인키 중 이름순 마지막)"""
+        signers = sorted(kid for kid, key in keys.items() if key.signer is not None)
+        if not signers:
+            raise ValueError("서명에 쓸 개인키가 없습니다")
+        if self.active_kid in signers:
+            self._pending_until = None
+            return self.active_kid
+        if self.active_kid:
+            logger.warning(f"JWT_ACTIVE_KID {self.active_kid} not found, choosing by publication time")
+        published = [kid for kid in signers if now - keys[kid].published_at >= self.activation_delay]
+        pending = [keys[kid].published_at + self.activation_delay for kid in signers if kid not in published]
+        self._pending_until = min(pending) if pending else None
+        if published:
+            return published[-1]
+        # 처음 배포처럼 모든 키가 새것이면 가장 먼저 공개된 키를 씀
+        return min(signers, key=lambda kid: keys[kid].published_at)
+
+    def _set_keys(self, keys: Dict[str, SigningKey]) -> None:
+        kid = self._select_signer(keys, time.time())
+        if self._active is not None and self._active.kid != kid:
+            logger.info(f"JWT signing key activated: {kid} (was {self._active.kid})")
+
+        body = json.dumps(
+            {"keys": [keys[k].to_jwk() for k in sorted(keys)]}, separators=(",", ":")
+        ).encode("utf-8")
+        self._keys = keys
+        self._active = keys[kid]
+        self._jwks = (body, '"' + hashlib.sha256(body).hexdigest()[:32] + '"')
+
+    def _load(self) -> None:
+        keys = {}
+        for name in os.listdir(self.keys_dir):
+            if not name.endswith(".pem"):
+                continue
+            kid = name[:-len(".pem")]
+            with open(os.path.join(self.keys_dir, name), "rb") as f:
+                data = f.read()
+            try:
+                private_key = serialization.load_pem_private_key(data, password=None)
+                public_key = private_key.public_key()
+            except ValueError:
+                private_key = None
+                public_key = serialization.load_pem_public_key(data)
+            published_at = os.stat(os.path.join(self.keys_dir, name)).st_mtime
+            keys[kid] = SigningKey(kid, _algorithm_for(public_key), public_key, private_key, published_at)
+        self._set_keys(keys)
+        self._dir_mtime = os.stat(self.keys_dir).st_mtime
+        logger.info(f"JWT signing keys loaded: {sorted(keys)} (active: {self._active.kid})")
+
+    def _maybe_reload(self, interval: Optional[float] = None) -> None:
+        if not self.keys_dir:
+            return
+        now = time.monotonic()
+        if now - self._checked_at < (self.reload_interval if interval is None else interval):
+            return
+        self._checked_at = now
+        try:
+            if os.stat(self.keys_dir).st_mtime != self._dir_mtime:
+                self._load()
+            elif self._pending_until is not None and time.time() >= self._pending_until:
+                self._set_keys(self._keys)
+        except Exception:
+            # 새 키 파일이 잘못되었으면 기존 키를 계속 사용
+            logger.exception("JWT signing key reload failed, keeping current keys")
+
+    def sign(self, claims: dict) -> str:
+        if self.symmetric:
+            return jwt.encode(claims, self.secret, algorithm=self.algorithm)
+        self._maybe_reload()
+        key = self._active
+        return jwt.encode(claims, key.signer, algorithm=key.algorithm, headers={"kid": key.kid})
+
+    def verify(self, token: str) -> dict:
+        """서명·만료 확인 후 payload 반환 (실패 시 JWTError)"""
+        if self.symmetric:
+            return jwt.decode(token, self.secret, algorithms=[self.algorithm])
+        self._maybe_reload()
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self._keys.get(kid)
+        if key is None:
+            # 다른 워커가 먼저 읽은 새 키일 수 있으므로 디렉터리를 바로 다시 확인
+            self._maybe_reload(UNKNOWN_KID_RELOAD_SECONDS)
+            key = self._keys.get(kid)
+        if key is None:
+            raise JWTError(f"Unknown signing key: {kid}")
+        return jwt.decode(token, key.verifier, algorithms=[key.algorithm])
+
+    def jwks(self) -> Tuple[bytes, str]:
+        """JWKS 본문과 ETag (키가 바뀔 때만 다시 만듦)"""
+        self._maybe_reload()
+        return self._jwks
+
+
+# 전역 인스턴스 생성
+key_ring = KeyRing(
+    algorithm=settings.JWT_ALGORITHM,
+    secret=settings.JWT_SECRET_KEY,
+    keys_dir=settings.JWT_KEYS_DIR,
+    active_kid=settings.JWT_ACTIVE_KID,
+    reload_interval=settings.JWT_KEYS_RELOAD_SECONDS,
+    # 모든 워커가 새 키를 읽고 다른 서비스의 JWKS 캐시가 갱신된 뒤에 서명에 사용
+    activation_delay=settings.JWT_KEYS_RELOAD_SECONDS + settings.JWT_JWKS_MAX_AGE
+)
@@ -0,0 +1,63 @@
+import asyncio
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+class SQLiteStore:
+    """여러 워커 프로세스가 공유하는 SQLite(WAL) 파일과 전용 스레드
+
+    sqlite3 호출은 블로킹이므로 이벤트 루프에서 직접 부르지 않고, 프로세스마다
+    스레드 하나짜리 executor 에서 연결 하나로 순서대로 실행한다. 연결을 한
+    스레드만 쓰므로 잠금이 필요 없고, 쓰기 잠금을 기다리는 동안에도 요청
+    처리는 멈추지 않는다.
+    """
+
+    def __init__(self, path: str, schema: Sequence[str] = (), thread_name: str = "sqlite-store"):
+        self.path = path
+        self.schema = schema
+        self.thread_name = thread_name
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """전용 스레드 안에서만 호출"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in self.schema:
+                conn.execute(statement)
+            self._conn = conn
+        return self._conn
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # fork 이후에는 부모 프로세스의 스레드와 연결을 쓸 수 없으므로 pid 별로 새로 만듦
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self.thread_name)
+            self._conn = None
+            self._pid = os.getpid()
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """fn(conn, *args) 를 전용 스레드에서 실행"""
+        def call():
+            return fn(self._connection(), *args)
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), call)
+
+    def close(self) -> None:
+        """연결을 닫고 스레드 종료 (남은 작업은 마저 실행)"""
+        if self._executor is None or self._pid != os.getpid():
+            return
+        executor, self._executor = self._executor, None
+
+        def close_connection():
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        executor.submit(close_connection)
+        executor.shutdown(wait=True)
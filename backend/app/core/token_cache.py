@@ -0,0 +1,105 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+
+def token_digest(token: str) -> bytes:
+    """토큰 원문 대신 캐시 키로 사용할 SHA-256 다이제스트"""
+    return hashlib.sha256(token.encode('utf-8')).digest()
+
+
+class TokenCache:
+    """검증이 끝난 JWT payload 를 보관하는 LRU 캐시
+
+    같은 bearer 토큰으로 반복 요청이 들어올 때 서명 검증과 JSON 파싱을
+    다시 하지 않도록 한다. 각 항목은 토큰의 exp 시각 또는 max_ttl 중
+    먼저 오는 시점에 만료된다.
+    """
+
+    def __init__(self, max_size: int = 10000, max_ttl: int = 300):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, token: str) -> Optional[dict]:
+        """캐시된 payload 조회 (없거나 만료되었으면 None)"""
+        key = token_digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        payload, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def put(self, token: str, payload: dict) -> None:
+        """검증된 payload 저장"""
+        if self.max_size <= 0:
+            return
+
+        expires_at = time.time() + self.max_ttl
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= time.time():
+            return
+
+        key = token_digest(token)
+        self._entries[key] = (payload, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, token: Optional[str]) -> None:
+        """토큰 항목 제거 (로그아웃, 토큰 교체 시)"""
+        if not token:
+            return
+        self.invalidate_digest(token_digest(token))
+
+    def invalidate_digest(self, digest: Optional[bytes]) -> None:
+        """다이제스트로 항목 제거 (세션 저장소는 토큰 원문을 보관하지 않음)"""
+        if digest and self._entries.pop(digest, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """캐시 적중/실패 통계"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+# 전역 인스턴스 생성
+token_cache = TokenCache(
+    max_size=settings.TOKEN_CACHE_SIZE,
+    max_ttl=settings.TOKEN_CACHE_TTL_SECONDS
+)
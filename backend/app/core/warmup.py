@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.security import create_access_token, decode_token
+from app.crud.user_crud import account_lookup_stmt
+from app.db.db_config import init_engine
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupState:
+    """시작 단계별 소요 시간과 워밍업 완료 여부 (/health/ready 가 참조)"""
+
+    def __init__(self):
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.steps: Dict[str, dict] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self.finished_at is not None
+
+    def record(self, name: str, seconds: float, error: Optional[str] = None) -> None:
+        self.steps[name] = {"ms": round(seconds * 1000, 2), "ok": error is None, "error": error}
+
+    async def run_step(self, name: str, func: Callable[[], Awaitable], timeout: Optional[float] = None) -> None:
+        """단계 하나를 실행해 시간 기록 (실패해도 다음 단계는 계속)"""
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(func(), timeout)
+            self.record(name, time.perf_counter() - started)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.record(name, time.perf_counter() - started, f"{e.__class__.__name__}: {e}")
+            logger.warning(f"Warm-up step {name} failed: {e}")
+
+    def summary(self) -> dict:
+        return {
+            "ready": self.ready,
+            "total_ms": round((self.finished_at - self.started_at) * 1000, 2)
+            if self.ready and self.started_at is not None else None,
+            "steps": self.steps,
+        }
+
+
+async def _prefill_pool() -> None:
+    """풀 연결을 미리 열고 인증 조회문을 실행해 연결별 prepared statement 를 만들어 둠"""
+    engine = init_engine()
+    count = min(settings.DB_WARMUP_CONNECTIONS, settings.DB_POOL_SIZE)
+
+    async def open_connection():
+        async with engine.connect() as conn:
+            await conn.execute(account_lookup_stmt, {"username": ""})
+
+    # 동시에 열어야 서로 다른 연결이 풀에 남음
+    await asyncio.gather(*(open_connection() for _ in range(count)))
+
+
+async def _prime_hashing() -> None:
+    await password_hasher.warm_up()
+
+
+async def _prime_tokens() -> None:
+    """서명 키 객체와 암호 백엔드를 첫 로그인 전에 로드"""
+    decode_token(create_access_token("warm-up"))
+
+
+async def warm_up(state: WarmupState) -> None:
+    """커넥션 풀, 해싱 워커, JWT 서명을 미리 준비한 뒤 준비 완료로 표시"""
+    state.started_at = time.time()
+    started = time.perf_counter()
+    timeout = settings.WARMUP_STEP_TIMEOUT_SECONDS
+    steps = [("hashing", _prime_hashing), ("tokens", _prime_tokens)]
+    if settings.DB_WARMUP_CONNECTIONS > 0:
+        steps.insert(0, ("db_pool", _prefill_pool))
+    await asyncio.gather(*(state.run_step(name, func, timeout) for name, func in steps))
+    state.finished_at = time.time()
+    logger.info(
+        f"Warm-up finished in {(time.perf_counter() - started) * 1000:.0f}ms",
+        extra={"steps": state.steps}
+    )
+
+
+# 전역 인스턴스 생성
+warmup_state = WarmupState()
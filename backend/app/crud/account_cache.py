@@ -0,0 +1,149 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+
+
+class CachedAccount(NamedTuple):
+    """캐시에 보관하는 계정 스냅샷 (세션에 묶이지 않은 읽기 전용 값)"""
+    username: str
+    password: str
+    userlevel: Optional[int]
+    onlogin: Optional[int]
+
+
+class AccountCache:
+    """get_account 용 read-through 캐시
+
+    - TTL 과 최대 크기를 넘는 항목은 오래된 순으로 제거
+    - 같은 username 에 대한 동시 캐시 미스는 쿼리 하나를 함께 기다림
+    - 존재하지 않는 계정도 짧은 시간 동안 캐시 (반복되는 잘못된 로그인 대비)
+
+    invalidate 는 이 워커의 캐시만 지운다. 다른 워커에서 비밀번호를 바꾸거나
+    계정을 만들면 이 워커는 최대 ttl (없던 계정은 negative_ttl) 동안 이전 값을
+    쓰므로, ttl 은 몰리는 로그인을 묶어 줄 만큼만 짧게 둔다 (기본 2초).
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 2.0, negative_ttl: float = 1.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: "OrderedDict[str, Tuple[Optional[CachedAccount], float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _lookup(self, username: str) -> Tuple[bool, Optional[CachedAccount]]:
+        entry = self._entries.get(username)
+        if entry is None:
+            return False, None
+        account, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[username]
+            return False, None
+        self._entries.move_to_end(username)
+        return True, account
+
+    def _store(self, username: str, account: Optional[CachedAccount]) -> None:
+        if self.max_size <= 0:
+            return
+        ttl = self.ttl if account is not None else self.negative_ttl
+        if ttl <= 0:
+            return
+        self._entries[username] = (account, time.monotonic() + ttl)
+        self._entries.move_to_end(username)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get(
+        self,
+        username: str,
+        loader: Callable[[], Awaitable[Optional[CachedAccount]]]
+    ) -> Optional[CachedAccount]:
+        """캐시 조회, 없으면 loader 로 한 번만 조회해 저장"""
+        found, account = self._lookup(username)
+        if found:
+            self.hits += 1
+            return account
+
+        inflight = self._inflight.get(username)
+        if inflight is not None:
+            # 이미 진행 중인 조회 결과를 함께 사용
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # 조회를 시작한 요청만 취소된 경우에는 직접 다시 조회
+                if inflight.cancelled():
+                    return await self.get(username, loader)
+                raise
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[username] = future
+        try:
+            account = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 기다리는 요청이 없어도 "exception was never retrieved" 경고가 나지 않도록
+            future.exception()
+            raise
+        else:
+            # 조회 중에 invalidate 되었다면 오래된 결과를 캐시하지 않음
+            if self._inflight.get(username) is future:
+                self._store(username, account)
+            future.set_result(account)
+            return account
+        finally:
+            if self._inflight.get(username) is future:
+                del self._inflight[username]
+
+    def invalidate(self, username: str) -> None:
+        """계정 변경 시 캐시 항목 제거 (이 워커만, 다른 워커는 ttl 이 지나야 반영)"""
+        self._inflight.pop(username, None)
+        if self._entries.pop(username, None) is not None:
+            self.invalidations += 1
+
+    def update(self, username: str, **fields) -> None:
+        """캐시된 항목의 일부 필드만 교체 (만료 시각은 유지, 없으면 무시)"""
+        entry = self._entries.get(username)
+        if entry is not None and entry[0] is not None:
+            self._entries[username] = (entry[0]._replace(**fields), entry[1])
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._inflight.clear()
+
+    def stats(self) -> dict:
+        """캐시 적중/실패 통계"""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# 전역 인스턴스 생성
+account_cache = AccountCache(
+    max_size=settings.ACCOUNT_CACHE_SIZE,
+    ttl=settings.ACCOUNT_CACHE_TTL_SECONDS,
+    negative_ttl=settings.ACCOUNT_CACHE_NEGATIVE_TTL_SECONDS
+)
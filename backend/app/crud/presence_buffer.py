@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from .account_cache import account_cache
+
+logger = logging.getLogger(__name__)
+
+# (username, onlogin, changed_at) 목록을 저장하고 바뀐 행 수 반환
+PresenceWriter = Callable[[List[Tuple[str, int, float]]], Awaitable[int]]
+
+
+class PresenceBuffer:
+    """onlogin 상태의 write-behind 버퍼
+
+    로그인/로그아웃은 메모리의 {username: onlogin} 만 바꾸고 바로 반환한다.
+    같은 사용자의 변경은 마지막 값 하나로 합쳐지며, flush_interval 초마다 또는
+    대기 중인 사용자가 max_pending 명을 넘으면 batch_size 명씩 한 문장으로 저장한다.
+    저장에 실패한 값은 그 사이 새 값이 들어오지 않았다면 다음 저장 때 다시 시도한다.
+
+    변경마다 일어난 시각을 함께 저장하므로, 워커 A 의 로그인과 워커 B 의 로그아웃이
+    서로 다른 순서로 저장되어도 DB 에는 더 나중에 일어난 값이 남는다 (apply_presence).
+    서버가 여러 대면 시계 차이보다 가까운 두 변경의 순서는 보장하지 않는다.
+    """
+
+    def __init__(self, writer: Optional[PresenceWriter] = None, flush_interval: float = 1.0,
+                 max_pending: int = 500, batch_size: int = 1000, enabled: bool = True):
+        self.writer = writer or _write_presence
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.enabled = enabled
+
+        self._pending: Dict[str, Tuple[int, float]] = {}  # username: (onlogin, changed_at)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.recorded = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.updated_rows = 0
+        self.failures = 0
+        self.last_flush_ms: Optional[float] = None
+
+    def record(self, username: str, onlogin: int, changed_at: Optional[float] = None) -> None:
+        """상태 변경 기록 (DB 에는 다음 flush 때 반영)"""
+        if not self.enabled:
+            return
+        self.recorded += 1
+        if username in self._pending:
+            self.coalesced += 1
+        self._pending[username] = (onlogin, time.time() if changed_at is None else changed_at)
+        # 캐시된 계정 정보도 바로 새 상태를 보이도록 갱신
+        account_cache.update(username, onlogin=onlogin)
+        if len(self._pending) >= self.max_pending and self._wakeup is not None:
+            self._wakeup.set()
+
+    def _lock(self) -> asyncio.Lock:
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        return self._flush_lock
+
+    async def flush(self) -> int:
+        """대기 중인 변경을 모두 저장하고 저장한 사용자 수 반환"""
+        async with self._lock():
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+            rows = [(username, onlogin, changed_at) for username, (onlogin, changed_at) in pending.items()]
+            started = time.perf_counter()
+            written = 0
+            try:
+                for i in range(0, len(rows), self.batch_size):
+                    batch = rows[i:i + self.batch_size]
+                    self.updated_rows += await self.writer(batch)
+                    written += len(batch)
+            except Exception as e:
+                self.failures += 1
+                # 저장하지 못한 값은 그 사이 더 새 값이 기록되지 않은 경우에만 되돌림
+                for username, onlogin, changed_at in rows[written:]:
+                    self._pending.setdefault(username, (onlogin, changed_at))
+                logger.warning(f"Presence flush failed, {len(rows) - written} updates re-queued: {e}")
+            self.flushes += 1
+            self.flushed_rows += written
+            self.last_flush_ms = (time.perf_counter() - started) * 1000
+            return written
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """백그라운드 flush 시작"""
+        if self.enabled and self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """백그라운드 flush 를 멈추고 남은 변경을 저장 (엔진 정리 전에 호출)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
+        await self.flush()
+        if self._pending:
+            logger.error(f"Presence flush on shutdown failed, {len(self._pending)} updates lost")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._pending),
+            "recorded": self.recorded,
+            "coalesced": self.coalesced,
+            "flushes": self.flushes,
+            "flushed_rows": self.flushed_rows,
+            "updated_rows": self.updated_rows,
+            "failures": self.failures,
+            "last_flush_ms": self.last_flush_ms,
+        }
+
+
+_presence_table_ready = False
+
+
+async def _write_presence(rows: List[Tuple[str, int, float]]) -> int:
+    """기본 저장 함수: 요청과 무관한 별도 세션으로 apply_presence 실행 (변경 시각 테이블은 없으면 생성)"""
+    from app.crud.user_crud import apply_presence
+    from app.db.db_config import AsyncSessionLocal, init_engine
+    from app.models.presence_model import PresenceChange
+
+    global _presence_table_ready
+    engine = init_engine()
+    if not _presence_table_ready:
+        async with engine.begin() as conn:
+            await conn.run_sync(PresenceChange.metadata.create_all, tables=[PresenceChange.__table__])
+        _presence_table_ready = True
+    async with AsyncSessionLocal() as db:
+        return await apply_presence(db, rows)
+
+
+# 전역 인스턴스 생성
+presence_buffer = PresenceBuffer(
+    flush_interval=settings.PRESENCE_FLUSH_INTERVAL_SECONDS,
+    max_pending=settings.PRESENCE_FLUSH_MAX_PENDING,
+    batch_size=settings.PRESENCE_FLUSH_BATCH_SIZE,
+    enabled=settings.PRESENCE_TRACKING_ENABLED
+)
@@ -0,0 +1,271 @@
+import asyncio
+import csv
+import json
+import logging
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.hashing import password_hasher
+from ..core.security import password_validator
+from ..models.user_model import Account
+from .account_cache import account_cache
+
+logger = logging.getLogger(__name__)
+
+USERNAME_MAX_LENGTH = 32
+ON_CONFLICT_MODES = ("skip", "update")
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """바이트 청크 스트림을 줄 단위 문자열로 변환"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8").rstrip("\r")
+
+
+class _LineFeed:
+    """csv.reader 에 넘기는 줄 버퍼 (비어 있으면 StopIteration, 다시 채우면 이어서 읽힘)"""
+
+    def __init__(self):
+        self.lines: Deque[str] = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def parse_csv(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """CSV 줄 스트림을 (줄 번호, 레코드, 오류) 로 변환 (첫 줄은 헤더)
+
+    스트림 전체를 csv.reader 하나로 읽으므로 따옴표 안의 줄바꿈도 값에 포함된다.
+    따옴표가 열린 채로 줄이 끝나면 다음 줄까지 모은 뒤 레코드를 읽는다.
+    """
+    header: Optional[List[str]] = None
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    quotes = 0
+    async for line in lines:
+        feed.lines.append(line + "\n")
+        quotes += line.count('"')
+        if quotes % 2:
+            # 따옴표 안의 줄바꿈: 레코드가 다음 줄로 이어짐
+            continue
+        quotes = 0
+        while feed.lines:
+            line_no = reader.line_num + 1
+            try:
+                values = next(reader)
+            except csv.Error as e:
+                yield line_no, None, f"CSV 파싱 오류: {e}"
+                continue
+            if not values or (len(values) == 1 and not values[0].strip()):
+                continue
+            if header is None:
+                header = [value.strip().lower() for value in values]
+                continue
+            if len(values) != len(header):
+                yield line_no, None, "컬럼 수가 헤더와 다릅니다"
+                continue
+            yield line_no, dict(zip(header, values)), None
+    if feed.lines:
+        yield reader.line_num + 1, None, "CSV 파싱 오류: 따옴표가 닫히지 않았습니다"
+
+
+async def parse_jsonl(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """JSONL 줄 스트림을 (줄 번호, 레코드, 오류) 로 변환"""
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, f"JSON 파싱 오류: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_no, None, "각 줄은 JSON 객체여야 합니다"
+            continue
+        yield line_no, record, None
+
+
+def _validate_record(record: dict, enforce_policy: bool) -> Tuple[Optional[tuple], Optional[str]]:
+    """레코드 검증 후 (username, password, userlevel) 반환"""
+    username = str(record.get("username") or "").strip()
+    password = record.get("password")
+    if not username:
+        return None, "username 이 비어 있습니다"
+    if len(username) > USERNAME_MAX_LENGTH:
+        return None, f"username 은 {USERNAME_MAX_LENGTH}자를 초과할 수 없습니다"
+    if not isinstance(password, str) or not password:
+        return None, "password 가 비어 있습니다"
+    if enforce_policy:
+        is_valid, error_message = password_validator.validate(password)
+        if not is_valid:
+            return None, error_message
+    try:
+        userlevel = int(record.get("userlevel") or 1)
+    except (TypeError, ValueError):
+        return None, "userlevel 은 정수여야 합니다"
+    return (username, password, userlevel), None
+
+
+def _insert_statement(rows: List[dict], on_conflict: str):
+    """여러 행을 한 번에 넣는 INSERT ... ON CONFLICT 문 생성"""
+    stmt = pg_insert(Account).values(rows)
+    if on_conflict == "update":
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Account.username],
+            set_={"password": stmt.excluded.password, "userlevel": stmt.excluded.userlevel}
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=[Account.username])
+    # xmax = 0 이면 새로 INSERT 된 행, 아니면 UPDATE 된 행
+    return stmt.returning(Account.username, literal_column("(xmax = 0)").label("inserted"))
+
+
+class ProvisioningReport:
+    """행 단위 처리 결과 집계"""
+
+    def __init__(self):
+        self.total = 0
+        self.created = 0
+        self.updated = 0
+        self.skipped = 0
+        self.failed = 0
+        self.errors: List[Dict] = []
+
+    def fail(self, line: int, username: Optional[str], error: str) -> None:
+        self.failed += 1
+        self.errors.append({"line": line, "username": username, "error": error})
+
+    def skip(self, line: int, username: str) -> None:
+        """ON CONFLICT DO NOTHING 으로 건너뛴 행 (오류 목록에는 남기되 실패로 세지 않음)"""
+        self.skipped += 1
+        self.errors.append({"line": line, "username": username, "error": "이미 존재하는 username 입니다"})
+
+    def to_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "created": self.created,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+
+async def _write_batch(
+    db: AsyncSession,
+    batch: List[Tuple[int, str, str, int]],
+    on_conflict: str,
+    report: ProvisioningReport
+) -> None:
+    """배치를 한 문장으로 쓰고, 실패하면 행 단위로 다시 시도해 오류 행만 보고"""
+    # 같은 배치 안의 중복 username 은 마지막 행만 사용
+    latest: Dict[str, Tuple[int, str, str, int]] = {}
+    for item in batch:
+        previous = latest.get(item[1])
+        if previous is not None:
+            report.fail(previous[0], previous[1], "같은 요청 안에 중복된 username 입니다")
+        latest[item[1]] = item
+    items = list(latest.values())
+
+    async def execute(chunk: List[Tuple[int, str, str, int]]) -> None:
+        rows = [
+            {"username": username, "password": hashed, "userlevel": userlevel, "onlogin": 0}
+            for _, username, hashed, userlevel in chunk
+        ]
+        result = await db.execute(_insert_statement(rows, on_conflict))
+        written = {username: inserted for username, inserted in result.all()}
+        await db.commit()
+        for line, username, _, _ in chunk:
+            account_cache.invalidate(username)
+            if username not in written:
+                report.skip(line, username)
+            elif written[username]:
+                report.created += 1
+            else:
+                report.updated += 1
+
+    try:
+        await execute(items)
+    except Exception as e:
+        await db.rollback()
+        logger.warning(f"Bulk insert batch failed, retrying row by row: {str(e)}")
+        for item in items:
+            try:
+                await execute([item])
+            except Exception as row_error:
+                await db.rollback()
+                report.fail(item[0], item[1], f"저장 실패: {row_error.__class__.__name__}")
+
+
+async def provision_accounts(
+    db: AsyncSession,
+    records: AsyncIterator[Tuple[int, Optional[dict], Optional[str]]],
+    on_conflict: str = "skip",
+    batch_size: int = 500,
+    enforce_policy: bool = True
+) -> dict:
+    """레코드 스트림을 배치 단위로 해싱·저장하고 행 단위 결과 보고서 반환
+
+    잘못된 행은 보고서에만 기록하고 나머지 행은 계속 처리한다.
+    비밀번호 해싱은 배치마다 워커 풀에서 병렬로 실행한다.
+    """
+    if on_conflict not in ON_CONFLICT_MODES:
+        raise ValueError(f"지원하지 않는 on_conflict 값입니다: {on_conflict}")
+
+    report = ProvisioningReport()
+    pending: List[Tuple[int, str, str, int]] = []
+
+    async def flush() -> None:
+        if not pending:
+            return
+        hashes = await asyncio.gather(
+            *[password_hasher.hash(password) for _, _, password, _ in pending],
+            return_exceptions=True
+        )
+        batch = []
+        for (line, username, _, userlevel), hashed in zip(pending, hashes):
+            if isinstance(hashed, Exception):
+                report.fail(line, username, "비밀번호 해싱 실패")
+            else:
+                batch.append((line, username, hashed, userlevel))
+        pending.clear()
+        if batch:
+            await _write_batch(db, batch, on_conflict, report)
+
+    async for line, record, error in records:
+        report.total += 1
+        if error:
+            report.fail(line, None, error)
+            continue
+        validated, error = _validate_record(record, enforce_policy)
+        if error:
+            report.fail(line, str(record.get("username") or "") or None, error)
+            continue
+        username, password, userlevel = validated
+        pending.append((line, username, password, userlevel))
+        if len(pending) >= batch_size:
+            await flush()
+
+    await flush()
+    logger.info(
+        f"Bulk provisioning finished: total={report.total} created={report.created} "
+        f"updated={report.updated} skipped={report.skipped} failed={report.failed}"
+    )
+    return report.to_dict()
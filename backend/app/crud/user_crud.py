@@ -1,40 +1,66 @@
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import update
+from sqlalchemy import Float, Integer, String, bindparam, column, delete, func, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 from ..models.user_model import Account
+from ..models.presence_model import PresenceChange
 from ..core.auth_handler import get_password_hash
+from .account_cache import account_cache, CachedAccount
+from ..core.metrics import timed
 import logging
-import bcrypt
 
 logger = logging.getLogger(__name__)
 
+# 인증용 조회문: ORM 객체 없이 필요한 컬럼만 읽음
+# 모듈 로드 시 한 번만 만들어 두면 SQLAlchemy 컴파일 캐시와
+# asyncpg prepared statement 캐시를 매 요청 재사용할 수 있음
+_account_table = Account.__table__
+_presence_table = PresenceChange.__table__
+account_lookup_stmt = (
+    select(
+        _account_table.c.username,
+        _account_table.c.password,
+        _account_table.c.userlevel,
+        _account_table.c.onlogin
+    )
+    .where(_account_table.c.username == bindparam("username"))
+)
+
+@timed("get_account")
 async def get_account(db: AsyncSession, username: str):
-    """사용자 계정 조회"""
+    """사용자 계정 조회 (캐시 우선, 동시 조회는 쿼리 하나로 합침)"""
+    return await account_cache.get(username, lambda: _load_account(db, username))
+
+async def _load_account(db: AsyncSession, username: str):
+    """DB 에서 계정을 읽어 캐시용 스냅샷으로 변환
+
+    인증 경로이므로 복제본이 있어도 항상 db (기본 DB 세션) 에서 읽는다. 복제본은
+    update_password / create_account 직후 이전 해시나 없는 계정을 돌려줄 수 있고,
+    그 결과가 캐시되면 그동안 로그인이 틀어진다.
+    """
     try:
-        print(f"Querying DB for username: {username}")
-        stmt = select(Account).where(Account.username == username)
-        result = await db.execute(stmt)
-        user = result.scalar_one_or_none()
+        logger.debug("Account cache miss, querying DB", extra={"username": username})
+        # ORM identity map 을 거치지 않도록 Core 연결에서 직접 실행
+        conn = await db.connection()
+        result = await conn.execute(account_lookup_stmt, {"username": username})
+        user = result.first()
         
         if user:
-            # 사용자 객체의 모든 속성 출력 - id 제거
-            print(f"Found user details:")
-            print(f"  Username: {user.username}")
-            print(f"  Password: {user.password}")  # 실제 환경에서는 비밀번호 출력 금지
-            print(f"  Userlevel: {user.userlevel}")
-            print(f"  Onlogin: {user.onlogin}")
+            return CachedAccount(*user)
         
-        return user
+        return None
         
     except Exception as e:
-        print(f"DB query error: {str(e)}")
+        logger.error(f"DB query error: {str(e)}", extra={"username": username})
         raise
 
 async def create_account(db: AsyncSession, username: str, password: str, userlevel: int = 1):
     """새 계정 생성"""
     try:
-        hashed_password = get_password_hash(password)
+        hashed_password = await get_password_hash(password)
         account = Account(
             username=username,
             password=hashed_password,
@@ -44,6 +70,7 @@ async def create_account(db: AsyncSession, username: str, password: str, userlev
         db.add(account)
         await db.commit()
         await db.refresh(account)
+        account_cache.invalidate(username)
         logger.info(f"Account created successfully: {username}")
         return account
     except IntegrityError:
@@ -59,7 +86,7 @@ async def update_account(db: AsyncSession, account: Account, update_data: dict):
     """계정 정보 업데이트"""
     try:
         if "password" in update_data:
-            update_data["password"] = get_password_hash(update_data["password"])
+            update_data["password"] = await get_password_hash(update_data["password"])
 
         for key, value in update_data.items():
             setattr(account, key, value)
@@ -67,6 +94,7 @@ async def update_account(db: AsyncSession, account: Account, update_data: dict):
         db.add(account)
         await db.commit()
         await db.refresh(account)
+        account_cache.invalidate(account.username)
         logger.info(f"Account updated successfully: {account.username}")
         return account
     except Exception as e:
@@ -77,10 +105,11 @@ async def update_account(db: AsyncSession, account: Account, update_data: dict):
 async def delete_account(db: AsyncSession, username: str):
     """계정 삭제"""
     try:
-        account = await get_account(db, username)
-        if account:
-            await db.delete(account)
-            await db.commit()
+        # 캐시된 스냅샷은 세션에 묶여 있지 않으므로 DELETE 문으로 직접 삭제
+        result = await db.execute(delete(Account).where(Account.username == username))
+        await db.commit()
+        account_cache.invalidate(username)
+        if result.rowcount:
             logger.info(f"Account deleted successfully: {username}")
             return True
         return False
@@ -98,15 +127,16 @@ async def update_password(db: AsyncSession, username: str, new_password: str):
             logger.warning(f"Password update failed - user not found: {username}")
             return None
             
-        # 2. 비밀번호 해시화
-        hashed_password = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt())
+        # 2. 비밀번호 해시화 (워커 풀에서 실행)
+        hashed_password = await get_password_hash(new_password)
         
         # 3. 업데이트 쿼리 실행
         query = update(Account).where(Account.username == username).values(
-            password=hashed_password.decode('utf-8')
+            password=hashed_password
         )
         await db.execute(query)
         await db.commit()
+        account_cache.invalidate(username)
         
         logger.info(f"Password updated successfully: {username}")
         return True
@@ -114,4 +144,133 @@ async def update_password(db: AsyncSession, username: str, new_password: str):
     except Exception as e:
         logger.error(f"Error updating password: {str(e)}")
         await db.rollback()
-        raise
\ No newline at end of file
+        raise
+
+async def replace_password_hash(db: AsyncSession, username: str, old_hash: str, new_hash: str) -> bool:
+    """저장된 해시가 old_hash 그대로일 때만 new_hash 로 교체 (그 사이 비밀번호가 바뀌었으면 무시)"""
+    result = await db.execute(
+        update(Account)
+        .where(Account.username == username, Account.password == old_hash)
+        .values(password=new_hash)
+    )
+    await db.commit()
+    account_cache.invalidate(username)
+    return bool(result.rowcount)
+
+async def count_password_costs(db: AsyncSession) -> dict:
+    """bcrypt cost 별 계정 수 ('$2b$12$...' 의 5~6번째 문자)"""
+    cost = func.substr(_account_table.c.password, 5, 2)
+    conn = await db.connection()
+    result = await conn.execute(select(cost, func.count()).group_by(cost))
+    return {row[0]: row[1] for row in result}
+
+async def apply_presence(db: AsyncSession, rows: Sequence[Tuple[str, int, float]]) -> int:
+    """여러 계정의 onlogin 을 (username, onlogin, changed_at) 목록으로 갱신하고 바뀐 행 수 반환
+
+    table_presence 의 변경 시각을 먼저 더 새로운 값으로만 올리고, 시각이 이 변경의
+    것으로 남은 계정만 갱신한다. 그래서 다른 워커가 이미 저장한 더 새로운 상태를 늦게
+    도착한 이전 상태가 덮어쓰지 않는다. PostgreSQL 은 두 문장 모두 VALUES 목록 하나로,
+    그 밖의 DB 는 executemany 로 처리한다. 값이 이미 같은 행은 건너뛴다.
+    """
+    if not rows:
+        return 0
+    # 여러 워커가 동시에 갱신해도 같은 순서로 행 잠금을 잡도록 정렬
+    rows = sorted(rows)
+    conn = await db.connection()
+    if conn.dialect.name == "postgresql":
+        incoming = values(
+            column("username", String), column("onlogin", Integer), column("changed_at", Float),
+            name="incoming"
+        ).data(rows)
+        clock = pg_insert(_presence_table).from_select(
+            ["username", "changed_at"], select(incoming.c.username, incoming.c.changed_at)
+        )
+        await conn.execute(clock.on_conflict_do_update(
+            index_elements=[_presence_table.c.username],
+            set_={"changed_at": clock.excluded.changed_at},
+            where=_presence_table.c.changed_at < clock.excluded.changed_at
+        ))
+        stmt = (
+            update(_account_table)
+            .where(_account_table.c.username == incoming.c.username)
+            .where(_presence_table.c.username == incoming.c.username)
+            .where(_presence_table.c.changed_at == incoming.c.changed_at)
+            .where(_account_table.c.onlogin.is_distinct_from(incoming.c.onlogin))
+            .values(onlogin=incoming.c.onlogin)
+        )
+        result = await conn.execute(stmt)
+    else:
+        params = [
+            {"b_username": username, "b_onlogin": onlogin, "b_changed_at": changed_at}
+            for username, onlogin, changed_at in rows
+        ]
+        clock = sqlite_insert(_presence_table).values(
+            username=bindparam("b_username"), changed_at=bindparam("b_changed_at")
+        )
+        await conn.execute(clock.on_conflict_do_update(
+            index_elements=[_presence_table.c.username],
+            set_={"changed_at": clock.excluded.changed_at},
+            where=_presence_table.c.changed_at < clock.excluded.changed_at
+        ), params)
+        latest = (
+            select(_presence_table.c.changed_at)
+            .where(_presence_table.c.username == bindparam("b_username"))
+            .scalar_subquery()
+        )
+        stmt = (
+            update(_account_table)
+            .where(_account_table.c.username == bindparam("b_username"))
+            .where(latest == bindparam("b_changed_at"))
+            .values(onlogin=bindparam("b_onlogin"))
+        )
+        result = await conn.execute(stmt, params)
+    await db.commit()
+    return max(result.rowcount, 0)
+
+def _listing_stmt(userlevel: Optional[int] = None, onlogin: Optional[int] = None):
+    """계정 목록 조회문 (username 순, 비밀번호 컬럼 제외)"""
+    stmt = select(
+        _account_table.c.username,
+        _account_table.c.userlevel,
+        _account_table.c.onlogin
+    ).order_by(_account_table.c.username)
+    if userlevel is not None:
+        stmt = stmt.where(_account_table.c.userlevel == userlevel)
+    if onlogin is not None:
+        stmt = stmt.where(_account_table.c.onlogin == onlogin)
+    return stmt
+
+async def list_accounts(
+    db: AsyncSession,
+    after: Optional[str] = None,
+    limit: int = 100,
+    userlevel: Optional[int] = None,
+    onlogin: Optional[int] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """username 기준 keyset 페이지 조회 후 (목록, 다음 커서) 반환
+
+    OFFSET 을 쓰지 않고 마지막 username 다음부터 읽으므로
+    몇 번째 페이지든 기본키 인덱스 탐색 한 번으로 끝난다.
+    """
+    stmt = _listing_stmt(userlevel, onlogin)
+    if after is not None:
+        stmt = stmt.where(_account_table.c.username > after)
+    # 다음 페이지 존재 여부를 알기 위해 한 행 더 읽음
+    conn = await db.connection()
+    result = await conn.execute(stmt.limit(limit + 1))
+    rows = [dict(row._mapping) for row in result]
+    next_cursor = rows[limit - 1]["username"] if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+async def stream_accounts(
+    db: AsyncSession,
+    userlevel: Optional[int] = None,
+    onlogin: Optional[int] = None,
+    chunk_size: int = 1000
+) -> AsyncIterator[dict]:
+    """서버 측 커서로 전체 계정을 chunk_size 행씩 읽어 하나씩 반환"""
+    stmt = _listing_stmt(userlevel, onlogin).execution_options(yield_per=chunk_size)
+    conn = await db.connection()
+    result = await conn.stream(stmt)
+    async for row in result:
+        yield dict(row._mapping)
@@ -1,26 +1,55 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from typing import Optional
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool_monitor import PoolMonitor
 
 # PostgreSQL 연결 URL 생성
 DATABASE_URL = f"postgresql+asyncpg://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
 
-# 데이터베이스 엔진 생성
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=True,  # SQL 쿼리 로깅 활성화
-    pool_pre_ping=True  # 연결 상태 확인
-)
+# 커넥션 풀 / 쿼리 계측
+pool_monitor = PoolMonitor(slow_query_ms=settings.DB_SLOW_QUERY_MS)
+
+# 데이터베이스 엔진 (init_engine() 에서 생성, 보통 lifespan 시작 시 호출)
+engine: Optional[AsyncEngine] = None
 
-# 비동기 세션 팩토리 생성
+# 비동기 세션 팩토리 (엔진을 만들 때 bind)
 AsyncSessionLocal = sessionmaker(
-    engine,
     class_=AsyncSession,
     expire_on_commit=False
 )
 
+def build_engine(url, pool_size: int, max_overflow: int) -> AsyncEngine:
+    """공통 풀 설정으로 엔진 생성 (기본 DB 와 테넌트 DB 가 함께 사용)"""
+    return create_async_engine(
+        url,
+        echo=settings.DB_ECHO,  # SQL 쿼리 로깅 (운영에서는 끔)
+        poolclass=pool_monitor.pool_class(),
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        # 체크아웃마다 ping 하는 대신 기본적으로 백그라운드 생존 확인 사용
+        pool_pre_ping=settings.DB_POOL_LIVENESS == "pre_ping",
+        connect_args={
+            # asyncpg 연결별 prepared statement 캐시 크기
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+        } if make_url(url).get_backend_name() == "postgresql" else {}
+    )
+
+def init_engine() -> AsyncEngine:
+    """엔진 생성 후 세션 팩토리에 연결 (여러 번 호출해도 한 번만 생성)"""
+    global engine
+    if engine is None:
+        engine = build_engine(DATABASE_URL, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
+        pool_monitor.attach(engine)
+        AsyncSessionLocal.configure(bind=engine)
+    return engine
+
 # 데이터베이스 세션 의존성
 async def get_db():
+    init_engine()
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -29,4 +58,15 @@ async def get_db():
             await session.rollback()
             raise
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+async def start_pool_monitor():
+    """백그라운드 DB 생존 확인 시작"""
+    if settings.DB_POOL_LIVENESS == "background":
+        pool_monitor.start(settings.DB_LIVENESS_INTERVAL_SECONDS)
+
+async def stop_pool_monitor():
+    """생존 확인 중지 후 커넥션 풀 정리"""
+    await pool_monitor.stop()
+    if engine is not None:
+        await engine.dispose()
@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Optional
+
+from sqlalchemy import event, exc, text
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import STAGE_LATENCY
+
+logger = logging.getLogger(__name__)
+
+
+def _percentile(samples, ratio: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+class PoolMonitor:
+    """커넥션 풀과 쿼리 계측
+
+    - 연결을 얻기까지 기다린 시간과 타임아웃 횟수
+    - 임계값을 넘은 느린 쿼리 로그
+    - 백그라운드 생존 확인 (체크아웃마다 ping 하는 pool_pre_ping 대신 사용)
+    """
+
+    def __init__(self, slow_query_ms: float = 200.0, window: int = 1000):
+        self.slow_query_ms = slow_query_ms
+        self.engine = None
+
+        # 연결 대기
+        self.checkouts = 0
+        self.timeouts = 0
+        self._wait_times: Deque[float] = deque(maxlen=window)
+
+        # 쿼리
+        self.queries = 0
+        self.slow_queries = 0
+        self._recent_slow: Deque[dict] = deque(maxlen=20)
+
+        # 생존 확인
+        self.liveness_interval = 0.0
+        self.last_check_at: Optional[float] = None
+        self.last_check_ok: Optional[bool] = None
+        self.last_check_latency: Optional[float] = None
+        self.last_check_error: Optional[str] = None
+        self._liveness_task: Optional[asyncio.Task] = None
+        self._inflight_check: Optional[asyncio.Task] = None
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self._wait_times.append(seconds)
+        STAGE_LATENCY.observe(seconds, "db_pool_wait")
+
+    def pool_class(self):
+        """이 모니터에 대기 시간을 기록하는 풀 클래스 (engine.dispose() 후 재생성돼도 유지)"""
+        return type("InstrumentedAsyncPool", (InstrumentedAsyncPool,), {"monitor": self})
+
+    def attach(self, engine) -> None:
+        """엔진에 쿼리 시간 측정 이벤트 등록"""
+        self.engine = engine
+        sync_engine = engine.sync_engine
+
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            starts = conn.info.get("query_start")
+            if not starts:
+                return
+            elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+            self.queries += 1
+            if self.slow_query_ms and elapsed_ms >= self.slow_query_ms:
+                self.slow_queries += 1
+                sql = " ".join(statement.split())[:500]
+                self._recent_slow.append({"sql": sql, "ms": round(elapsed_ms, 2), "at": time.time()})
+                logger.warning(f"Slow query ({elapsed_ms:.1f} ms): {sql}")
+
+        @event.listens_for(sync_engine, "handle_error")
+        def _handle_error(context):
+            # 실패한 쿼리의 시작 시각이 남지 않도록 정리
+            if context.connection is not None:
+                starts = context.connection.info.get("query_start")
+                if starts:
+                    starts.pop()
+
+    async def _select_one(self) -> None:
+        async with self.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def check(self, timeout: Optional[float] = None) -> bool:
+        """SELECT 1 로 DB 생존 확인
+
+        연결이 끊겼다면 SQLAlchemy 가 풀 전체를 무효화하므로, 이후
+        요청은 체크아웃마다 ping 하지 않아도 새 연결을 받는다.
+        """
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._select_one(), timeout)
+            self.last_check_ok = True
+            self.last_check_error = None
+        except asyncio.TimeoutError:
+            self.last_check_ok = False
+            self.last_check_error = f"timed out after {timeout}s"
+            logger.warning(f"Database liveness check timed out after {timeout}s")
+        except Exception as e:
+            self.last_check_ok = False
+            self.last_check_error = str(e)
+            logger.warning(f"Database liveness check failed: {str(e)}")
+        finally:
+            self.last_check_at = time.time()
+            self.last_check_latency = time.perf_counter() - started
+        return self.last_check_ok
+
+    async def cached_check(self, max_age: float, timeout: Optional[float] = None) -> bool:
+        """max_age 초 안에 확인한 결과가 있으면 재사용, 없으면 한 번만 확인
+
+        로드밸런서가 매초 여러 번 probe 해도 DB 조회는 max_age 마다
+        최대 한 번이고, 동시에 들어온 probe 는 같은 조회 결과를 기다린다.
+        """
+        if (
+            self.last_check_at is not None
+            and time.time() - self.last_check_at < max_age
+        ):
+            return bool(self.last_check_ok)
+        if self._inflight_check is None or self._inflight_check.done():
+            self._inflight_check = asyncio.get_running_loop().create_task(self.check(timeout))
+        return await asyncio.shield(self._inflight_check)
+
+    async def _liveness_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.liveness_interval)
+            await self.check()
+
+    def start(self, interval: float) -> None:
+        """백그라운드 생존 확인 시작 (interval <= 0 이면 사용 안 함)"""
+        self.liveness_interval = interval
+        if interval > 0 and self._liveness_task is None:
+            self._liveness_task = asyncio.get_running_loop().create_task(self._liveness_loop())
+
+    async def stop(self) -> None:
+        if self._liveness_task is not None:
+            self._liveness_task.cancel()
+            try:
+                await self._liveness_task
+            except asyncio.CancelledError:
+                pass
+            self._liveness_task = None
+
+    def stats(self) -> dict:
+        """풀 상태, 연결 대기 시간, 쿼리 통계 (시간은 초 단위)"""
+        pool = self.engine.pool if self.engine is not None else None
+        wait_times = list(self._wait_times)
+        return {
+            "pool": {
+                "size": pool.size() if pool is not None else 0,
+                "checked_out": pool.checkedout() if pool is not None else 0,
+                "idle": pool.checkedin() if pool is not None else 0,
+                "overflow": pool.overflow() if pool is not None else 0,
+                "max_overflow": getattr(pool, "_max_overflow", 0),
+            },
+            "wait": {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg": sum(wait_times) / len(wait_times) if wait_times else 0.0,
+                "p95": _percentile(wait_times, 0.95),
+                "max": max(wait_times) if wait_times else 0.0,
+            },
+            "queries": {
+                "total": self.queries,
+                "slow": self.slow_queries,
+                "slow_threshold_ms": self.slow_query_ms,
+                "recent_slow": list(self._recent_slow),
+            },
+            "liveness": {
+                "interval": self.liveness_interval,
+                "last_check_at": self.last_check_at,
+                "ok": self.last_check_ok,
+                "latency": self.last_check_latency,
+                "error": self.last_check_error,
+            },
+        }
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """연결을 얻기까지 걸린 시간을 PoolMonitor 에 기록하는 풀"""
+
+    monitor: Optional[PoolMonitor] = None
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            if self.monitor is not None:
+                self.monitor.timeouts += 1
+            raise
+        finally:
+            if self.monitor is not None:
+                self.monitor.record_wait(time.perf_counter() - started)
@@ -0,0 +1,227 @@
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.db.db_config import DATABASE_URL, build_engine, init_engine
+
+logger = logging.getLogger(__name__)
+
+# 복제본의 재생 지연(초). 받은 WAL 을 모두 재생했다면 마지막 트랜잭션이 오래되었어도 0 으로 본다.
+# WAL 수신이 끊기면 받은 위치와 재생 위치가 같아도 뒤처진 것이므로 NULL (사용하지 않음).
+# pg_stat_wal_receiver 의 status 는 pg_read_all_stats 권한이 있어야 보이며, 없으면 항상 NULL 이다.
+PG_REPLICA_LAG_SQL = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+
+class ReplicaNotStreaming(Exception):
+    """복제본이 기본 DB 에서 WAL 을 받고 있지 않음 (지연을 알 수 없음)"""
+
+
+def replica_urls(spec: str) -> list:
+    """'host[:port],...' 또는 전체 URL 목록을 엔진 URL 로 변환 (host 만 주면 나머지는 기본 DB 와 같음)"""
+    urls = []
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        if "://" in entry:
+            urls.append(make_url(entry))
+            continue
+        host, _, port = entry.partition(":")
+        urls.append(make_url(DATABASE_URL).set(host=host, port=int(port) if port else settings.DB_PORT))
+    return urls
+
+
+class Replica:
+    """복제본 하나의 엔진과 마지막 확인 결과"""
+
+    def __init__(self, name: str, engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.healthy = False  # 첫 확인 전에는 사용하지 않음
+        self.lag: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.reads = 0
+
+    def stats(self) -> dict:
+        return {
+            "healthy": self.healthy,
+            "lag_seconds": self.lag,
+            "checked_at": self.checked_at,
+            "error": self.error,
+            "reads": self.reads,
+        }
+
+
+class ReplicaRouter:
+    """읽기 전용 작업을 복제본으로 보내는 라우터
+
+    - 쓰기와 트랜잭션 안의 읽기, 인증용 계정 조회는 지금처럼 기본 DB 를 쓴다
+      (쓴 직후 복제본에서 읽으면 이전 값이 보일 수 있으므로).
+    - 읽기는 정상 복제본을 돌아가며 쓰고, 정상 복제본이 없거나 연결에
+      실패하면 기본 DB 로 보낸다 (fallbacks 로 집계).
+    - check_interval 마다 복제본의 연결과 재생 지연을 확인해 max_lag 초를
+      넘으면 다시 따라잡을 때까지 제외한다.
+    """
+
+    def __init__(self, replica_factory: Callable[[], List[Replica]],
+                 primary: Callable[[], AsyncEngine] = init_engine, max_lag: float = 5.0,
+                 check_interval: float = 5.0, check_timeout: float = 2.0):
+        self.replica_factory = replica_factory
+        self.primary = primary
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+
+        self._replicas: Optional[List[Replica]] = None
+        self._cycle = None
+        self._check_task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.primary_reads = 0
+        self.fallbacks = 0
+
+    @property
+    def replicas(self) -> List[Replica]:
+        """복제본 목록 (엔진은 처음 쓸 때 생성)"""
+        if self._replicas is None:
+            self._replicas = self.replica_factory()
+            self._cycle = itertools.cycle(self._replicas)
+        return self._replicas
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    async def _measure_lag(self, replica: Replica) -> float:
+        async with replica.engine.connect() as conn:
+            if conn.dialect.name != "postgresql":
+                await conn.execute(text("SELECT 1"))
+                return 0.0
+            lag = (await conn.execute(PG_REPLICA_LAG_SQL)).scalar()
+            if lag is None:
+                raise ReplicaNotStreaming("WAL receiver is not streaming")
+            return float(lag)
+
+    async def check_replica(self, replica: Replica) -> bool:
+        """연결과 재생 지연 확인 후 사용 가능 여부 갱신"""
+        try:
+            replica.lag = await asyncio.wait_for(self._measure_lag(replica), self.check_timeout)
+            replica.error = None if replica.lag <= self.max_lag else f"lag {replica.lag:.1f}s > {self.max_lag}s"
+        except Exception as e:
+            replica.lag = None
+            replica.error = f"{e.__class__.__name__}: {e}"
+        healthy = replica.error is None
+        if healthy != replica.healthy:
+            log = logger.info if healthy else logger.warning
+            log(f"Read replica {replica.name} {'healthy' if healthy else 'unavailable'}: {replica.error or 'ok'}")
+        replica.healthy = healthy
+        replica.checked_at = time.time()
+        return healthy
+
+    async def check(self) -> None:
+        await asyncio.gather(*(self.check_replica(replica) for replica in self.replicas))
+
+    def _pick(self) -> Optional[Replica]:
+        """정상 복제본을 돌아가며 선택 (없으면 None)"""
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if replica.healthy:
+                return replica
+        return None
+
+    async def _connect(self) -> AsyncConnection:
+        replica = self._pick() if self.enabled else None
+        if replica is not None:
+            try:
+                conn = await replica.engine.connect()
+                replica.reads += 1
+                return conn
+            except Exception as e:
+                # 다음 확인 때까지 이 복제본은 제외하고 기본 DB 로 읽음
+                replica.healthy = False
+                replica.error = f"{e.__class__.__name__}: {e}"
+                logger.warning(f"Read replica {replica.name} connect failed, falling back to primary: {e}")
+                self.fallbacks += 1
+        elif self.enabled:
+            self.fallbacks += 1
+        self.primary_reads += 1
+        return await self.primary().connect()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[AsyncConnection]:
+        """읽기 전용 Core 연결"""
+        conn = await self._connect()
+        try:
+            yield conn
+        finally:
+            await conn.close()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """읽기 전용 ORM 세션 (커밋하지 않음)"""
+        async with self.connection() as conn:
+            async with AsyncSession(bind=conn, expire_on_commit=False) as session:
+                yield session
+
+    async def _check_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check()
+
+    async def start(self) -> None:
+        """첫 확인을 마친 뒤 주기적 확인 시작 (복제본이 없으면 아무것도 안 함)"""
+        if not self.enabled or self._check_task is not None:
+            return
+        await self.check()
+        self._check_task = asyncio.get_running_loop().create_task(self._check_loop())
+
+    async def stop(self) -> None:
+        if self._check_task is not None:
+            self._check_task.cancel()
+            try:
+                await self._check_task
+            except asyncio.CancelledError:
+                pass
+            self._check_task = None
+        if self._replicas:
+            await asyncio.gather(*(replica.engine.dispose() for replica in self._replicas))
+        self._replicas = None
+
+    def stats(self) -> dict:
+        return {
+            "replicas": {replica.name: replica.stats() for replica in self._replicas or []},
+            "max_lag_seconds": self.max_lag,
+            "primary_reads": self.primary_reads,
+            "fallbacks": self.fallbacks,
+        }
+
+
+def _replicas_from_settings() -> List[Replica]:
+    replicas = []
+    for url in replica_urls(settings.DB_REPLICA_HOSTS):
+        # 지표 라벨용 이름: host:port (파일 DB 는 경로)
+        name = f"{url.host}:{url.port or settings.DB_PORT}" if url.host else url.database
+        replicas.append(Replica(name, build_engine(url, settings.DB_REPLICA_POOL_SIZE, settings.DB_REPLICA_MAX_OVERFLOW)))
+    return replicas
+
+
+# 전역 인스턴스 생성
+replica_router = ReplicaRouter(
+    replica_factory=_replicas_from_settings,
+    max_lag=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.DB_REPLICA_CHECK_INTERVAL_SECONDS,
+    check_timeout=settings.HEALTH_DB_TIMEOUT_SECONDS
+)
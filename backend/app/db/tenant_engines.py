@@ -0,0 +1,270 @@
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Optional, Tuple, Union
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.db.db_config import DATABASE_URL, build_engine
+from app.db.replicas import replica_urls
+
+logger = logging.getLogger(__name__)
+
+TENANT_NAME = re.compile(r"^[A-Za-z0-9_\-]{1,63}$")
+
+
+class ConnectionBudgetExceeded(Exception):
+    """전체 연결 예산을 기다리다 시간이 초과됨"""
+
+
+def tenant_for(username: str, userlevel: Optional[int]) -> Optional[str]:
+    """계정이 속한 테넌트 (테넌트 계정이 아니면 None = 기본 DB)"""
+    return username if userlevel == settings.TENANT_USERLEVEL else None
+
+
+def tenant_database_url(tenant: str):
+    """기본 DB 와 같은 서버·계정으로 테넌트 DB 이름만 바꾼 URL"""
+    if not TENANT_NAME.match(tenant):
+        raise ValueError(f"잘못된 테넌트 이름입니다: {tenant!r}")
+    return make_url(DATABASE_URL).set(database=settings.TENANT_DB_NAME_TEMPLATE.format(tenant=tenant))
+
+
+def _shared_pools() -> Tuple[int, int, int, int]:
+    """(워커 수, 워커당 연결 예산, 기본 DB 풀 최대 연결, 복제본 풀 최대 연결 합)"""
+    workers = max(1, settings.WEB_CONCURRENCY)
+    replica_pools = len(replica_urls(settings.DB_REPLICA_HOSTS)) * (
+        settings.DB_REPLICA_POOL_SIZE + settings.DB_REPLICA_MAX_OVERFLOW
+    )
+    return (
+        workers, settings.DB_CONNECTION_BUDGET // workers,
+        settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW, replica_pools
+    )
+
+
+def warn_shared_pools_over_budget() -> bool:
+    """테넌트 라우팅을 쓰지 않을 때: 기본 DB·복제본 풀이 워커당 예산을 넘으면 경고만 (시작은 막지 않음)"""
+    workers, per_worker, default_pool, replica_pools = _shared_pools()
+    if default_pool + replica_pools <= per_worker:
+        return False
+    logger.warning(
+        f"DB pools may open {default_pool + replica_pools} connections per worker "
+        f"(default {default_pool}, replicas {replica_pools}), over DB_CONNECTION_BUDGET "
+        f"{settings.DB_CONNECTION_BUDGET} / {workers} workers = {per_worker}"
+    )
+    return True
+
+
+def tenant_connection_budget() -> int:
+    """워커 하나가 테넌트 세션에 동시에 쓸 수 있는 연결 수 (테넌트 라우팅을 켰을 때만 사용)
+
+    DB_CONNECTION_BUDGET 은 이 서버의 워커 전체 몫이므로 WEB_CONCURRENCY 로 나눈 뒤,
+    기본 DB 풀과 복제본 풀이 열 수 있는 최대 연결, 테넌트 엔진들이 풀에 유휴로 남겨 둘
+    수 있는 연결 (TENANT_ENGINE_CACHE_SIZE × TENANT_POOL_SIZE) 을 미리 뺀다. 남는 자리가
+    없으면 설정 오류이므로 시작하지 않는다 (ValueError).
+    """
+    workers, per_worker, default_pool, replica_pools = _shared_pools()
+    if default_pool >= per_worker:
+        raise ValueError(
+            f"DB_POOL_SIZE + DB_MAX_OVERFLOW ({default_pool}) 는 워커당 연결 예산 "
+            f"(DB_CONNECTION_BUDGET {settings.DB_CONNECTION_BUDGET} / 워커 {workers} = {per_worker}) 보다 작아야 합니다"
+        )
+    idle_tenant = settings.TENANT_ENGINE_CACHE_SIZE * settings.TENANT_POOL_SIZE
+    budget = per_worker - default_pool - replica_pools - idle_tenant
+    if budget < 1:
+        raise ValueError(
+            f"워커당 연결 예산 {per_worker} 이 기본 DB 풀 {default_pool}, 복제본 풀 {replica_pools}, "
+            f"테넌트 유휴 연결 {idle_tenant} 을 담기에 부족합니다"
+        )
+    return budget
+
+
+class _TenantEngine:
+    __slots__ = ("engine", "active", "last_used")
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.active = 0
+        self.last_used = time.monotonic()
+
+
+class TenantEngineRegistry:
+    """테넌트별 엔진 LRU 캐시와 전체 연결 예산
+
+    - 엔진은 처음 쓰일 때 작은 풀로 만들고, max_engines 를 넘으면 가장 오래
+      쓰이지 않은 (사용 중인 세션이 없는) 엔진부터 풀을 닫는다.
+    - idle_seconds 동안 쓰이지 않은 엔진은 백그라운드 작업이 닫는다.
+    - 세션 하나가 연결 하나를 쓰므로, 모든 테넌트 세션이 semaphore 하나를
+      나눠 써 동시에 쓰는 연결 수가 budget 을 넘지 않게 한다. 자리가 나지
+      않으면 acquire_timeout 후 ConnectionBudgetExceeded. 풀에 남는 유휴 연결은
+      엔진당 TENANT_POOL_SIZE 개이므로 max_engines × TENANT_POOL_SIZE 를 넘지 않는다.
+    - budget 은 이 워커의 몫이다. 워커 수와 다른 풀을 뺀 값은 tenant_connection_budget() 참고.
+      함수로 주면 처음 쓸 때 (enabled 이면 start() 에서) 계산하므로, 테넌트 라우팅을 끄면
+      예산 설정이 시작을 막지 않는다.
+    """
+
+    def __init__(self, budget: Union[int, Callable[[], int]], max_engines: int = 50,
+                 idle_seconds: float = 300.0, acquire_timeout: float = 30.0,
+                 engine_factory: Optional[Callable[[str], AsyncEngine]] = None, enabled: bool = True):
+        self._budget_factory = budget if callable(budget) else None
+        self._budget: Optional[int] = None if callable(budget) else self._checked_budget(budget)
+        self.enabled = enabled
+        self.max_engines = max_engines
+        self.idle_seconds = idle_seconds
+        self.acquire_timeout = acquire_timeout
+        self.engine_factory = engine_factory or self._build_engine
+
+        self._engines: "OrderedDict[str, _TenantEngine]" = OrderedDict()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._reaper_task: Optional[asyncio.Task] = None
+        self._disposing = set()
+
+        # 통계
+        self.in_use = 0
+        self.created = 0
+        self.evicted = 0
+        self.reaped = 0
+        self.budget_waits = 0
+        self.budget_timeouts = 0
+
+    @staticmethod
+    def _checked_budget(budget: int) -> int:
+        if budget < 1:
+            raise ValueError(f"테넌트 연결 예산은 1 이상이어야 합니다: {budget}")
+        return budget
+
+    @property
+    def budget(self) -> int:
+        """이 워커의 테넌트 연결 예산 (처음 쓸 때 계산)"""
+        if self._budget is None:
+            self._budget = self._checked_budget(self._budget_factory())
+        return self._budget
+
+    @staticmethod
+    def _build_engine(tenant: str) -> AsyncEngine:
+        return build_engine(tenant_database_url(tenant), settings.TENANT_POOL_SIZE, settings.TENANT_MAX_OVERFLOW)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.budget)
+        return self._slots
+
+    def _dispose(self, tenant: str, entry: _TenantEngine) -> None:
+        # 풀 정리는 기다리지 않음 (요청 처리 경로에서 호출되므로)
+        task = asyncio.get_running_loop().create_task(entry.engine.dispose())
+        self._disposing.add(task)
+        task.add_done_callback(self._disposing.discard)
+        logger.info(f"Tenant engine closed: {tenant}")
+
+    def _checkout(self, tenant: str) -> _TenantEngine:
+        entry = self._engines.get(tenant)
+        if entry is None:
+            entry = self._engines[tenant] = _TenantEngine(self.engine_factory(tenant))
+            self.created += 1
+            # 사용 중인 엔진은 건너뛰고 오래된 순으로 정리 (모두 사용 중이면 잠시 상한을 넘김)
+            for name in list(self._engines):
+                if len(self._engines) <= self.max_engines:
+                    break
+                candidate = self._engines[name]
+                if name != tenant and candidate.active == 0:
+                    del self._engines[name]
+                    self.evicted += 1
+                    self._dispose(name, candidate)
+        self._engines.move_to_end(tenant)
+        entry.active += 1
+        return entry
+
+    @asynccontextmanager
+    async def session(self, tenant: str) -> AsyncIterator[AsyncSession]:
+        """테넌트 DB 세션 (연결 예산 한 자리를 잡은 동안만 사용)"""
+        slots = self._semaphore()
+        if not slots.locked():
+            await slots.acquire()
+        else:
+            self.budget_waits += 1
+            try:
+                await asyncio.wait_for(slots.acquire(), self.acquire_timeout)
+            except asyncio.TimeoutError:
+                self.budget_timeouts += 1
+                raise ConnectionBudgetExceeded(
+                    f"No database connection available within {self.acquire_timeout}s (budget {self.budget})"
+                )
+        self.in_use += 1
+        entry = None
+        try:
+            entry = self._checkout(tenant)
+            async with AsyncSession(entry.engine, expire_on_commit=False) as session:
+                yield session
+        finally:
+            if entry is not None:
+                entry.active -= 1
+                entry.last_used = time.monotonic()
+            self.in_use -= 1
+            slots.release()
+
+    def reap_idle(self, now: Optional[float] = None) -> int:
+        """idle_seconds 넘게 쓰이지 않은 엔진을 닫고 닫은 수 반환"""
+        now = time.monotonic() if now is None else now
+        idle = [
+            name for name, entry in self._engines.items()
+            if entry.active == 0 and now - entry.last_used >= self.idle_seconds
+        ]
+        for name in idle:
+            self._dispose(name, self._engines.pop(name))
+        self.reaped += len(idle)
+        return len(idle)
+
+    async def _reaper_loop(self) -> None:
+        interval = max(1.0, min(self.idle_seconds / 2, 60.0))
+        while True:
+            await asyncio.sleep(interval)
+            self.reap_idle()
+
+    def start(self) -> None:
+        """연결 예산 확인 후 유휴 엔진 정리 시작 (꺼져 있으면 공용 풀만 확인해 경고)"""
+        if not self.enabled:
+            warn_shared_pools_over_budget()
+            return
+        logger.info(f"Tenant routing enabled: {self.budget} connections per worker")
+        if self._reaper_task is None and self.idle_seconds > 0:
+            self._reaper_task = asyncio.get_running_loop().create_task(self._reaper_loop())
+
+    async def stop(self) -> None:
+        """정리 작업을 멈추고 모든 테넌트 풀 닫기"""
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            try:
+                await self._reaper_task
+            except asyncio.CancelledError:
+                pass
+            self._reaper_task = None
+        engines, self._engines = self._engines, OrderedDict()
+        await asyncio.gather(*(entry.engine.dispose() for entry in engines.values()), *self._disposing)
+
+    def stats(self) -> dict:
+        return {
+            "engines": len(self._engines),
+            "max_engines": self.max_engines,
+            "active_sessions": sum(entry.active for entry in self._engines.values()),
+            "budget": self._budget,
+            "in_use": self.in_use,
+            "created": self.created,
+            "evicted": self.evicted,
+            "reaped": self.reaped,
+            "budget_waits": self.budget_waits,
+            "budget_timeouts": self.budget_timeouts,
+        }
+
+
+# 전역 인스턴스 생성 (연결 예산은 테넌트 라우팅을 켰을 때만 시작하면서 확인)
+tenant_engines = TenantEngineRegistry(
+    budget=tenant_connection_budget,
+    max_engines=settings.TENANT_ENGINE_CACHE_SIZE,
+    idle_seconds=settings.TENANT_ENGINE_IDLE_SECONDS,
+    acquire_timeout=settings.DB_POOL_TIMEOUT,
+    enabled=settings.TENANT_ROUTING_ENABLED
+)
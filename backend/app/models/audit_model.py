@@ -0,0 +1,20 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String
+from app.models.user_model import Base
+
+class AuditEvent(Base):
+    """인증 감사 기록 (추가만 하고 수정·삭제하지 않음)"""
+    __tablename__ = "table_auditlog"
+
+    # SQLite 는 INTEGER PRIMARY KEY 만 자동 증가하므로 다른 DB 에서만 BIGINT 사용
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    occurred_at = Column(DateTime(timezone=True), nullable=False)
+    event = Column(String(32), nullable=False)     # login | logout | password_change
+    outcome = Column(String(32), nullable=False)   # success | invalid_password | unknown_user | throttled ...
+    username = Column(String(32))
+    client_ip = Column(String(45))
+    request_id = Column(String(64))
+
+    __table_args__ = (
+        Index("ix_auditlog_occurred_at", "occurred_at"),
+        Index("ix_auditlog_username_occurred_at", "username", "occurred_at"),
+    )
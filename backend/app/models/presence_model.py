@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Float, String
+from app.models.user_model import Base
+
+class PresenceChange(Base):
+    """계정별 마지막으로 반영한 onlogin 변경 시각
+
+    여러 워커가 onlogin 을 모아서 저장하므로, 이 시각보다 오래된 변경은 버려
+    늦게 도착한 이전 상태가 새 상태를 덮어쓰지 않게 한다.
+    """
+    __tablename__ = "table_presence"
+
+    username = Column(String(32), primary_key=True)
+    changed_at = Column(Float(precision=53), nullable=False)  # 변경이 일어난 시각 (epoch 초)
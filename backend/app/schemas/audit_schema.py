@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+# 감사 기록 응답 스키마
+class AuditEventResponse(BaseModel):
+    occurred_at: datetime
+    event: str
+    outcome: str
+    username: Optional[str] = None
+    client_ip: Optional[str] = None
+    request_id: Optional[str] = None
+
+class AuditListResponse(BaseModel):
+    items: List[AuditEventResponse]
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
-import re
+from app.core.password_policy import password_policy
 
 # 기본 사용자 모델
 class UserBase(BaseModel):
@@ -14,16 +14,9 @@ class UserCreate(UserBase):
 
     @validator('password')
     def password_strength(cls, v):
-        if len(v) < 8:
-            raise ValueError('비밀번호는 최소 8자 이상이어야 합니다')
-        if not re.search(r'[A-Z]', v):
-            raise ValueError('비밀번호는 최소 1개의 대문자를 포함해야 합니다')
-        if not re.search(r'[a-z]', v):
-            raise ValueError('비밀번호는 최소 1개의 소문자를 포함해야 합니다')
-        if not re.search(r'\d', v):
-            raise ValueError('비밀번호는 최소 1개의 숫자를 포함해야 합니다')
-        if not re.search(r'[!@#\$%\^&\*\(\),\.\?:{}|<>\-_]', v):
-            raise ValueError('비밀번호는 최소 1개의 특수문자를 포함해야 합니다')
+        is_valid, error_message = password_policy.validate(v)
+        if not is_valid:
+            raise ValueError(error_message)
         return v
 
 # 사용자 업데이트 스키마
@@ -60,4 +53,23 @@ class UserInDB(UserBase):
     updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+# 대량 등록 결과 스키마
+class BulkRowError(BaseModel):
+    line: int
+    username: Optional[str] = None
+    error: str
+
+class BulkProvisionResponse(BaseModel):
+    total: int
+    created: int
+    updated: int
+    skipped: int
+    failed: int
+    errors: List[BulkRowError]
+
+# 계정 목록 응답 스키마
+class UserListResponse(BaseModel):
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None
@@ -1,11 +1,72 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.api.endpoints.auth import auth_router
 from app.api.endpoints.users import users_router
+from app.api.endpoints.health import router as health_router
+from app.api.endpoints.metrics import router as metrics_router
+from app.api.endpoints.jwks import router as jwks_router
+from app.api.endpoints.audit import router as audit_router
+from app.db.db_config import init_engine, start_pool_monitor, stop_pool_monitor
+from app.db.tenant_engines import tenant_engines
+from app.db.replicas import replica_router
+from app.core.logging_config import setup_logging, shutdown_logging
+from app.core.middleware import RequestIdMiddleware, XSSProtectionMiddleware
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware
+from app.core.hashing import calibrate_password_hasher, password_hasher
+from app.core.warmup import warm_up, warmup_state
+from app.crud.presence_buffer import presence_buffer
+from app.core.audit import audit_trail
+
+# 로깅 설정 (출력은 백그라운드 스레드에서 처리)
+setup_logging()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """시작: 엔진 생성, bcrypt cost 보정, DB·복제본 상태 확인, 백그라운드 워밍업
+    종료: 워밍업 취소, onlogin·감사 기록 버퍼 저장, 테넌트·복제본·기본 커넥션 풀·해싱 워커·로그 정리
+
+    워밍업은 요청을 받기 시작한 뒤 백그라운드에서 돌고, 끝날 때까지 /health/ready 는 503 이다.
+    """
+    started = time.perf_counter()
+    init_engine()
+    warmup_state.record("engine", time.perf_counter() - started)
+
+    # bcrypt cost 보정 (BCRYPT_TARGET_VERIFY_MS 설정 시)
+    await warmup_state.run_step("hash_calibration", calibrate_password_hasher)
+
+    # DB 생존 확인 시작 (복제본은 첫 지연 확인 후 읽기에 사용)
+    await start_pool_monitor()
+    await replica_router.start()
+    presence_buffer.start()
+    audit_trail.start()
+    tenant_engines.start()
+    warmup_task = asyncio.create_task(warm_up(warmup_state))
+    try:
+        yield
+    finally:
+        # 워밍업이 연결을 쓰는 중일 수 있으므로 취소가 끝난 뒤에 엔진을 닫음
+        warmup_task.cancel()
+        try:
+            await warmup_task
+        except asyncio.CancelledError:
+            pass
+        # 엔진을 닫기 전에 남은 onlogin 변경과 감사 기록 저장
+        await presence_buffer.stop()
+        await audit_trail.stop()
+        await tenant_engines.stop()
+        await replica_router.stop()
+        await stop_pool_monitor()
+        password_hasher.shutdown(wait=False)
+        shutdown_logging()
 
 app = FastAPI(
     title="vPBX API",
     description="vPBX 시스템 관리를 위한 REST API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # API 라우터 등록
@@ -21,14 +82,46 @@ app.include_router(
     tags=["사용자 관리 API"]
 )
 
+app.include_router(
+    health_router,
+    tags=["상태 확인 API"]
+)
+
+app.include_router(
+    metrics_router,
+    tags=["지표 API"]
+)
+
+app.include_router(
+    jwks_router,
+    tags=["인증 API"]
+)
+
+app.include_router(
+    audit_router,
+    tags=["감사 API"]
+)
+
+# JSON 본문 XSS 검사 (본문은 한 번만 파싱해 라우트에 전달)
+app.add_middleware(XSSProtectionMiddleware, max_body_bytes=settings.MAX_JSON_BODY_BYTES)
+
+# 요청 지연 시간 지표 기록
+app.add_middleware(MetricsMiddleware)
+
+# 요청 ID 부여 (로그와 X-Request-ID 응답 헤더)
+app.add_middleware(RequestIdMiddleware)
+
 @app.get("/")
 async def root():
     return {
         "message": "vPBX API 서버에 오신 것을 환영합니다!",
         "docs_url": "/docs",
         "endpoints": {
-            "auth": ["/auth/login", "/auth/logout", "/auth/verify"],
-            "users": ["/users/add", "/users/delete", "/users/update"]
+            "auth": ["/auth/login", "/auth/logout", "/auth/verify", "/.well-known/jwks.json"],
+            "health": ["/health/live", "/health/ready", "/health/db"],
+            "metrics": ["/metrics"],
+            "audit": ["/audit"],
+            "users": ["/users", "/users/add", "/users/delete", "/users/update", "/users/bulk", "/users/password-costs"]
         }
     }
 
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""인증용 계정 조회 벤치마크
+
+기존 ORM 경로(select(Account) + identity map)와 Core 조회문
+(account_lookup_stmt) 을 같은 동시성으로 실행해 처리량과 지연 시간을 비교한다.
+캐시를 거치지 않도록 조회 함수를 직접 호출한다.
+
+사용 예:
+    PYTHONPATH=. python scripts/benchmark_auth_lookup.py --username admin -c 50 -n 5000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from sqlalchemy.future import select
+
+from app.crud.user_crud import account_lookup_stmt
+from app.db import db_config
+from app.db.db_config import AsyncSessionLocal, init_engine
+from app.models.user_model import Account
+
+
+async def orm_lookup(username: str):
+    """기존 방식: ORM 객체 생성 + identity map"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(Account).where(Account.username == username))
+        return result.scalar_one_or_none()
+
+
+async def core_lookup(username: str):
+    """Core 조회문 + prepared statement 캐시"""
+    async with db_config.engine.connect() as conn:
+        result = await conn.execute(account_lookup_stmt, {"username": username})
+        return result.first()
+
+
+def percentile(samples, ratio):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+async def run(name, lookup, username, concurrency, requests):
+    """concurrency 개의 작업이 requests 번의 조회를 나눠서 실행"""
+    latencies = []
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            await lookup(username)
+            latencies.append(time.perf_counter() - started)
+
+    # 워밍업 (연결 풀과 statement 캐시 채우기)
+    await asyncio.gather(*[lookup(username) for _ in range(concurrency)])
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    return {
+        "path": name,
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="인증용 계정 조회 벤치마크")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("-c", "--concurrency", type=int, default=20)
+    parser.add_argument("-n", "--requests", type=int, default=2000)
+    args = parser.parse_args()
+    engine = init_engine()
+
+    try:
+        results = [
+            await run("orm", orm_lookup, args.username, args.concurrency, args.requests),
+            await run("core", core_lookup, args.username, args.concurrency, args.requests),
+        ]
+    finally:
+        await engine.dispose()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
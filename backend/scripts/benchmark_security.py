@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""로그인 경로 보안 함수 마이크로벤치마크 (기준선 저장 / 회귀 비교)
+
+PasswordValidator.validate, sanitize_input, create_access_token, decode_token,
+bcrypt (cost 별 hash/check), SessionManager 의 add/validate/remove 를 호출 1회당
+시간(us)으로 측정한다. 각 항목은 repeat 번 반복 측정한 값의 중앙값을 쓴다.
+
+사용 예:
+    # 기준선 저장
+    PYTHONPATH=. python scripts/benchmark_security.py --save scripts/benchmark_baseline.json
+    # 기준선 대비 20% 이상 느려진 항목이 있으면 종료 코드 1
+    PYTHONPATH=. python scripts/benchmark_security.py --compare scripts/benchmark_baseline.json --threshold 0.2
+
+기준선은 측정한 머신에 종속되므로 같은 머신(또는 같은 CI 러너)에서 만든 파일과 비교해야 한다.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import bcrypt
+
+from app.core.security import (
+    create_access_token,
+    decode_token,
+    password_validator,
+    sanitize_input,
+)
+from app.core.session import InMemorySessionBackend, SQLiteSessionBackend, SessionManager
+
+BCRYPT_COSTS = (4, 8, 10, 12)
+
+
+class Benchmark:
+    """측정 항목 하나 (func 는 loops 번 실행하는 동기 함수 또는 코루틴 함수)"""
+
+    def __init__(self, name: str, func: Callable, loops: int, setup: Optional[Callable] = None):
+        self.name = name
+        self.func = func
+        self.loops = loops
+        self.setup = setup
+
+
+def _sync(func: Callable, *args) -> Callable:
+    def run(loops: int):
+        for _ in range(loops):
+            func(*args)
+    return run
+
+
+def primitive_benchmarks() -> List[Benchmark]:
+    token = create_access_token("1001")
+    long_input = ("사용자<script>'\"; " * 64)[:1024]
+    benches = [
+        Benchmark("password_validator.validate[valid]", _sync(password_validator.validate, "Vp6x!Lm9Qa"), 20000),
+        Benchmark("password_validator.validate[too_short]", _sync(password_validator.validate, "Ab1!"), 20000),
+        Benchmark("password_validator.validate[common_pattern]",
+                  _sync(password_validator.validate, "Qwerty!9Xz"), 20000),
+        Benchmark("sanitize_input[short]", _sync(sanitize_input, "user1001"), 20000),
+        Benchmark("sanitize_input[1KiB]", _sync(sanitize_input, long_input), 2000),
+        Benchmark("create_access_token", _sync(create_access_token, "1001"), 5000),
+        Benchmark("decode_token", _sync(decode_token, token), 5000),
+    ]
+    for cost in BCRYPT_COSTS:
+        hashed = bcrypt.hashpw(b"Vp6x!Lm9Qa", bcrypt.gensalt(cost))
+        loops = max(1, 2 ** (12 - cost))
+        benches.append(Benchmark(
+            f"bcrypt.hashpw[cost={cost}]",
+            lambda n, c=cost: [bcrypt.hashpw(b"Vp6x!Lm9Qa", bcrypt.gensalt(c)) for _ in range(n)],
+            loops
+        ))
+        benches.append(Benchmark(
+            f"bcrypt.checkpw[cost={cost}]", _sync(bcrypt.checkpw, b"Vp6x!Lm9Qa", hashed), loops
+        ))
+    return benches
+
+
+def session_benchmarks(sessions: int, sqlite_path: str) -> List[Benchmark]:
+    """sessions 명이 이미 로그인한 상태에서 세션 연산 측정"""
+    tokens = [create_access_token(f"u{i:06d}") for i in range(sessions)]
+    usernames = [f"u{i:06d}" for i in range(sessions)]
+    # get_current_user 처럼 서명 검증을 마친 payload 를 넘김
+    claims = [decode_token(token) for token in tokens]
+    benches = []
+
+    for label, factory in (
+        ("stateless", lambda: None),
+        ("memory", InMemorySessionBackend),
+        ("sqlite", lambda: SQLiteSessionBackend(sqlite_path)),
+    ):
+        manager = SessionManager(factory(), max_sessions_per_user=1)
+        populated = []
+
+        async def populate(manager=manager, populated=populated):
+            # 같은 백엔드를 쓰는 항목끼리 한 번만 채움
+            if populated:
+                return
+            for username, token in zip(usernames, tokens):
+                await manager.add_session(username, token)
+            populated.append(True)
+
+        async def add(loops, manager=manager):
+            # 이미 로그인한 사용자의 재로그인 (기존 세션 교체)
+            for i in range(loops):
+                j = i % sessions
+                await manager.add_session(usernames[j], tokens[j])
+
+        async def validate(loops, manager=manager):
+            for i in range(loops):
+                j = (i * 7919) % sessions
+                await manager.validate_session(usernames[j], tokens[j], claims[j])
+
+        async def remove_and_readd(loops, manager=manager):
+            for i in range(loops):
+                j = (i * 7919) % sessions
+                await manager.remove_session(usernames[j], tokens[j])
+                await manager.add_session(usernames[j], tokens[j])
+
+        loops = 500 if label == "sqlite" else 2000
+        benches.append(Benchmark(f"session.{label}.add_session[n={sessions}]", add, loops, populate))
+        benches.append(Benchmark(f"session.{label}.validate_session[n={sessions}]", validate, loops, populate))
+        benches.append(Benchmark(
+            f"session.{label}.remove_and_add_session[n={sessions}]", remove_and_readd, loops, populate
+        ))
+    return benches
+
+
+def measure(bench: Benchmark, repeat: int) -> Dict[str, float]:
+    """repeat 번 측정해 호출 1회당 시간(us) 통계 반환"""
+    is_async = asyncio.iscoroutinefunction(bench.func)
+    loop = asyncio.new_event_loop()
+    try:
+        if bench.setup is not None:
+            loop.run_until_complete(bench.setup())
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            if is_async:
+                loop.run_until_complete(bench.func(bench.loops))
+            else:
+                bench.func(bench.loops)
+            samples.append((time.perf_counter() - started) / bench.loops * 1e6)
+    finally:
+        loop.close()
+    return {
+        "median_us": round(statistics.median(samples), 3),
+        "min_us": round(min(samples), 3),
+        "max_us": round(max(samples), 3),
+        "loops": bench.loops,
+        "repeat": repeat,
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[dict]:
+    """기준선 중앙값보다 threshold 비율 이상 느려진 항목 목록"""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None or not base.get("median_us"):
+            continue
+        ratio = current["median_us"] / base["median_us"] - 1.0
+        current["baseline_median_us"] = base["median_us"]
+        current["change"] = round(ratio, 4)
+        if ratio > threshold:
+            regressions.append({"name": name, "baseline_us": base["median_us"],
+                                "current_us": current["median_us"], "change": round(ratio, 4)})
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="보안 함수 마이크로벤치마크")
+    parser.add_argument("--repeat", type=int, default=5, help="항목별 측정 반복 횟수")
+    parser.add_argument("--sessions", type=int, default=10000, help="세션 벤치마크의 기존 로그인 사용자 수")
+    parser.add_argument("-k", "--filter", default="", help="이름에 이 문자열이 포함된 항목만 실행")
+    parser.add_argument("--save", metavar="PATH", help="결과를 기준선 JSON 으로 저장")
+    parser.add_argument("--compare", metavar="PATH", help="기준선 JSON 과 비교")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="허용하는 중앙값 증가 비율 (기본값: 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        benches = primitive_benchmarks() + session_benchmarks(args.sessions, f"{tmpdir}/sessions.db")
+        results = {}
+        for bench in benches:
+            if args.filter and args.filter not in bench.name:
+                continue
+            results[bench.name] = measure(bench, args.repeat)
+            print(f"{bench.name}: {results[bench.name]['median_us']} us", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "bcrypt": bcrypt.__version__,
+        },
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        report["threshold"] = args.threshold
+        report["regressions"] = regressions
+        if regressions:
+            exit_code = 1
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    print(json.dumps(report, indent=2))
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""유출 비밀번호 목록을 PASSWORD_BREACHED_LIST_PATH 용 정렬 해시 파일로 변환
+
+입력은 한 줄에 하나씩 평문 비밀번호이거나, HIBP(Pwned Passwords) 형식의
+'SHA1HEX:횟수' 줄이다. 각 항목을 SHA-1 앞 8바이트로 줄여 정렬·중복 제거한 뒤
+기록하므로 천만 건이면 약 80MB 이고, 서버는 이 파일을 mmap 해서 이진 탐색한다.
+
+메모리를 제한하기 위해 --chunk 건씩 정렬한 임시 파일을 만든 뒤 병합한다.
+
+사용 예:
+    PYTHONPATH=. python scripts/build_breached_list.py rockyou.txt -o breached.bin
+    PYTHONPATH=. python scripts/build_breached_list.py pwned-passwords-sha1.txt -o breached.bin --min-count 10
+"""
+import argparse
+import heapq
+import os
+import re
+import sys
+import tempfile
+from typing import BinaryIO, Iterator, List
+
+from app.core.password_policy import BREACHED_LIST_MAGIC, BREACHED_RECORD_SIZE, breached_digest
+
+SHA1_LINE = re.compile(r"^([0-9A-Fa-f]{40})(?::(\d+))?$")
+
+
+def iter_digests(path: str, min_count: int) -> Iterator[bytes]:
+    """입력 파일의 각 줄을 8바이트 지문으로 변환"""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line:
+                continue
+            match = SHA1_LINE.match(line)
+            if match:
+                if match.group(2) is not None and int(match.group(2)) < min_count:
+                    continue
+                yield bytes.fromhex(match.group(1))[:BREACHED_RECORD_SIZE]
+            else:
+                yield breached_digest(line)
+
+
+def _write_run(digests: List[bytes], directory: str) -> str:
+    digests.sort()
+    fd, path = tempfile.mkstemp(dir=directory, suffix=".run")
+    with os.fdopen(fd, "wb") as f:
+        f.write(b"".join(digests))
+    return path
+
+
+def _read_run(f: BinaryIO) -> Iterator[bytes]:
+    while True:
+        record = f.read(BREACHED_RECORD_SIZE)
+        if len(record) < BREACHED_RECORD_SIZE:
+            return
+        yield record
+
+
+def build(inputs: List[str], output: str, chunk: int, min_count: int) -> int:
+    """정렬·중복 제거한 지문 파일을 만들고 기록한 건수 반환"""
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output))) as tmpdir:
+        runs = []
+        buffer: List[bytes] = []
+        for path in inputs:
+            for digest in iter_digests(path, min_count):
+                buffer.append(digest)
+                if len(buffer) >= chunk:
+                    runs.append(_write_run(buffer, tmpdir))
+                    buffer = []
+        if buffer:
+            runs.append(_write_run(buffer, tmpdir))
+
+        files = [open(run, "rb") for run in runs]
+        written = 0
+        previous = None
+        try:
+            with open(output + ".tmp", "wb") as out:
+                out.write(BREACHED_LIST_MAGIC)
+                for digest in heapq.merge(*(_read_run(f) for f in files)):
+                    if digest != previous:
+                        out.write(digest)
+                        written += 1
+                        previous = digest
+        finally:
+            for f in files:
+                f.close()
+        os.replace(output + ".tmp", output)
+    return written
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="유출 비밀번호 정렬 해시 파일 생성")
+    parser.add_argument("inputs", nargs="+", help="평문 또는 SHA1HEX:횟수 형식 목록 파일")
+    parser.add_argument("-o", "--output", required=True, help="출력 파일 경로")
+    parser.add_argument("--chunk", type=int, default=5_000_000, help="한 번에 정렬할 항목 수")
+    parser.add_argument("--min-count", type=int, default=0, help="HIBP 형식에서 이 횟수 미만은 제외")
+    args = parser.parse_args()
+
+    written = build(args.inputs, args.output, args.chunk, args.min_count)
+    print(f"{written} entries written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""읽기 복제본 라우팅 확인
+
+DB 두 개를 기본 DB 와 복제본으로 보고, 같은 계정을 서로 다른 userlevel 로
+넣어 둔 뒤 계정 조회가 어느 쪽에서 읽혔는지로 라우팅을 확인한다.
+복제 설정은 필요 없다 (두 DB 는 서로 독립).
+
+  1. 복제본 정상      -> 복제본에서 읽음
+  2. 지연 임계값 초과 -> 기본 DB 로 대체
+  3. 지연 회복        -> 다시 복제본
+  4. 복제본 연결 실패 -> 기본 DB 로 대체
+
+지연은 임계값을 음수로 바꿔 흉내 낸다 (측정된 지연이 항상 임계값보다 큼).
+기본값은 임시 디렉터리의 SQLite 파일 두 개이고, 로컬 PostgreSQL 두 개로도 실행할 수 있다.
+
+사용 예:
+    PYTHONPATH=. python scripts/check_replica_routing.py
+    PYTHONPATH=. python scripts/check_replica_routing.py \\
+        --primary postgresql+asyncpg://u:p@localhost:5432/vpbx \\
+        --replica postgresql+asyncpg://u:p@localhost:5433/vpbx
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.crud.user_crud import account_lookup_stmt
+from app.db.replicas import Replica, ReplicaRouter
+from app.models.user_model import Account
+
+USERNAME = "replica-check"
+PRIMARY_LEVEL = 1
+REPLICA_LEVEL = 2
+
+
+async def seed(engine, userlevel: int) -> None:
+    """확인용 계정 하나를 userlevel 만 다르게 넣음"""
+    table = Account.__table__
+    async with engine.begin() as conn:
+        await conn.run_sync(Account.metadata.create_all, tables=[table])
+        await conn.execute(table.delete().where(table.c.username == USERNAME))
+        await conn.execute(table.insert(), {
+            "username": USERNAME, "password": "x", "userlevel": userlevel, "onlogin": 0
+        })
+
+
+async def cleanup(engine) -> None:
+    table = Account.__table__
+    async with engine.begin() as conn:
+        await conn.execute(table.delete().where(table.c.username == USERNAME))
+
+
+def unreachable_url(url: str):
+    """연결할 수 없는 같은 종류의 DB URL (파일 DB 는 없는 디렉터리, 서버 DB 는 닫힌 포트)"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        return parsed.set(database=os.path.join(tempfile.gettempdir(), "missing-dir", "none.db"))
+    return parsed.set(host="127.0.0.1", port=1)
+
+
+async def read_from(router: ReplicaRouter) -> str:
+    async with router.connection() as conn:
+        row = (await conn.execute(account_lookup_stmt, {"username": USERNAME})).first()
+    if row is None:
+        return "missing"
+    return "replica" if row.userlevel == REPLICA_LEVEL else "primary"
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="읽기 복제본 라우팅 확인")
+    tmp = tempfile.mkdtemp(prefix="replica-check-")
+    parser.add_argument("--primary", default=f"sqlite+aiosqlite:///{os.path.join(tmp, 'primary.db')}")
+    parser.add_argument("--replica", default=f"sqlite+aiosqlite:///{os.path.join(tmp, 'replica.db')}")
+    parser.add_argument("--max-lag", type=float, default=5.0, help="정상 단계에서 쓸 지연 임계값 (초)")
+    args = parser.parse_args()
+
+    primary = create_async_engine(args.primary)
+    replica_engine = create_async_engine(args.replica)
+    unreachable = create_async_engine(unreachable_url(args.replica))
+    replica = Replica("replica", replica_engine)
+    router = ReplicaRouter(lambda: [replica], primary=lambda: primary, max_lag=args.max_lag, check_timeout=5.0)
+
+    await seed(primary, PRIMARY_LEVEL)
+    await seed(replica_engine, REPLICA_LEVEL)
+
+    steps = []
+
+    async def step(name: str, expected: str) -> None:
+        await router.check()
+        actual = await read_from(router)
+        steps.append({
+            "step": name,
+            "expected": expected,
+            "actual": actual,
+            "ok": actual == expected,
+            "replica": replica.stats(),
+        })
+
+    try:
+        await step("healthy", "replica")
+        router.max_lag = -1.0
+        await step("lagging", "primary")
+        router.max_lag = args.max_lag
+        await step("recovered", "replica")
+        replica.engine = unreachable
+        await step("unreachable", "primary")
+        replica.engine = replica_engine
+    finally:
+        await cleanup(primary)
+        await cleanup(replica_engine)
+        for engine in (primary, replica_engine, unreachable):
+            await engine.dispose()
+
+    ok = all(s["ok"] for s in steps)
+    print(json.dumps({
+        "ok": ok,
+        "steps": steps,
+        "primary_reads": router.primary_reads,
+        "fallbacks": router.fallbacks,
+    }, indent=2, default=str))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
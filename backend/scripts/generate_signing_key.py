@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""JWT 서명 키 생성 (JWT_KEYS_DIR 에 '<kid>.pem' 으로 저장)
+
+키 교체 순서:
+  1. 새 키를 생성한다. 모든 서버의 JWT_KEYS_DIR 에 같은 파일을 둔다 (공유 디렉터리면 한 번).
+     이때부터 JWKS 에 공개되고 검증에 쓰이지만 서명에는 아직 쓰지 않는다.
+  2. 파일 mtime 으로부터 JWT_KEYS_RELOAD_SECONDS + JWT_JWKS_MAX_AGE 초가 지나면 모든
+     워커가 새 키를 읽었고 다른 서비스의 JWKS 캐시도 갱신되었으므로, 각 워커가
+     새 키(이름순 마지막)로 서명을 시작한다. JWT_ACTIVE_KID 로 서명 키를 직접 고정할
+     수도 있는데, 이때는 위 대기 시간을 지난 뒤에 바꿔야 한다.
+  3. 이전 키로 발급된 토큰이 모두 만료된 뒤 (JWT_ACCESS_TOKEN_EXPIRE_MINUTES) 이전 키
+     파일을 지우면 교체가 끝난다.
+키 파일을 복사할 때는 mtime 이 공개 시각이므로 보존하지 말고 (cp -p 금지) 새로 만든다.
+
+사용 예:
+    PYTHONPATH=. python scripts/generate_signing_key.py /etc/vpbx/jwt-keys --algorithm RS256
+"""
+import argparse
+import os
+import sys
+from datetime import datetime, timezone
+
+from app.core.signing_keys import ASYMMETRIC_ALGORITHMS, generate_private_key, private_key_pem
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="JWT 서명 키 생성")
+    parser.add_argument("keys_dir", help="JWT_KEYS_DIR 경로")
+    parser.add_argument("--algorithm", choices=ASYMMETRIC_ALGORITHMS, default="RS256")
+    parser.add_argument("--kid", help="키 ID (기본값: 생성 시각, 예: 20260101T000000Z)")
+    args = parser.parse_args()
+
+    kid = args.kid or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = os.path.join(args.keys_dir, f"{kid}.pem")
+    if os.path.exists(path):
+        print(f"이미 존재하는 키입니다: {path}", file=sys.stderr)
+        return 1
+
+    os.makedirs(args.keys_dir, exist_ok=True)
+    # 임시 파일에 쓴 뒤 옮겨서 서버가 쓰다 만 파일을 읽지 않도록 함
+    tmp_path = os.path.join(args.keys_dir, f".{kid}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(private_key_pem(generate_private_key(args.algorithm)))
+    os.replace(tmp_path, path)
+    print(f"{args.algorithm} key written: {path} (kid={kid})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""CSV/JSONL 파일로 계정 대량 등록
+
+파일을 한 줄씩 읽어 /users/bulk 와 같은 방식(병렬 해싱 + 배치 INSERT)으로
+table_statusaccount 에 저장한다. 결과 보고서는 JSON 으로 출력한다.
+
+CSV 는 첫 줄에 username,password[,userlevel] 헤더가 있어야 하고,
+JSONL 은 줄마다 {"username": ..., "password": ..., "userlevel": ...} 객체이다.
+
+사용 예:
+    PYTHONPATH=. python scripts/import_accounts.py tenant_a.csv --on-conflict update
+    cat accounts.jsonl | PYTHONPATH=. python scripts/import_accounts.py - --format jsonl
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from app.crud.provisioning import parse_csv, parse_jsonl, provision_accounts
+from app.db.db_config import AsyncSessionLocal, init_engine
+
+
+async def read_lines(stream):
+    """파일 객체를 한 줄씩 비동기 이터레이터로 변환"""
+    for line in stream:
+        yield line.rstrip("\r\n")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="CSV/JSONL 계정 대량 등록")
+    parser.add_argument("path", help="입력 파일 경로 (- 이면 표준 입력)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="입력 형식 (기본값: 확장자로 판단)")
+    parser.add_argument("--on-conflict", choices=["skip", "update"], default="skip")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--skip-policy", action="store_true", help="비밀번호 정책 검사 생략")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.endswith(".csv") else "jsonl")
+    parse = parse_csv if fmt == "csv" else parse_jsonl
+    stream = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8")
+    engine = init_engine()
+
+    try:
+        async with AsyncSessionLocal() as db:
+            report = await provision_accounts(
+                db,
+                parse(read_lines(stream)),
+                on_conflict=args.on_conflict,
+                batch_size=args.batch_size,
+                enforce_policy=not args.skip_policy
+            )
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        await engine.dispose()
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""인증/사용자 API 부하 테스트
+
+/auth/login, /auth/verify, /auth/logout, /users/update 를 요청 비율(mix)에 따라
+동시에 호출하고 엔드포인트별 p50/p95/p99 지연 시간, 처리량, 오류율을 JSON 으로 출력한다.
+
+- closed 루프: 가상 사용자 N 명이 응답을 받자마자 다음 요청을 보냄 (동시성 고정)
+- open 루프: 응답과 무관하게 초당 R 건을 정해진 시각에 보냄 (도착률 고정).
+  지연 시간은 예정 시각부터 재므로 서버가 밀리면 대기 시간도 포함된다.
+
+--in-process 를 주면 서버를 띄우지 않고 앱을 같은 프로세스에서 호출하며,
+PostgreSQL 대신 SQLite(aiosqlite) 파일/메모리 DB 에 테스트 계정을 만들어 사용한다.
+
+사용 예:
+    PYTHONPATH=. python scripts/load_test.py --in-process --mode closed -c 20 -d 30
+    PYTHONPATH=. python scripts/load_test.py --base-url http://localhost:8000 \\
+        --mode open --rate 200 -d 60 --mix login=1,verify=8,logout=1,update=0
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import bcrypt
+import httpx
+
+ENDPOINTS = ("login", "verify", "logout", "update")
+DEFAULT_MIX = "login=1,verify=6,logout=1,update=1"
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """'login=1,verify=6' 형식을 {엔드포인트: 가중치} 로 변환"""
+    mix = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"알 수 없는 엔드포인트입니다: {name}")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("요청 비율이 모두 0 입니다")
+    return mix
+
+
+def percentile(samples: List[float], ratio: float) -> float:
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, int(len(samples) * ratio))
+    return samples[index]
+
+
+class VirtualUser:
+    """계정 하나와 현재 토큰 (로그인 세션은 계정당 하나만 유지되므로 사용자마다 계정을 나눔)"""
+
+    def __init__(self, username: str, password: str):
+        self.username = username
+        self.password = password
+        self.token: Optional[str] = None
+
+
+class LoadRecorder:
+    """엔드포인트별 지연 시간과 상태 코드 집계"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, endpoint: str, latency: float, status) -> None:
+        self.latencies[endpoint].append(latency)
+        self.statuses[endpoint][str(status)] += 1
+        if not isinstance(status, int) or status >= 400:
+            self.errors[endpoint] += 1
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        total = errors = 0
+        for endpoint, samples in self.latencies.items():
+            samples.sort()
+            count = len(samples)
+            total += count
+            errors += self.errors[endpoint]
+            endpoints[endpoint] = {
+                "requests": count,
+                "errors": self.errors[endpoint],
+                "error_rate": round(self.errors[endpoint] / count, 4),
+                "throughput_rps": round(count / elapsed, 2),
+                "latency_ms": {
+                    "mean": round(sum(samples) / count * 1000, 3),
+                    "p50": round(percentile(samples, 0.50) * 1000, 3),
+                    "p95": round(percentile(samples, 0.95) * 1000, 3),
+                    "p99": round(percentile(samples, 0.99) * 1000, 3),
+                    "max": round(samples[-1] * 1000, 3),
+                },
+                "status": dict(self.statuses[endpoint]),
+            }
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "requests": total,
+            "errors": errors,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+class LoadRunner:
+    """요청 비율에 따라 가상 사용자의 다음 요청을 고르고 실행"""
+
+    def __init__(self, client: httpx.AsyncClient, mix: Dict[str, float], recorder: LoadRecorder):
+        self.client = client
+        self.names = list(mix)
+        self.weights = list(mix.values())
+        self.recorder = recorder
+
+    async def step(self, user: VirtualUser, started: Optional[float] = None) -> None:
+        """요청 한 건 실행 (토큰이 없으면 먼저 로그인)"""
+        endpoint = "login" if user.token is None else random.choices(self.names, self.weights)[0]
+        if started is None:
+            started = time.perf_counter()
+        try:
+            status = await getattr(self, f"_{endpoint}")(user)
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        self.recorder.record(endpoint, time.perf_counter() - started, status)
+
+    def _auth(self, user: VirtualUser) -> dict:
+        return {"Authorization": f"Bearer {user.token}"}
+
+    async def _login(self, user: VirtualUser):
+        response = await self.client.post(
+            "/auth/login", json={"username": user.username, "password": user.password}
+        )
+        if response.status_code == 200:
+            user.token = response.json()["access_token"]
+        return response.status_code
+
+    async def _verify(self, user: VirtualUser):
+        response = await self.client.get("/auth/verify", headers=self._auth(user))
+        if response.status_code == 401:
+            user.token = None
+        return response.status_code
+
+    async def _logout(self, user: VirtualUser):
+        response = await self.client.post("/auth/logout", headers=self._auth(user))
+        user.token = None
+        return response.status_code
+
+    async def _update(self, user: VirtualUser):
+        # 같은 비밀번호로 바꿔 이후 로그인이 계속 성공하도록 함
+        response = await self.client.put(
+            "/users/update", json={"password": user.password}, headers=self._auth(user)
+        )
+        # 비밀번호를 바꾸면 기존 토큰이 폐기되므로 다음 요청에서 다시 로그인
+        if response.status_code in (200, 401):
+            user.token = None
+        return response.status_code
+
+
+async def run_closed(runner: LoadRunner, users: List[VirtualUser], duration: float) -> None:
+    """가상 사용자마다 요청을 연속으로 보냄"""
+    deadline = time.perf_counter() + duration
+
+    async def worker(user: VirtualUser):
+        while time.perf_counter() < deadline:
+            await runner.step(user)
+
+    await asyncio.gather(*(worker(user) for user in users))
+
+
+async def run_open(runner: LoadRunner, users: List[VirtualUser], duration: float, rate: float) -> None:
+    """초당 rate 건을 정해진 시각에 보냄 (쉬는 가상 사용자가 없으면 대기 시간도 지연에 포함)"""
+    idle: asyncio.Queue = asyncio.Queue()
+    for user in users:
+        idle.put_nowait(user)
+
+    async def arrival(scheduled: float):
+        user = await idle.get()
+        try:
+            await runner.step(user, started=scheduled)
+        finally:
+            idle.put_nowait(user)
+
+    tasks = []
+    started = time.perf_counter()
+    interval = 1.0 / rate
+    count = int(duration * rate)
+    for i in range(count):
+        scheduled = started + i * interval
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(arrival(scheduled)))
+    await asyncio.gather(*tasks)
+
+
+async def setup_in_process(users: List[VirtualUser], database_url: str, throttle: bool = False):
+    """앱을 같은 프로세스에서 띄우고 get_db 를 SQLite 로 교체한 클라이언트 반환"""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from app.core.hashing import password_hasher
+    from app.core.rate_limit import login_throttle
+    from app.db.db_config import get_db
+    from app.models.user_model import Account, Base
+    from main import app
+
+    # 부하 테스트 결과 JSON 과 앱 로그가 섞이지 않도록 경고 이상만 출력
+    logging.getLogger().setLevel(logging.WARNING)
+    # 모든 요청이 같은 클라이언트 주소에서 오므로 IP 제한은 끔 (--throttle 로 유지)
+    login_throttle.enabled = throttle
+
+    engine_options = {}
+    if database_url.endswith(":memory:"):
+        # 메모리 DB 는 연결마다 따로 생기므로 연결 하나를 공유
+        engine_options = {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+    engine = create_async_engine(database_url, **engine_options)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[Account.__table__])
+        await conn.execute(Account.__table__.delete())
+        # 모든 계정이 같은 비밀번호를 쓰므로 해시는 한 번만 계산
+        hashed = bcrypt.hashpw(users[0].password.encode("utf-8"), bcrypt.gensalt(password_hasher.rounds)).decode("utf-8")
+        await conn.execute(
+            Account.__table__.insert(),
+            [{"username": u.username, "password": hashed, "userlevel": 1, "onlogin": 0} for u in users]
+        )
+
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def get_test_db():
+        async with session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    app.dependency_overrides[get_db] = get_test_db
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://loadtest"), engine
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="인증/사용자 API 부하 테스트")
+    parser.add_argument("--mode", choices=("closed", "open"), default="closed")
+    parser.add_argument("-c", "--concurrency", type=int, default=10, help="가상 사용자(계정) 수")
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="실행 시간 (초)")
+    parser.add_argument("--rate", type=float, default=50.0, help="open 루프 초당 요청 수")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"요청 비율 (기본값: {DEFAULT_MIX})")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--user-prefix", default="load", help="테스트 계정 이름 접두사")
+    parser.add_argument("--password", default="Load!test1", help="테스트 계정 비밀번호")
+    parser.add_argument("--in-process", action="store_true", help="앱을 같은 프로세스에서 SQLite 로 실행")
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///:memory:",
+                        help="--in-process 에서 사용할 DB URL")
+    parser.add_argument("--throttle", action="store_true", help="--in-process 에서 로그인 시도 제한 유지")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=None, help="요청 선택 난수 시드")
+    parser.add_argument("-o", "--output", help="결과 JSON 파일 (기본값: 표준 출력)")
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    users = [VirtualUser(f"{args.user_prefix}{i:05d}", args.password) for i in range(args.concurrency)]
+
+    engine = None
+    if args.in_process:
+        client, engine = await setup_in_process(users, args.database_url, args.throttle)
+    else:
+        # 서버 모드에서는 계정이 미리 만들어져 있어야 함 (scripts/import_accounts.py)
+        client = httpx.AsyncClient(
+            base_url=args.base_url,
+            limits=httpx.Limits(max_connections=args.concurrency),
+        )
+    client.timeout = httpx.Timeout(args.timeout)
+
+    recorder = LoadRecorder()
+    runner = LoadRunner(client, mix, recorder)
+    started = time.perf_counter()
+    try:
+        if args.mode == "closed":
+            await run_closed(runner, users, args.duration)
+        else:
+            await run_open(runner, users, args.duration, args.rate)
+    finally:
+        elapsed = time.perf_counter() - started
+        await client.aclose()
+        if engine is not None:
+            await engine.dispose()
+
+    report = {
+        "config": {
+            "mode": args.mode,
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "rate": args.rate if args.mode == "open" else None,
+            "mix": mix,
+            "target": "in-process" if args.in_process else args.base_url,
+        },
+        **recorder.report(elapsed),
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 1 if report["requests"] and report["error_rate"] == 1.0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
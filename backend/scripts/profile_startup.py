@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""서버 시작 시간 프로파일링
+
+`python -X importtime -c "import main"` 을 별도 프로세스로 실행해 모듈별 import 시간을
+집계하고, --lifespan 을 주면 lifespan 시작 단계와 워밍업 단계별 시간도 잰다.
+
+사용 예:
+    PYTHONPATH=. python scripts/profile_startup.py --top 20
+    PYTHONPATH=. python scripts/profile_startup.py --lifespan
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+# "import time:       123 |       4567 |   package.module"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def profile_imports(module: str) -> dict:
+    """-X importtime 출력에서 모듈별 self/cumulative 시간(ms) 집계"""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=dict(os.environ)
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({
+                "module": name,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": len(indent) // 2,
+            })
+
+    # 최상위 패키지별 self 시간 합계
+    packages = defaultdict(float)
+    for entry in modules:
+        packages[entry["module"].split(".")[0]] += entry["self_ms"]
+
+    top = next((m for m in modules if m["module"] == module), None)
+    return {
+        "process_wall_ms": round(wall_ms, 1),
+        "import_ms": round(top["cumulative_ms"], 1) if top else None,
+        "module_count": len(modules),
+        "modules": modules,
+        "packages": {name: round(ms, 1) for name, ms in packages.items()},
+    }
+
+
+async def profile_lifespan(timeout: float) -> dict:
+    """lifespan 시작부터 워밍업 완료까지 단계별 시간"""
+    import main
+    from app.core.warmup import warmup_state
+
+    started = time.perf_counter()
+    async with main.lifespan(main.app):
+        startup_ms = (time.perf_counter() - started) * 1000
+        deadline = time.monotonic() + timeout
+        while not warmup_state.ready and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        ready_ms = (time.perf_counter() - started) * 1000
+        summary = warmup_state.summary()
+    return {
+        "startup_ms": round(startup_ms, 1),
+        "ready_ms": round(ready_ms, 1) if summary["ready"] else None,
+        "warmup": summary,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서버 시작 시간 프로파일링")
+    parser.add_argument("--module", default="main", help="import 할 모듈 (기본: main)")
+    parser.add_argument("--top", type=int, default=15, help="출력할 상위 모듈/패키지 수")
+    parser.add_argument("--lifespan", action="store_true", help="lifespan 시작과 워밍업 시간도 측정")
+    parser.add_argument("--timeout", type=float, default=30.0, help="워밍업 대기 최대 초")
+    args = parser.parse_args()
+
+    imports = profile_imports(args.module)
+    report = {
+        "process_wall_ms": imports["process_wall_ms"],
+        "import_ms": imports["import_ms"],
+        "module_count": imports["module_count"],
+        "top_cumulative": [
+            {"module": m["module"], "ms": round(m["cumulative_ms"], 1)}
+            for m in sorted(imports["modules"], key=lambda m: m["cumulative_ms"], reverse=True)[:args.top]
+        ],
+        "top_self": [
+            {"module": m["module"], "ms": round(m["self_ms"], 1)}
+            for m in sorted(imports["modules"], key=lambda m: m["self_ms"], reverse=True)[:args.top]
+        ],
+        "top_packages": dict(
+            sorted(imports["packages"].items(), key=lambda item: item[1], reverse=True)[:args.top]
+        ),
+    }
+    if args.lifespan:
+        report["lifespan"] = asyncio.run(profile_lifespan(args.timeout))
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
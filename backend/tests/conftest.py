@@ -0,0 +1,19 @@
+import os
+import sys
+
+# 앱 모듈은 import 시점에 설정을 읽으므로 필수 환경 변수를 먼저 채움
+for name, value in {
+    "DB_NAME": "test",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "JWT_SECRET_KEY": "test-secret",
+    "JWT_ALGORITHM": "HS256",
+    "JWT_ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "API_HOST": "127.0.0.1",
+    "API_PORT": "8000",
+}.items():
+    os.environ.setdefault(name, value)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
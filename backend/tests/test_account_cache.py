@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from app.crud.account_cache import AccountCache, CachedAccount
+
+
+def account(password: str = "hash") -> CachedAccount:
+    return CachedAccount("alice", password, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_invalidate_forces_reload():
+    cache = AccountCache(ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return account(f"hash{len(calls)}")
+
+    assert (await cache.get("alice", loader)).password == "hash1"
+    assert (await cache.get("alice", loader)).password == "hash1"
+    cache.invalidate("alice")
+    assert (await cache.get("alice", loader)).password == "hash2"
+    assert len(calls) == 2
+    assert cache.invalidations == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_during_load_does_not_cache_stale_result():
+    cache = AccountCache(ttl=60)
+    release = asyncio.Event()
+
+    async def slow_loader():
+        await release.wait()
+        return account("stale")
+
+    pending = asyncio.create_task(cache.get("alice", slow_loader))
+    await asyncio.sleep(0)
+    cache.invalidate("alice")
+    release.set()
+    assert (await pending).password == "stale"
+
+    async def fresh_loader():
+        return account("fresh")
+
+    assert (await cache.get("alice", fresh_loader)).password == "fresh"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    cache = AccountCache(ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return account()
+
+    results = await asyncio.gather(*(cache.get("alice", loader) for _ in range(5)))
+    assert all(result == account() for result in results)
+    assert len(calls) == 1
+    assert cache.coalesced == 4
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl():
+    cache = AccountCache(ttl=0.05, negative_ttl=0.05)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return None
+
+    assert await cache.get("ghost", loader) is None
+    assert await cache.get("ghost", loader) is None
+    await asyncio.sleep(0.06)
+    await cache.get("ghost", loader)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_update_replaces_fields_of_cached_entry_only():
+    cache = AccountCache(ttl=60)
+
+    async def loader():
+        return account()
+
+    cache.update("alice", onlogin=1)
+    await cache.get("alice", loader)
+    cache.update("alice", onlogin=1)
+    assert (await cache.get("alice", loader)).onlogin == 1
@@ -0,0 +1,54 @@
+import pytest
+from fastapi import HTTPException
+from httpx import ASGITransport, AsyncClient
+
+from app.core import deps
+from app.core.config import settings
+from app.crud.account_cache import CachedAccount
+from main import app
+
+
+def fake_account(userlevel):
+    async def lookup(username):
+        return CachedAccount(username, "hash", userlevel, 0)
+    return lookup
+
+
+@pytest.mark.asyncio
+async def test_admin_user_requires_admin_userlevel(monkeypatch):
+    monkeypatch.setattr(deps, "_current_account", fake_account(settings.ADMIN_USERLEVEL))
+    assert await deps.get_admin_user("root") == "root"
+
+    monkeypatch.setattr(deps, "_current_account", fake_account(1))
+    with pytest.raises(HTTPException) as exc:
+        await deps.get_admin_user("alice")
+    assert exc.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_bulk_provision_forbidden_for_regular_user(monkeypatch):
+    monkeypatch.setattr(deps, "_current_account", fake_account(1))
+    app.dependency_overrides[deps.get_current_user] = lambda: "alice"
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post(
+                "/users/bulk", content=b"username,password\n",
+                headers={"content-type": "text/csv", "Authorization": "Bearer token"}
+            )
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/users", "/users/password-costs"])
+async def test_account_reports_forbidden_for_regular_user(monkeypatch, path):
+    monkeypatch.setattr(deps, "_current_account", fake_account(1))
+    app.dependency_overrides[deps.get_current_user] = lambda: "alice"
+    app.dependency_overrides[deps.get_current_tenant] = lambda: None
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get(path, headers={"Authorization": "Bearer token"})
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 403
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api.endpoints import audit as audit_endpoint
+from app.core import deps
+from app.core.audit import AuditRecord, AuditTrail, JsonlAuditSink
+from app.core.config import settings
+from app.crud.account_cache import CachedAccount
+from main import app
+
+
+class MemorySink:
+    def __init__(self):
+        self.fail = False
+        self.records = []
+        self.queries = []
+
+    async def write(self, records):
+        if self.fail:
+            raise ConnectionError("sink down")
+        self.records.extend(records)
+
+    async def query(self, start, end, username, event, limit):
+        self.queries.append(username)
+        return [r for r in self.records if username is None or r.username == username][:limit]
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_requeues_in_order():
+    sink = MemorySink()
+    trail = AuditTrail(sink=sink, batch_size=2)
+    for i in range(3):
+        trail.record("login", "success", f"u{i}")
+    sink.fail = True
+    assert await trail.flush() == 0
+    assert trail.failures == 1
+    assert trail.stats()["queued"] == 3
+
+    trail.record("logout", "success", "u3")
+    sink.fail = False
+    assert await trail.flush() == 4
+    assert [r.username for r in sink.records] == ["u0", "u1", "u2", "u3"]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_new_records():
+    trail = AuditTrail(sink=MemorySink(), max_queue=2)
+    for i in range(3):
+        trail.record("login", "success", f"u{i}")
+    assert trail.dropped == 1
+    assert trail.stats()["queued"] == 2
+
+
+@pytest.mark.asyncio
+async def test_requeue_drops_overflow_when_queue_refilled():
+    sink = MemorySink()
+    trail = AuditTrail(sink=sink, max_queue=3, batch_size=3)
+    for i in range(3):
+        trail.record("login", "success", f"u{i}")
+    sink.fail = True
+
+    async def refill(records):
+        # 저장 중에 새 기록이 들어와 큐가 다시 참
+        trail.record("login", "success", "late")
+        raise ConnectionError("sink down")
+
+    sink.write = refill
+    await trail.flush()
+    assert trail.stats()["queued"] == 3
+    assert trail.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_jsonl_sink_round_trip(tmp_path):
+    trail = AuditTrail(sink=JsonlAuditSink(str(tmp_path)))
+    trail.record("login", "success", "alice")
+    trail.record("login", "invalid_password", "bob")
+    records = await trail.query(username="alice")
+    assert [(r.username, r.outcome) for r in records] == [("alice", "success")]
+
+
+
+@pytest.mark.asyncio
+async def test_jsonl_sink_filters_days_in_utc(tmp_path):
+    sink = JsonlAuditSink(str(tmp_path))
+    occurred_at = datetime(2026, 10, 17, 20, 0, tzinfo=timezone.utc)
+    await sink.write([AuditRecord(occurred_at, "login", "success", "alice", None, None)])
+    trail = AuditTrail(sink=sink)
+    # 같은 시각의 다른 시간대 표현 (한국 시간으로는 10월 18일)
+    kst = timezone(timedelta(hours=9))
+    records = await trail.query(start=datetime(2026, 10, 18, 4, 0, tzinfo=kst))
+    assert [r.occurred_at for r in records] == [occurred_at]
+    assert await trail.query(end=datetime(2026, 10, 18, 4, 0, tzinfo=kst)) == []
+
+
+async def get_audit(monkeypatch, userlevel, params):
+    sink = MemorySink()
+    monkeypatch.setattr(audit_endpoint, "audit_trail", AuditTrail(sink=sink))
+
+    async def lookup(username):
+        return CachedAccount(username, "hash", userlevel, 0)
+
+    monkeypatch.setattr(deps, "_current_account", lookup)
+    app.dependency_overrides[deps.get_current_user] = lambda: "alice"
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/audit", params=params)
+    finally:
+        app.dependency_overrides.clear()
+    return response, sink
+
+
+@pytest.mark.asyncio
+async def test_regular_user_sees_only_own_records(monkeypatch):
+    response, sink = await get_audit(monkeypatch, 1, {})
+    assert response.status_code == 200
+    assert sink.queries == ["alice"]
+
+    response, _ = await get_audit(monkeypatch, 1, {"username": "bob"})
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_admin_may_query_any_user(monkeypatch):
+    response, sink = await get_audit(monkeypatch, settings.ADMIN_USERLEVEL, {"username": "bob"})
+    assert response.status_code == 200
+    response, sink = await get_audit(monkeypatch, settings.ADMIN_USERLEVEL, {})
+    assert sink.queries == [None]
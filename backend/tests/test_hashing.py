@@ -0,0 +1,56 @@
+import pytest
+
+from app.api.endpoints import users
+from app.core import hashing
+from app.core.config import settings
+
+
+@pytest.fixture
+def calibration(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_TARGET_VERIFY_MS", 250.0)
+    monkeypatch.setattr(settings, "BCRYPT_CALIBRATION_PATH", str(tmp_path / "bcrypt.json"))
+    monkeypatch.setattr(hashing.password_hasher, "rounds", hashing.password_hasher.rounds)
+    measured = []
+
+    async def fake_calibrate(target_ms, min_rounds, max_rounds):
+        measured.append(target_ms)
+        hashing.password_hasher.rounds = 11
+        return 11
+
+    monkeypatch.setattr(hashing.password_hasher, "calibrate", fake_calibrate)
+    return measured
+
+
+@pytest.mark.asyncio
+async def test_calibration_measured_once_and_reused(calibration):
+    await hashing.calibrate_password_hasher()
+    hashing.password_hasher.rounds = 12
+    await hashing.calibrate_password_hasher()
+    assert calibration == [250.0]
+    assert hashing.password_hasher.rounds == 11
+
+
+@pytest.mark.asyncio
+async def test_calibration_repeated_when_target_changes(calibration, monkeypatch):
+    await hashing.calibrate_password_hasher()
+    monkeypatch.setattr(settings, "BCRYPT_TARGET_VERIFY_MS", 100.0)
+    await hashing.calibrate_password_hasher()
+    assert calibration == [250.0, 100.0]
+
+
+def test_needs_rehash_only_for_other_bcrypt_costs():
+    hasher = hashing.PasswordHasher(rounds=12)
+    assert hasher.needs_rehash("$2b$10$" + "a" * 53)
+    assert not hasher.needs_rehash("$2b$12$" + "a" * 53)
+    assert not hasher.needs_rehash("plain-md5-digest")
+
+
+@pytest.mark.asyncio
+async def test_cost_report_excludes_unknown_hashes_from_outdated(monkeypatch):
+    async def fake_counts(db):
+        return {"10": 3, f"{hashing.password_hasher.rounds:02d}": 5, None: 2, "x": 1}
+
+    monkeypatch.setattr(users, "count_password_costs", fake_counts)
+    report = await users.password_cost_report(current_user="root", db=None)
+    assert report["costs"]["unknown"] == 3
+    assert report["outdated"] == 3
@@ -0,0 +1,50 @@
+import random
+import re
+
+import pytest
+
+from app.core.password_policy import PasswordPolicy
+
+COMMON_PATTERNS = ["qwerty", "asdfgh", "zxcvbn", "password", "admin", "123456", "abcdef"]
+
+
+def legacy_validate(password):
+    # 이전 PasswordValidator.validate 의 규칙 ('-', '_' 를 특수문자로 인정하는 것만 다름)
+    if len(password) < 8:
+        return False, "비밀번호는 최소 8자 이상이어야 합니다"
+    if len(password) > 20:
+        return False, "비밀번호는 20자를 초과할 수 없습니다"
+    if " " in password:
+        return False, "비밀번호에 공백을 포함할 수 없습니다"
+    if not re.search(r"[A-Z]", password):
+        return False, "비밀번호는 최소 1개의 대문자를 포함해야 합니다"
+    if not re.search(r"[a-z]", password):
+        return False, "비밀번호는 최소 1개의 소문자를 포함해야 합니다"
+    if not re.search(r"\d", password):
+        return False, "비밀번호는 최소 1개의 숫자를 포함해야 합니다"
+    if not re.search(r'[!@#$%^&*(),.?":{}|<>\-_]', password):
+        return False, "비밀번호는 최소 1개의 특수문자를 포함해야 합니다"
+    if re.search(r"\d{3,}", password):
+        return False, "연속된 숫자는 사용할 수 없습니다"
+    lower_password = password.lower()
+    if any(pattern in lower_password for pattern in COMMON_PATTERNS):
+        return False, "일반적인 패턴이 포함된 비밀번호는 사용할 수 없습니다"
+    return True, ""
+
+
+@pytest.fixture
+def policy():
+    return PasswordPolicy(forbidden_patterns=COMMON_PATTERNS)
+
+
+@pytest.mark.parametrize("password", ["Ävbnmkwq7!z", "ÄVBNMKWQ7!z", "Avbnmkwq²!z", "Avbnm\tkwq7!"])
+def test_non_ascii_classes_match_legacy_rules(policy, password):
+    assert policy.validate(password) == legacy_validate(password)
+
+
+def test_matches_legacy_rules_on_random_input(policy):
+    rng = random.Random(16)
+    alphabet = "aAzZqwertyadmin0123456789!@-_ \tÄäÉé²٣"
+    for _ in range(20000):
+        password = "".join(rng.choice(alphabet) for _ in range(rng.randint(6, 22)))
+        assert policy.validate(password) == legacy_validate(password), password
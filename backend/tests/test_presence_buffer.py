@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.crud.presence_buffer import PresenceBuffer
+from app.crud.user_crud import apply_presence
+from app.models.presence_model import PresenceChange
+from app.models.user_model import Account
+
+
+class FlakyWriter:
+    def __init__(self):
+        self.fail = True
+        self.batches = []
+
+    async def __call__(self, rows):
+        if self.fail:
+            raise ConnectionError("db down")
+        self.batches.append(sorted(rows))
+        return len(rows)
+
+
+@pytest.mark.asyncio
+async def test_record_coalesces_to_latest_value():
+    writer = FlakyWriter()
+    writer.fail = False
+    buffer = PresenceBuffer(writer=writer)
+    buffer.record("alice", 1, changed_at=1.0)
+    buffer.record("alice", 0, changed_at=2.0)
+    buffer.record("bob", 1, changed_at=3.0)
+    assert await buffer.flush() == 2
+    assert writer.batches == [[("alice", 0, 2.0), ("bob", 1, 3.0)]]
+    assert buffer.coalesced == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_requeues_without_overwriting_newer_values():
+    writer = FlakyWriter()
+    buffer = PresenceBuffer(writer=writer)
+    buffer.record("alice", 1, changed_at=1.0)
+    buffer.record("bob", 1, changed_at=1.0)
+    assert await buffer.flush() == 0
+    assert buffer.failures == 1
+    assert buffer.stats()["pending"] == 2
+
+    # 실패 뒤에 들어온 더 새 값은 되돌린 값으로 덮어쓰지 않음
+    buffer.record("alice", 0, changed_at=2.0)
+    writer.fail = False
+    assert await buffer.flush() == 2
+    assert writer.batches == [[("alice", 0, 2.0), ("bob", 1, 1.0)]]
+    assert buffer.stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_splits_batches():
+    writer = FlakyWriter()
+    writer.fail = False
+    buffer = PresenceBuffer(writer=writer, batch_size=2)
+    for i in range(5):
+        buffer.record(f"u{i}", 1, changed_at=1.0)
+    assert await buffer.flush() == 5
+    assert [len(batch) for batch in writer.batches] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_apply_presence_ignores_older_changes(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'presence.db'}")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Account.metadata.create_all, tables=[Account.__table__, PresenceChange.__table__]
+            )
+            await conn.execute(Account.__table__.insert(), [
+                {"username": "alice", "password": "x", "userlevel": 1, "onlogin": 0},
+                {"username": "bob", "password": "x", "userlevel": 1, "onlogin": 0},
+            ])
+
+        async with AsyncSession(engine) as db:
+            # 워커 B 의 로그아웃(시각 2) 이 먼저 저장되고, 워커 A 의 로그인(시각 1) 이 늦게 도착
+            assert await apply_presence(db, [("alice", 0, 2.0), ("bob", 1, 2.0)]) == 2
+            await apply_presence(db, [("alice", 1, 1.0), ("bob", 0, 3.0)])
+            rows = dict((await db.execute(
+                select(Account.__table__.c.username, Account.__table__.c.onlogin)
+            )).all())
+        assert rows == {"alice": 0, "bob": 0}
+    finally:
+        await engine.dispose()
@@ -0,0 +1,40 @@
+import pytest
+
+from app.crud.provisioning import parse_csv
+
+
+async def collect(lines):
+    async def stream():
+        for line in lines:
+            yield line
+    return [row async for row in parse_csv(stream())]
+
+
+@pytest.mark.asyncio
+async def test_quoted_field_may_span_lines():
+    rows = await collect([
+        "username,password,userlevel",
+        'alice,"first',
+        '',
+        'last",1',
+        "bob,pw,1",
+    ])
+    assert rows == [
+        (2, {"username": "alice", "password": "first\n\nlast", "userlevel": "1"}, None),
+        (5, {"username": "bob", "password": "pw", "userlevel": "1"}, None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_blank_lines_skipped_and_column_mismatch_reported():
+    rows = await collect(["username,password", "", "a,1,2", 'b,"x""y"', "   "])
+    assert rows == [
+        (3, None, "컬럼 수가 헤더와 다릅니다"),
+        (4, {"username": "b", "password": 'x"y'}, None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unterminated_quote_reported_at_end():
+    rows = await collect(["username,password", 'a,"open'])
+    assert rows == [(2, None, "CSV 파싱 오류: 따옴표가 닫히지 않았습니다")]
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.core.rate_limit import LoginThrottle, TokenBucketLimiter
+
+
+def login_request(ip):
+    return Request({"type": "http", "headers": [], "client": (ip, 1234)})
+
+
+def test_bucket_refills_at_configured_rate():
+    limiter = TokenBucketLimiter(capacity=2, per_minute=60)
+    assert limiter.consume("ip", now=0.0) == 0.0
+    assert limiter.consume("ip", now=0.0) == 0.0
+    assert limiter.consume("ip", now=0.0) == pytest.approx(1.0)
+    assert limiter.retry_after("ip", now=0.5) == pytest.approx(0.5)
+    assert limiter.consume("ip", now=1.0) == 0.0
+    assert limiter.consume("ip", now=1.0) == pytest.approx(1.0)
+
+
+def test_refill_caps_at_capacity():
+    limiter = TokenBucketLimiter(capacity=2, per_minute=60)
+    limiter.consume("ip", now=0.0)
+    for _ in range(2):
+        assert limiter.consume("ip", now=100.0) == 0.0
+    assert limiter.consume("ip", now=100.0) > 0
+
+
+def test_full_buckets_are_purged():
+    limiter = TokenBucketLimiter(capacity=1, per_minute=60)
+    limiter.consume("a", now=0.0)
+    limiter.consume("b", now=0.5)
+    limiter.consume("c", now=1.2)
+    assert len(limiter) == 2  # a 는 1초 뒤 다시 가득 차 제거됨
+
+
+def test_flooding_distinct_keys_does_not_evict_drained_bucket():
+    limiter = TokenBucketLimiter(capacity=1, per_minute=6, max_keys=3)
+    assert limiter.consume("victim", now=0.0) == 0.0
+    assert limiter.consume("victim", now=0.0) > 0
+
+    # 다른 키로 테이블을 채워도 소진된 버킷은 남고, 자리가 없으면 새 키를 거절
+    assert limiter.consume("flood-1", now=1.0) == 0.0
+    assert limiter.consume("flood-2", now=1.0) == 0.0
+    assert limiter.consume("flood-3", now=1.0) == pytest.approx(9.0)
+    assert limiter.retry_after("flood-4", now=1.0) == pytest.approx(9.0)
+    assert limiter.overflows == 2
+    assert limiter.consume("victim", now=1.0) > 0
+
+    # 가장 오래된 버킷이 다시 차면 자리가 남
+    assert limiter.consume("flood-3", now=11.5) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_guesses_are_limited_before_verification():
+    throttle = LoginThrottle(
+        ip_limiter=TokenBucketLimiter(capacity=100, per_minute=60),
+        username_limiter=TokenBucketLimiter(capacity=3, per_minute=1)
+    )
+    verified = 0
+
+    async def guess(i):
+        nonlocal verified
+        throttle.check(login_request(f"10.0.0.{i}"), "Victim")
+        await asyncio.sleep(0.01)  # bcrypt 검증 중
+        verified += 1
+
+    results = await asyncio.gather(*(guess(i) for i in range(20)), return_exceptions=True)
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert verified == 3
+    assert len(rejected) == 17 and all(r.status_code == 429 for r in rejected)
+    assert throttle.rejected_username == 17
+
+
+def test_success_resets_username_bucket():
+    throttle = LoginThrottle(
+        ip_limiter=TokenBucketLimiter(capacity=100, per_minute=60),
+        username_limiter=TokenBucketLimiter(capacity=2, per_minute=1)
+    )
+    for _ in range(2):
+        throttle.check(login_request("10.0.0.1"), "user")
+    throttle.record_success("user")
+    for _ in range(2):
+        throttle.check(login_request("10.0.0.1"), "USER")
+    with pytest.raises(HTTPException):
+        throttle.check(login_request("10.0.0.1"), "user")
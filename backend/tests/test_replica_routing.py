@@ -0,0 +1,99 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.crud.user_crud import account_lookup_stmt
+from app.db.replicas import Replica, ReplicaNotStreaming, ReplicaRouter, replica_urls
+from app.models.user_model import Account
+
+USERNAME = "replica-check"
+PRIMARY_LEVEL = 1
+REPLICA_LEVEL = 2
+
+
+async def seed(engine, userlevel):
+    # 두 DB 에 같은 계정을 userlevel 만 다르게 넣어 어느 쪽에서 읽었는지 구분
+    async with engine.begin() as conn:
+        await conn.run_sync(Account.metadata.create_all, tables=[Account.__table__])
+        await conn.execute(Account.__table__.insert(), {
+            "username": USERNAME, "password": "x", "userlevel": userlevel, "onlogin": 0
+        })
+
+
+async def read_from(router):
+    async with router.connection() as conn:
+        row = (await conn.execute(account_lookup_stmt, {"username": USERNAME})).first()
+    return "replica" if row.userlevel == REPLICA_LEVEL else "primary"
+
+
+@pytest_asyncio.fixture
+async def setup(tmp_path):
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    unreachable = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'none.db'}")
+    await seed(primary, PRIMARY_LEVEL)
+    await seed(replica_engine, REPLICA_LEVEL)
+    replica = Replica("replica", replica_engine)
+    router = ReplicaRouter(lambda: [replica], primary=lambda: primary, max_lag=5.0, check_timeout=5.0)
+    yield router, replica, replica_engine, unreachable
+    for engine in (primary, replica_engine, unreachable):
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reads_before_first_check_go_to_primary(setup):
+    router, *_ = setup
+    assert await read_from(router) == "primary"
+    assert router.fallbacks == 1
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_excluded_until_recovered(setup):
+    router, replica, *_ = setup
+    await router.check()
+    assert await read_from(router) == "replica"
+
+    # 측정된 지연이 항상 임계값보다 크도록
+    router.max_lag = -1.0
+    await router.check()
+    assert not replica.healthy
+    assert await read_from(router) == "primary"
+
+    router.max_lag = 5.0
+    await router.check()
+    assert await read_from(router) == "replica"
+    assert replica.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_unreachable_replica_falls_back_to_primary(setup):
+    router, replica, replica_engine, unreachable = setup
+    await router.check()
+    replica.engine = unreachable
+    # 확인 전이라도 연결에 실패하면 바로 기본 DB 로 읽고 복제본을 제외
+    assert await read_from(router) == "primary"
+    assert not replica.healthy
+    await router.check()
+    assert replica.error is not None
+
+    replica.engine = replica_engine
+    await router.check()
+    assert await read_from(router) == "replica"
+
+
+@pytest.mark.asyncio
+async def test_replica_without_wal_receiver_is_unhealthy(setup):
+    router, replica, *_ = setup
+
+    async def not_streaming(replica):
+        raise ReplicaNotStreaming("WAL receiver is not streaming")
+
+    router._measure_lag = not_streaming
+    assert not await router.check_replica(replica)
+    assert replica.error.startswith("ReplicaNotStreaming")
+
+
+def test_replica_urls_inherit_primary_settings():
+    urls = replica_urls("replica-1, replica-2:5433,postgresql+asyncpg://u:p@other/db")
+    assert [(url.host, url.port) for url in urls] == [("replica-1", 5432), ("replica-2", 5433), ("other", None)]
+    assert urls[0].database == urls[1].database
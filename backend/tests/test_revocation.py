@@ -0,0 +1,135 @@
+import time
+
+import pytest
+
+from app.core.revocation import RevocationStore, SQLiteRevocationStore, TokenRevocationList
+from app.core.session import SessionManager
+
+
+def claims(jti="t1", ver=0, exp=None):
+    return {"jti": jti, "ver": ver, "exp": exp or time.time() + 600}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteRevocationStore(str(tmp_path / "revocations.db"))
+    yield store
+    store.store.close()
+
+
+def worker(store=None):
+    # cache_ttl=0: 다른 워커의 변경을 기다리지 않고 바로 확인
+    return TokenRevocationList(token_ttl=600, store=store, cache_ttl=0)
+
+
+@pytest.mark.asyncio
+async def test_deny_rejects_only_that_jti():
+    revocations = worker()
+    await revocations.deny("alice", "t1", time.time() + 600)
+    assert not await revocations.is_valid("alice", claims("t1"))
+    assert await revocations.is_valid("alice", claims("t2"))
+
+
+@pytest.mark.asyncio
+async def test_bump_rejects_older_versions():
+    revocations = worker()
+    version = await revocations.bump("alice")
+    assert await revocations.current_version("alice") == version
+    assert not await revocations.is_valid("alice", claims(ver=version - 1))
+    assert not await revocations.is_valid("alice", {"jti": "t1"})
+    assert await revocations.is_valid("alice", claims(ver=version))
+    assert await revocations.is_valid("bob", claims(ver=0))
+    assert await revocations.bump("alice") > version
+
+
+@pytest.mark.asyncio
+async def test_deny_without_jti_or_over_limit_bumps_version():
+    revocations = TokenRevocationList(token_ttl=600, max_denied=1)
+    await revocations.deny("alice", None, None)
+    assert revocations.stats()["versioned_users"] == 1
+    await revocations.deny("bob", "b1", time.time() + 600)
+    await revocations.deny("carol", "c1", time.time() + 600)
+    assert revocations.overflow_bumps == 1
+    assert not await revocations.is_valid("carol", claims("c2", ver=0))
+
+
+@pytest.mark.asyncio
+async def test_expired_denials_are_purged():
+    revocations = worker()
+    await revocations.deny("alice", "t1", time.time() + 0.01)
+    await revocations.deny("alice", "old", time.time() - 1)
+    assert revocations.stats()["denied_jtis"] == 1
+    time.sleep(0.02)
+    revocations._purge(time.time())
+    assert revocations.stats()["denied_jtis"] == 0
+
+
+@pytest.mark.asyncio
+async def test_revocations_shared_between_workers(store):
+    worker_a, worker_b = worker(store), worker(store)
+    assert await worker_b.is_valid("alice", claims("t1"))
+
+    # A 에서 로그아웃한 토큰은 B 에서도 거부
+    await worker_a.deny("alice", "t1", time.time() + 600)
+    assert not await worker_b.is_valid("alice", claims("t1"))
+
+    # A 에서 버전을 올리면 B 가 발급하는 토큰도 새 버전 이상
+    version = await worker_a.bump("alice")
+    assert not await worker_b.is_valid("alice", claims("t2", ver=version - 1))
+    assert await worker_b.current_version("alice") == version
+    assert await worker_b.bump("alice") > version
+
+
+@pytest.mark.asyncio
+async def test_revocations_survive_restart(store):
+    await worker(store).deny("alice", "t1", time.time() + 600)
+    version = await worker(store).bump("bob")
+
+    restarted = worker(store)
+    assert not await restarted.is_valid("alice", claims("t1"))
+    assert not await restarted.is_valid("bob", claims("b1", ver=version - 1))
+    assert await restarted.is_valid("bob", claims("b1", ver=version))
+
+
+@pytest.mark.asyncio
+async def test_store_lookup_cached_for_ttl(store):
+    worker_a = worker(store)
+    worker_b = TokenRevocationList(token_ttl=600, store=store, cache_ttl=60)
+    assert await worker_b.is_valid("alice", claims("t1"))
+    await worker_a.deny("alice", "t1", time.time() + 600)
+    # 캐시가 살아 있는 동안에는 다른 워커의 폐기가 보이지 않음
+    assert await worker_b.is_valid("alice", claims("t1"))
+    assert worker_b.store_lookups == 1
+
+
+@pytest.mark.asyncio
+async def test_store_failure_rejects_token():
+    class BrokenStore(RevocationStore):
+        async def lookup(self, username, jti):
+            raise ConnectionError("down")
+
+    revocations = worker(BrokenStore())
+    assert not await revocations.is_valid("alice", claims())
+    assert revocations.store_errors == 1
+
+
+@pytest.mark.asyncio
+async def test_stateless_session_manager_uses_store(store):
+    first = SessionManager(None, revocations=worker(store))
+    second = SessionManager(None, revocations=worker(store))
+    old = claims("old", ver=await first.token_version("alice"))
+    new = claims("new", ver=await second.token_version("alice"))
+    # 세션 한도 1: 다른 워커에서 로그인하면 이전 토큰 폐기
+    assert not await first.validate_session("alice", "", old)
+    assert await first.validate_session("alice", "", new)
+
+
+@pytest.mark.asyncio
+async def test_login_writes_store_only_with_single_session_limit(store):
+    single = SessionManager(None, max_sessions_per_user=1, revocations=worker(store))
+    multi = SessionManager(None, max_sessions_per_user=3, revocations=worker(store))
+    await single.token_version("alice")
+    await multi.token_version("bob")
+    assert single.revocations.stats()["versioned_users"] == 1
+    assert multi.revocations.stats()["versioned_users"] == 0
+    assert (await store.lookup("bob", None))[0] == 0
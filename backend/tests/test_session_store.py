@@ -0,0 +1,51 @@
+import threading
+import time
+
+import pytest
+
+from app.core.session import SQLiteSessionBackend
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = SQLiteSessionBackend(str(tmp_path / "sessions.db"))
+    yield backend
+    backend.store.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_evicts_oldest_and_validates(backend):
+    expires_at = time.time() + 60
+    assert await backend.add("alice", b"a1", expires_at, 2) == []
+    assert await backend.add("alice", b"a2", expires_at, 2) == []
+    assert await backend.add("alice", b"a3", expires_at, 2) == [b"a1"]
+
+    assert not await backend.validate("alice", b"a1")
+    assert await backend.validate("alice", b"a3")
+    assert not await backend.validate("bob", b"a3")
+    assert await backend.count() == 2
+
+    assert await backend.remove("alice", b"a2") == [b"a2"]
+    assert sorted(await backend.remove("alice")) == [b"a3"]
+    assert await backend.count() == 0
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_ignores_expired_sessions(backend):
+    await backend.add("alice", b"old", time.time() - 1, 5)
+    assert not await backend.validate("alice", b"old")
+    assert await backend.count() == 0
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_runs_off_event_loop(backend):
+    threads = []
+
+    def probe(conn):
+        threads.append(threading.current_thread())
+        return conn.execute("SELECT 1").fetchone()[0]
+
+    assert await backend.store.run(probe) == 1
+    await backend.store.run(probe)
+    assert threads[0] is not threading.current_thread()
+    assert threads[0] is threads[1]
@@ -0,0 +1,68 @@
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+from jose import JWTError, jwt
+
+from app.core import signing_keys
+from app.core.signing_keys import KeyRing, generate_private_key, private_key_pem
+
+DELAY = 300.0
+
+
+def write_key(keys_dir, kid, age):
+    path = keys_dir / f"{kid}.pem"
+    path.write_bytes(private_key_pem(generate_private_key("ES256")))
+    published = time.time() - age
+    os.utime(path, (published, published))
+
+
+def signed_kid(ring):
+    return jwt.get_unverified_header(ring.sign({"sub": "user"}))["kid"]
+
+
+def test_new_key_is_published_before_it_signs(tmp_path, monkeypatch):
+    write_key(tmp_path, "2026-01", age=DELAY * 10)
+    write_key(tmp_path, "2026-02", age=10)
+    ring = KeyRing("ES256", "", str(tmp_path), reload_interval=0.0, activation_delay=DELAY)
+
+    assert signed_kid(ring) == "2026-01"
+    assert b'"2026-02"' in ring.jwks()[0]
+
+    # 공개된 지 activation_delay 가 지나면 디렉터리가 그대로여도 새 키로 서명
+    later = time.time() + DELAY
+    monkeypatch.setattr(signing_keys, "time", SimpleNamespace(time=lambda: later, monotonic=time.monotonic))
+    assert signed_kid(ring) == "2026-02"
+
+
+def test_first_key_signs_immediately(tmp_path):
+    write_key(tmp_path, "2026-01", age=0)
+    ring = KeyRing("ES256", "", str(tmp_path), reload_interval=0.0, activation_delay=DELAY)
+    assert signed_kid(ring) == "2026-01"
+
+
+def test_explicit_active_kid_skips_the_delay(tmp_path):
+    write_key(tmp_path, "2026-01", age=DELAY * 10)
+    write_key(tmp_path, "2026-02", age=0)
+    ring = KeyRing("ES256", "", str(tmp_path), active_kid="2026-02", activation_delay=DELAY)
+    assert signed_kid(ring) == "2026-02"
+
+
+def test_unknown_kid_forces_reload(tmp_path):
+    write_key(tmp_path, "2026-01", age=DELAY * 10)
+    ring = KeyRing("ES256", "", str(tmp_path), reload_interval=3600.0, activation_delay=DELAY)
+    ring._checked_at = time.monotonic() - 10.0  # 주기적 확인까지는 한참 남음
+
+    # 다른 워커가 먼저 읽은 새 키로 서명한 토큰
+    write_key(tmp_path, "2026-02", age=DELAY * 2)
+    other = KeyRing("ES256", "", str(tmp_path), active_kid="2026-02")
+    assert ring.verify(other.sign({"sub": "user"}))["sub"] == "user"
+
+    # 정말 모르는 kid 는 여전히 거절
+    stranger_dir = tmp_path / "stranger"
+    stranger_dir.mkdir()
+    write_key(stranger_dir, "2026-99", age=0)
+    stranger = KeyRing("ES256", "", str(stranger_dir))
+    with pytest.raises(JWTError):
+        ring.verify(stranger.sign({"sub": "user"}))
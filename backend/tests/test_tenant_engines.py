@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.db.tenant_engines import (
+    ConnectionBudgetExceeded, TenantEngineRegistry, tenant_connection_budget, tenant_database_url
+)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def factory(tmp_path):
+    def build(tenant):
+        return create_async_engine(f"sqlite+aiosqlite:///{tmp_path / tenant}.db")
+    return build
+
+
+async def touch(registry, tenant):
+    async with registry.session(tenant) as session:
+        await session.execute(text("SELECT 1"))
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_engine_evicted(factory):
+    registry = TenantEngineRegistry(budget=5, max_engines=2, engine_factory=factory)
+    try:
+        await touch(registry, "a")
+        await touch(registry, "b")
+        await touch(registry, "a")
+        await touch(registry, "c")
+        assert list(registry._engines) == ["a", "c"]
+        assert registry.evicted == 1
+    finally:
+        await registry.stop()
+
+
+@pytest.mark.asyncio
+async def test_engine_in_use_not_evicted(factory):
+    registry = TenantEngineRegistry(budget=5, max_engines=1, engine_factory=factory)
+    try:
+        async with registry.session("a"):
+            await touch(registry, "b")
+            assert set(registry._engines) == {"a", "b"}
+        await touch(registry, "c")
+        assert list(registry._engines) == ["c"]
+    finally:
+        await registry.stop()
+
+
+@pytest.mark.asyncio
+async def test_idle_engines_reaped(factory):
+    registry = TenantEngineRegistry(budget=5, idle_seconds=10, engine_factory=factory)
+    try:
+        await touch(registry, "a")
+        assert registry.reap_idle() == 0
+        assert registry.reap_idle(now=registry._engines["a"].last_used + 10) == 1
+        assert registry.stats()["engines"] == 0
+    finally:
+        await registry.stop()
+
+
+@pytest.mark.asyncio
+async def test_budget_exhaustion_times_out(factory):
+    registry = TenantEngineRegistry(budget=1, acquire_timeout=0.05, engine_factory=factory)
+    try:
+        async with registry.session("a"):
+            with pytest.raises(ConnectionBudgetExceeded):
+                await touch(registry, "b")
+        assert registry.budget_timeouts == 1
+        await asyncio.wait_for(touch(registry, "b"), 1)
+    finally:
+        await registry.stop()
+
+
+def test_negative_budget_rejected():
+    with pytest.raises(ValueError):
+        TenantEngineRegistry(budget=0)
+
+
+def test_tenant_name_validated():
+    assert tenant_database_url("tenant_1").database == "tenant_1"
+    with pytest.raises(ValueError):
+        tenant_database_url("bad;name")
+
+
+def test_budget_split_across_workers_and_pools(monkeypatch):
+    monkeypatch.setattr(settings, "DB_CONNECTION_BUDGET", 200)
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 2)
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 10)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 10)
+    monkeypatch.setattr(settings, "DB_REPLICA_HOSTS", "replica-1,replica-2:5433")
+    monkeypatch.setattr(settings, "DB_REPLICA_POOL_SIZE", 5)
+    monkeypatch.setattr(settings, "DB_REPLICA_MAX_OVERFLOW", 5)
+    monkeypatch.setattr(settings, "TENANT_ROUTING_ENABLED", True)
+    monkeypatch.setattr(settings, "TENANT_ENGINE_CACHE_SIZE", 10)
+    monkeypatch.setattr(settings, "TENANT_POOL_SIZE", 2)
+    # 100 (워커당) - 20 (기본) - 20 (복제본 2개) - 20 (테넌트 유휴)
+    assert tenant_connection_budget() == 40
+
+
+@pytest.mark.parametrize("overrides", [
+    {"DB_CONNECTION_BUDGET": 30},                       # 기본 풀이 예산 이상
+    {"DB_CONNECTION_BUDGET": 100, "WEB_CONCURRENCY": 4},  # 워커당 25
+    {"DB_CONNECTION_BUDGET": 100, "TENANT_ROUTING_ENABLED": True, "TENANT_ENGINE_CACHE_SIZE": 40},
+])
+def test_budget_misconfiguration_rejected(monkeypatch, overrides):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 10)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 20)
+    monkeypatch.setattr(settings, "DB_REPLICA_HOSTS", "")
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "TENANT_POOL_SIZE", 2)
+    for name, value in overrides.items():
+        monkeypatch.setattr(settings, name, value)
+    with pytest.raises(ValueError):
+        tenant_connection_budget()
+
+
+@pytest.mark.parametrize("env", [
+    {"WEB_CONCURRENCY": "8"},
+    {"DB_REPLICA_HOSTS": ",".join(f"replica-{i}" for i in range(12))},
+])
+def test_app_imports_with_routing_disabled_and_small_budget(env):
+    # 테넌트 라우팅을 쓰지 않으면 워커당 예산이 공용 풀보다 작아도 시작할 수 있어야 함
+    result = subprocess.run(
+        [sys.executable, "-c", "import main"], cwd=BACKEND_DIR, capture_output=True, text=True,
+        env={**os.environ, "TENANT_ROUTING_ENABLED": "false", **env}
+    )
+    assert result.returncode == 0, result.stderr
+
+
+@pytest.mark.asyncio
+async def test_disabled_registry_only_warns(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 8)
+    registry = TenantEngineRegistry(budget=tenant_connection_budget, enabled=False)
+    with caplog.at_level(logging.WARNING):
+        registry.start()
+    assert "over DB_CONNECTION_BUDGET" in caplog.text
+    assert registry.stats()["budget"] is None
+    await registry.stop()
+
+
+@pytest.mark.asyncio
+async def test_enabled_registry_checks_budget_on_start(monkeypatch):
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 8)
+    registry = TenantEngineRegistry(budget=tenant_connection_budget, enabled=True)
+    with pytest.raises(ValueError):
+        registry.start()
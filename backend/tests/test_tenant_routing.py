@@ -0,0 +1,88 @@
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api.endpoints import users as users_endpoint
+from app.core import deps
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.crud.account_cache import CachedAccount
+from app.db.tenant_engines import TenantEngineRegistry
+from app.models.user_model import Account
+from main import app
+
+LEVELS = {"acme": settings.TENANT_USERLEVEL, "globex": settings.TENANT_USERLEVEL,
+          "root": settings.ADMIN_USERLEVEL, "alice": 1}
+
+
+@pytest_asyncio.fixture
+async def registry(tmp_path, monkeypatch):
+    def build(tenant):
+        return create_async_engine(f"sqlite+aiosqlite:///{tmp_path / tenant}.db")
+
+    # 테넌트 DB 마다 그 테넌트의 내선 계정만 있음
+    for tenant in ("acme", "globex"):
+        engine = build(tenant)
+        async with engine.begin() as conn:
+            await conn.run_sync(Account.metadata.create_all, tables=[Account.__table__])
+            await conn.execute(Account.__table__.insert(), {
+                "username": f"{tenant}-100", "password": "x", "userlevel": 1, "onlogin": 0
+            })
+        await engine.dispose()
+
+    async def lookup(username):
+        return CachedAccount(username, "hash", LEVELS[username], 0)
+
+    registry = TenantEngineRegistry(budget=5, engine_factory=build)
+    monkeypatch.setattr(settings, "TENANT_ROUTING_ENABLED", True)
+    monkeypatch.setattr(deps, "tenant_engines", registry)
+    monkeypatch.setattr(users_endpoint, "tenant_engines", registry)
+    monkeypatch.setattr(deps, "_current_account", lookup)
+    yield registry
+    await registry.stop()
+
+
+async def list_users(username, tenant=None):
+    token = create_access_token(username, 0, username if LEVELS[username] == settings.TENANT_USERLEVEL else None)
+    app.dependency_overrides[deps.get_current_user] = lambda: username
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get(
+                "/users", params={"tenant": tenant} if tenant else {},
+                headers={"Authorization": f"Bearer {token}"}
+            )
+    finally:
+        app.dependency_overrides.clear()
+
+
+def usernames(response):
+    return [item["username"] for item in response.json()["items"]]
+
+
+@pytest.mark.asyncio
+async def test_tenant_account_lists_its_own_tenant_db(registry):
+    response = await list_users("acme")
+    assert response.status_code == 200
+    assert usernames(response) == ["acme-100"]
+    assert registry.created == 1
+
+
+@pytest.mark.asyncio
+async def test_tenant_account_cannot_pick_another_tenant(registry):
+    assert (await list_users("acme", tenant="globex")).status_code == 403
+    assert registry.created == 0
+
+
+@pytest.mark.asyncio
+async def test_admin_selects_tenant_explicitly(registry):
+    response = await list_users("root", tenant="globex")
+    assert response.status_code == 200
+    assert usernames(response) == ["globex-100"]
+
+
+@pytest.mark.asyncio
+async def test_regular_user_cannot_select_tenant(registry):
+    assert (await list_users("alice", tenant="acme")).status_code == 403
+    assert (await list_users("alice")).status_code == 403
+    assert registry.created == 0
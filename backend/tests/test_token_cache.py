@@ -0,0 +1,39 @@
+import time
+
+from app.core.token_cache import TokenCache, token_digest
+
+
+def test_invalidate_removes_entry():
+    cache = TokenCache(max_size=10, max_ttl=60)
+    cache.put("token-a", {"sub": "alice"})
+    assert cache.get("token-a") == {"sub": "alice"}
+    cache.invalidate("token-a")
+    assert cache.get("token-a") is None
+    assert cache.invalidations == 1
+
+
+def test_invalidate_by_digest():
+    cache = TokenCache(max_size=10, max_ttl=60)
+    cache.put("token-a", {"sub": "alice"})
+    cache.invalidate_digest(token_digest("token-a"))
+    assert cache.get("token-a") is None
+
+
+def test_entry_expires_at_token_exp():
+    cache = TokenCache(max_size=10, max_ttl=60)
+    cache.put("expired", {"sub": "alice", "exp": time.time() - 1})
+    assert cache.get("expired") is None
+    cache.put("short", {"sub": "alice", "exp": time.time() + 0.01})
+    time.sleep(0.02)
+    assert cache.get("short") is None
+
+
+def test_least_recently_used_entry_evicted():
+    cache = TokenCache(max_size=2, max_ttl=60)
+    cache.put("a", {"sub": "a"})
+    cache.put("b", {"sub": "b"})
+    cache.get("a")
+    cache.put("c", {"sub": "c"})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.evictions == 1
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+from fastapi import APIRouter, FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+
+from app.core.middleware import ParsedBodyRoute, XSSProtectionMiddleware, contains_xss
+
+router = APIRouter(route_class=ParsedBodyRoute)
+
+
+@router.post("/echo")
+async def echo(payload: dict):
+    return payload
+
+
+@router.post("/raw")
+async def raw(request: Request):
+    return {"size": len(await request.body())}
+
+
+test_app = FastAPI()
+test_app.include_router(router)
+test_app.add_middleware(XSSProtectionMiddleware, max_body_bytes=1024)
+
+ATTACK = json.dumps({"name": "<script>alert(1)</script>"}).encode()
+
+
+async def post(path: str, body: bytes, headers=None):
+    async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+        return await client.post(path, content=body, headers=headers or {})
+
+
+@pytest.mark.parametrize("value, expected", [
+    ({"a": ["ok", {"b": "<img src=x onerror=alert(1)>"}]}, True),
+    ({"javascript:void(0)": 1}, True),
+    ({"note": "1 < 2, time 10:30"}, False),
+    (["plain", 3, None], False),
+])
+def test_contains_xss(value, expected):
+    assert contains_xss(value) is expected
+
+
+@pytest.mark.asyncio
+async def test_json_body_with_script_rejected():
+    response = await post("/echo", ATTACK, {"content-type": "application/json"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_missing_content_type_is_screened():
+    # FastAPI 는 Content-Type 이 없어도 본문을 JSON 으로 파싱하므로 검사를 건너뛰면 안 됨
+    response = await post("/echo", ATTACK)
+    assert response.status_code == 400
+    response = await post("/echo", ATTACK, {"content-type": ""})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_clean_json_body_passes_through():
+    response = await post("/echo", b'{"name": "alice"}', {"content-type": "application/json; charset=utf-8"})
+    assert response.status_code == 200
+    assert response.json() == {"name": "alice"}
+
+
+@pytest.mark.asyncio
+async def test_non_json_body_not_screened():
+    response = await post("/raw", ATTACK, {"content-type": "text/csv"})
+    assert response.status_code == 200
+    assert response.json() == {"size": len(ATTACK)}
+
+
+@pytest.mark.asyncio
+async def test_oversized_json_body_rejected():
+    response = await post("/echo", b'{"name": "' + b"a" * 2048 + b'"}', {"content-type": "application/json"})
+    assert response.status_code == 413